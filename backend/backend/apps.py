@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class Backend(AppConfig):
     name = 'backend'
+
+    def ready(self):
+        from .response_cache import connect_signals
+        connect_signals()
@@ -9,7 +9,8 @@ from rest_framework.response import Response
 from . import models as custom_models
 from rest_framework import viewsets
 from rest_framework import status
-from .tasks import Email
+from . import filters
+from .tasks import send_email
 from .user_groups import (
     ENGINEER,
     STAFF)
@@ -42,7 +43,7 @@ class RegisterAPI(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        # Email.register(request).delay()
+        # send_email.delay(user.id, 'register')
         refresh = RefreshToken.for_user(user)
         return Response({
             "user": custom_serializers.VibroUserSerializer(
@@ -67,7 +68,7 @@ class RegisterAdminAPI(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        Email().register(request).delay()  # ! TODO test task
+        send_email.delay(user.id, 'register')
         refresh = RefreshToken.for_user(user)
         return Response({
             "user": custom_serializers.VibroUserSerializer(
@@ -94,7 +95,8 @@ class ResetAPI(generics.GenericAPIView):
         user = custom_models.VibroUser.objects.filter(
             email=request.data['email'])
         if user.exists():
-            # Email.reset(request).delay()
+            # send_email.delay(
+            #     user.first().id, 'reset', host=request.get_host())
             pass
         else:
             raise NotFound('usuario no encontrado')
@@ -129,7 +131,7 @@ class ChangePassAPI(generics.UpdateAPIView):
                 return Response({"error": e}, status=status.HTTP_400_BAD_REQUEST)
             user.set_password(serializer.data.get("new_password"))
             user.save()
-            # Email.change_password(request).delay()
+            # send_email.delay(user.id, 'change_password')
             refresh = RefreshToken.for_user(user)
             return Response({
                 "user": custom_serializers.VibroUserSerializer(
@@ -174,7 +176,7 @@ class ForgotPassAPI(generics.UpdateAPIView):
             user.set_password(serializer.data.get("password"))
             user.save()
 
-            Email.change_password(request).delay()
+            send_email.delay(user.id, 'change_password')
             refresh = RefreshToken.for_user(user)
             return Response({
                 "user": custom_serializers.VibroUserSerializer(
@@ -203,32 +205,15 @@ class VibroUserView(viewsets.ModelViewSet):
     permission_classes = [
         custom_permissions.HasUserPermissions
     ]
+    filterset_class = filters.VibroUserFilter
     serializer_class = custom_serializers.UpdadateUserSerialiazer
 
     def get_queryset(self):
 
-        id = self.request.query_params.get('id', None)
-        user_type = self.request.query_params.get('user_type', None)
-        company_name = self.request.query_params.get('company_name', None)
-        first_name = self.request.query_params.get('first_name', None)
-        last_name = self.request.query_params.get('last_name', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.VibroUser.objects.all()
-        else:
-            queryset = custom_models.VibroUser.objects.exclude(
-                user_type="client").exclude(user_type='arduino')
-        if id:
-            queryset = queryset.filter(id=id)
-        if user_type:
-            queryset = queryset.filter(user_type=user_type)
-        if company_name:
-            queryset = queryset.filter(company__name__contains=company_name)
-        if first_name:
-            queryset = queryset.filter(first_name__contains=first_name)
-        if last_name:
-            queryset = queryset.filter(last_name__contains=last_name)
-        return queryset
+            return custom_models.VibroUser.objects.all()
+        return custom_models.VibroUser.objects.exclude(
+            user_type="client").exclude(user_type='arduino')
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', True)
@@ -0,0 +1,161 @@
+"""
+Bearing defect frequencies computed from the
+geometry catalog and the speed of each axis.
+"""
+
+from . import models as custom_models
+from collections import OrderedDict, namedtuple
+import numpy as np
+import math
+
+DEFECTS = (
+    custom_models.Bearing.BPFI,
+    custom_models.Bearing.BPFO,
+    custom_models.Bearing.BSF,
+    custom_models.Bearing.FTF,
+)
+DEFAULT_HARMONICS = 5
+DEFAULT_TOLERANCE = 0.02
+CACHE_SIZE = 1024
+
+FrequencyTable = namedtuple(
+    'FrequencyTable', ['bearings', 'speeds', 'frequencies', 'missing'])
+Match = namedtuple(
+    'Match', ['peak', 'bearing', 'defect', 'harmonic', 'frequency'])
+
+# (reference, geometry, speed, harmonics) -> frequencies
+_cache = OrderedDict()
+
+
+def shaft_frequency(axis):
+    """
+    return the speed of an axis in Hz.
+    """
+
+    if axis.units == custom_models.Axis.HZ:
+        return float(axis.velocity)
+    return axis.velocity / 60
+
+
+def _geometry(bearing):
+    return (
+        bearing.rolling_elements,
+        bearing.ball_diameter,
+        bearing.pitch_diameter,
+        bearing.contact_angle)
+
+
+def valid_geometry(geometry):
+    """
+    return whether a catalog geometry has rolling
+    elements and positive finite diameters, the
+    ones that give finite frequencies.
+    """
+
+    elements, ball, pitch, angle = _geometry(geometry)
+    return elements >= 1 and math.isfinite(angle) and all(
+        math.isfinite(diameter) and diameter > 0 for diameter in (ball, pitch))
+
+
+def defect_frequencies(geometries, speeds, harmonics=DEFAULT_HARMONICS):
+    """
+    compute the defect frequencies of a batch of bearings.
+
+    geometries is an (n, 4) array of rolling elements,
+    ball diameter, pitch diameter and contact angle,
+    and speeds the shaft frequency of each one in Hz.
+    Returns an (n, 4, harmonics) array ordered as DEFECTS.
+    """
+
+    geometries = np.asarray(geometries, dtype=np.float64).reshape(-1, 4)
+    speeds = np.asarray(speeds, dtype=np.float64).reshape(-1)
+    elements, ball, pitch, angle = geometries.T
+    ratio = ball / pitch * np.cos(np.radians(angle))
+    fundamentals = np.stack([
+        elements / 2 * (1 + ratio),
+        elements / 2 * (1 - ratio),
+        pitch / (2 * ball) * (1 - ratio ** 2),
+        (1 - ratio) / 2,
+    ], axis=1) * speeds[:, None]
+    orders = np.arange(1, harmonics + 1)
+    return fundamentals[:, :, None] * orders
+
+
+def _cached_frequencies(keys, harmonics):
+    """
+    return the frequencies of every (reference, geometry,
+    speed) key, computing the missing ones in one batch.
+    """
+
+    missing = [key for key in keys if (*key, harmonics) not in _cache]
+    if missing:
+        computed = defect_frequencies(
+            [geometry for _, geometry, _ in missing],
+            [speed for _, _, speed in missing],
+            harmonics)
+        for key, frequencies in zip(missing, computed):
+            frequencies.setflags(write=False)
+            _cache[(*key, harmonics)] = frequencies
+    for key in keys:
+        _cache.move_to_end((*key, harmonics))
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return np.stack([_cache[(*key, harmonics)] for key in keys]) \
+        if keys else np.empty((0, len(DEFECTS), harmonics))
+
+
+def machine_frequency_table(machine, harmonics=DEFAULT_HARMONICS):
+    """
+    build the defect frequency table of every bearing
+    of a machine at the speed of its axis. Bearings
+    whose reference is not in the catalog are returned
+    in the missing list. Raises ValueError if any of
+    the catalog geometries is invalid.
+    """
+
+    bearings = list(custom_models.Bearing.objects.filter(
+        axis__gear__machine=machine).select_related('axis').order_by('id'))
+    catalog = {
+        geometry.reference: geometry for geometry in
+        custom_models.BearingGeometry.objects.filter(
+            reference__in={bearing.reference for bearing in bearings})}
+    invalid = sorted(
+        reference for reference, geometry in catalog.items()
+        if not valid_geometry(geometry))
+    if invalid:
+        raise ValueError(f'Geometrias invalidas: {", ".join(invalid)}')
+    known = [bearing for bearing in bearings if bearing.reference in catalog]
+    missing = [bearing for bearing in bearings
+               if bearing.reference not in catalog]
+    speeds = [shaft_frequency(bearing.axis) for bearing in known]
+    keys = [
+        (bearing.reference, _geometry(catalog[bearing.reference]), speed)
+        for bearing, speed in zip(known, speeds)]
+    frequencies = _cached_frequencies(keys, harmonics)
+    return FrequencyTable(known, speeds, frequencies, missing)
+
+
+def match_peaks(peaks, table, tolerance=DEFAULT_TOLERANCE):
+    """
+    match spectral peaks in Hz against every frequency
+    of a table in one array operation. A peak matches
+    when it is within the relative tolerance.
+    """
+
+    peaks = np.asarray(peaks, dtype=np.float64).reshape(-1)
+    frequencies = table.frequencies.reshape(-1)
+    distance = np.abs(peaks[:, None] - frequencies[None, :])
+    peak_index, flat_index = np.nonzero(distance <= tolerance * frequencies)
+    shape = table.frequencies.shape
+    bearing_index, defect_index, harmonic_index = np.unravel_index(
+        flat_index, shape)
+    return [
+        Match(
+            float(peaks[peak]),
+            table.bearings[bearing],
+            DEFECTS[defect],
+            int(harmonic) + 1,
+            float(frequencies[flat]))
+        for peak, bearing, defect, harmonic, flat in zip(
+            peak_index, bearing_index, defect_index,
+            harmonic_index, flat_index)]
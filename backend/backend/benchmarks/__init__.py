@@ -0,0 +1,10 @@
+from . import startup
+from . import report
+from . import api
+
+# suites run by the benchmark management command
+SUITES = {
+    'startup': startup.run,
+    'report': report.run,
+    'api': api.run,
+}
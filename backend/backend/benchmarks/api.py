@@ -0,0 +1,173 @@
+"""
+Latency, queries and response size of the list
+and retrieve endpoints of every router viewset,
+requested by staff and client users over a seeded
+dataset. The dataset is created in a transaction
+that is rolled back, so no data is kept.
+"""
+
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.db import connection, transaction
+from backend import models as custom_models
+from rest_framework.test import APIClient
+from contextlib import contextmanager
+from .report import generate_plant
+from django.urls import reverse
+from model_bakery import baker
+import numpy as np
+import logging
+import time
+
+USERS = ('staff', 'client')
+
+
+def seed(companies=3, machines=50, points=4, history=12, waveform=256):
+    """
+    create plants with every kind of record the
+    api serves. Returns the engineer and one
+    client user of the first company.
+    """
+
+    engineer = client = None
+    for index in range(companies):
+        company, user = generate_plant(
+            machines, points, history, waveform, index)
+        arduino = baker.make(
+            'backend.VibroUser', company=company, user_type='arduino')
+        company_client = baker.make(
+            'backend.VibroUser', company=company, user_type='client')
+        engineer, client = engineer or user, client or company_client
+
+        custom_models.Sensor.objects.bulk_create(
+            custom_models.Sensor(
+                machine=machine, arduino=arduino, sensitivity=100,
+                channel=channel)
+            for machine in custom_models.Machine.objects.filter(
+                company=company) for channel in range(2))
+        axes = custom_models.Axis.objects.bulk_create(
+            custom_models.Axis(gear=gear, velocity=1800)
+            for gear in custom_models.Gear.objects.filter(
+                machine__company=company))
+        custom_models.Bearing.objects.bulk_create(
+            custom_models.Bearing(axis=axis, reference='6205')
+            for axis in axes for _ in range(2))
+        measurements = custom_models.Measurement.objects.filter(
+            machine__company=company)
+        custom_models.Flaw.objects.bulk_create(
+            custom_models.Flaw(measurement=measurement, flaw_type='balanceo')
+            for measurement in measurements)
+        custom_models.TermoImage.objects.bulk_create(
+            custom_models.TermoImage(
+                measurement=measurement, image_type='termal',
+                image='termals/benchmark.jpg')
+            for measurement in measurements)
+    return engineer, client
+
+
+def endpoints():
+    """
+    return the basename and viewset of every
+    router viewset with list and retrieve.
+    """
+
+    from backend.urls import router
+    return [
+        (basename, viewset) for _, viewset, basename in router.registry
+        if hasattr(viewset, 'list') and hasattr(viewset, 'retrieve') and
+        getattr(viewset, 'serializer_class', None) is not None]
+
+
+@contextmanager
+def quiet_errors():
+    """
+    keep server errors out of the output, their
+    status is already part of the results.
+    """
+
+    logger = logging.getLogger('django.request')
+    level = logger.level
+    logger.setLevel(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def measure_request(client, url, repeat):
+    """
+    request an url repeat times after a warm up
+    request and return its measures.
+    """
+
+    response = client.get(url)
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        seconds.append(time.perf_counter() - start)
+    p50, p95 = np.percentile(seconds, [50, 95])
+    return response, {
+        'status': response.status_code,
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'queries': len(queries),
+        'bytes': len(response.content),
+    }
+
+
+def measure_endpoint(client, basename, repeat):
+    """
+    measure the list of an endpoint and the
+    retrieve of the first record it lists.
+    """
+
+    response, listed = measure_request(
+        client, reverse(f'{basename}-list'), repeat)
+    data = response.json() if response.status_code == 200 else None
+    records = data.get('results', []) if isinstance(data, dict) else data
+    listed['items'] = len(records) if records is not None else None
+    measures = {'list': listed}
+    if records and 'id' in records[0]:
+        _, measures['retrieve'] = measure_request(
+            client, reverse(f'{basename}-detail', args=[records[0]['id']]),
+            repeat)
+    else:
+        measures['retrieve'] = None
+    return measures
+
+
+def run(repeat=20, companies=3, machines=50, points=4, history=12,
+        waveform=256):
+    """
+    return the p50 and p95 latency, queries and
+    bytes of each endpoint for a staff and a
+    client user, with the size of the dataset.
+    """
+
+    with transaction.atomic(), quiet_errors(), override_settings(
+            ALLOWED_HOSTS=['testserver']):
+        users = dict(zip(USERS, seed(
+            companies, machines, points, history, waveform)))
+        dataset = {
+            model.__name__: model.objects.count() for model in (
+                custom_models.Company, custom_models.Machine,
+                custom_models.Point, custom_models.Measurement,
+                custom_models.Values, custom_models.Flaw,
+                custom_models.TermoImage, custom_models.Sensor,
+                custom_models.Bearing)}
+        results = {}
+        for basename, _ in endpoints():
+            results[basename] = {}
+            for name, user in users.items():
+                client = APIClient(raise_request_exception=False)
+                client.force_authenticate(user)
+                results[basename][name] = measure_endpoint(
+                    client, basename, repeat)
+        transaction.set_rollback(True)
+
+    return {
+        'repeat': repeat,
+        'dataset': dataset,
+        'endpoints': results,
+    }
@@ -0,0 +1,198 @@
+"""
+Time of each stage of a consolidated plant
+report over synthetic plants of configurable
+size. The plants are created in a transaction
+that is rolled back, so no data is kept.
+"""
+
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.db import connection, transaction
+from contextlib import contextmanager
+from collections import defaultdict
+from backend import models as custom_models
+from model_bakery import baker
+from faker import Faker
+from io import BytesIO
+import numpy as np
+import statistics
+import tracemalloc
+import resource
+import datetime
+import time
+
+STAGES = ('loading', 'pagination', 'rendering', 'layout', 'write')
+REPORT_DATE = datetime.date(2021, 1, 1)
+
+
+class Stages:
+
+    """
+    accumulate the seconds and queries of
+    each stage and the peak memory allocated
+    by the outermost ones.
+    """
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.queries = defaultdict(int)
+        self.peak_kb = {}
+
+    @contextmanager
+    def measure(self, name, memory=False):
+        if memory:
+            # restarting clears the traces, so the peak
+            # only counts what this stage allocates
+            tracemalloc.stop()
+            tracemalloc.start()
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            yield
+        self.seconds[name] += time.perf_counter() - start
+        self.queries[name] += len(queries)
+        if memory:
+            self.peak_kb[name] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+
+
+def generate_plant(machines=10, points=4, history=10, waveform=1024,
+                   seed=0):
+    """
+    create a company with its machines, their
+    points and a measurement history with
+    random values and waveforms. Returns the
+    company and the engineer of the report.
+    """
+
+    fake = Faker('es_ES')
+    fake.seed_instance(seed)
+    rng = np.random.default_rng(seed)
+    company = baker.make('backend.Company', name=fake.company()[:50])
+    engineer = baker.make(
+        'backend.VibroUser', company=company, user_type='engineer')
+    for hierarchy in range(machines):
+        machine = baker.make(
+            'backend.Machine',
+            company=company,
+            name=fake.bothify('Maquina ??-###'),
+            hierarchy=hierarchy,
+            power=int(rng.integers(1, 400)))
+        baker.make('backend.Gear', machine=machine, gear_type='bomba')
+        machine_points = custom_models.Point.objects.bulk_create(
+            custom_models.Point(
+                machine=machine,
+                position=index // 2 + 1,
+                direction='H',
+                point_type='VA'[index % 2])
+            for index in range(points))
+        measurements = custom_models.Measurement.objects.bulk_create(
+            custom_models.Measurement(
+                machine=machine,
+                engineer_one=engineer,
+                date=REPORT_DATE - datetime.timedelta(weeks=week),
+                severity='green',
+                analysis=fake.paragraph(nb_sentences=4),
+                diagnostic=fake.paragraph(nb_sentences=2))
+            for week in range(history))
+        custom_models.Values.objects.bulk_create(
+            custom_models.Values(
+                measurement=measurement,
+                point=point,
+                tendency=round(float(rng.uniform(0.5, 20)), 2),
+                time_signal=rng.normal(size=waveform).astype(np.float32),
+                sample_rate=waveform)
+            for measurement in measurements for point in machine_points)
+    return company, engineer
+
+
+def measure_report(company, user):
+    """
+    build the consolidated report of a company
+    once and return the measures of each stage.
+    """
+
+    # the report engine is only loaded when measured
+    from backend.report.plant import PlantReport
+
+    stages = Stages()
+
+    class TimedReport(PlantReport):
+
+        def paginate(self):
+            with stages.measure('pagination'):
+                return super().paginate()
+
+        def render_tendency_graphs(self, *args, **kwargs):
+            with stages.measure('rendering'):
+                return super().render_tendency_graphs(*args, **kwargs)
+
+        def _endBuild(self):
+            if self.drafting:
+                return super()._endBuild()
+            with stages.measure('write'):
+                return super()._endBuild()
+
+    queryset = custom_models.Measurement.objects.filter(
+        machine__company=company,
+        date=REPORT_DATE).order_by('machine__hierarchy', 'id')
+    buffer = BytesIO()
+    with stages.measure('loading', memory=True):
+        report = TimedReport(buffer, queryset, user)
+    with stages.measure('build', memory=True):
+        report.build_doc()
+
+    stages.seconds['layout'] = stages.seconds['build'] - sum(
+        stages.seconds[name] for name in ('pagination', 'rendering', 'write'))
+    stages.queries['layout'] = stages.queries['build'] - sum(
+        stages.queries[name] for name in ('pagination', 'rendering', 'write'))
+    return {
+        'seconds': {name: stages.seconds[name] for name in STAGES},
+        'queries': {name: stages.queries[name] for name in STAGES},
+        'peak_memory_kb': stages.peak_kb,
+        'pages': report.page,
+        'bytes': len(buffer.getvalue()),
+    }
+
+
+def run(repeat=3, companies=1, machines=10, points=4, history=10,
+        waveform=1024, cache=False):
+    """
+    return the median time of each report stage,
+    its queries and the peak memory, for plants
+    of the given size. Charts are rendered on
+    every build unless cache is set.
+    """
+
+    with transaction.atomic(), override_settings(
+            **({} if cache else {'REPORT_CHART_CACHE_DIR': ''})):
+        plants = [
+            generate_plant(machines, points, history, waveform, seed)
+            for seed in range(companies)]
+        samples = [
+            measure_report(company, user)
+            for _ in range(repeat) for company, user in plants]
+        transaction.set_rollback(True)
+
+    return {
+        'repeat': repeat,
+        'plant': {
+            'companies': companies,
+            'machines': machines,
+            'points': points,
+            'history': history,
+            'waveform': waveform,
+            'pages': samples[-1]['pages'],
+            'bytes': samples[-1]['bytes'],
+        },
+        'stages': {
+            name: {
+                'seconds_median': statistics.median(
+                    sample['seconds'][name] for sample in samples),
+                'queries': samples[-1]['queries'][name],
+            } for name in STAGES},
+        'seconds_median': statistics.median(
+            sum(sample['seconds'].values()) for sample in samples),
+        'peak_memory_kb': {
+            name: max(sample['peak_memory_kb'][name] for sample in samples)
+            for name in ('loading', 'build')},
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
@@ -0,0 +1,72 @@
+"""
+Boot time of the web process, measured in fresh
+interpreters that set up django and load every url
+the way a gunicorn worker does before serving.
+"""
+
+from django.conf import settings
+import statistics
+import subprocess
+import json
+import sys
+import os
+
+# modules only the report engine in the celery worker needs
+HEAVY_MODULES = ('reportlab', 'matplotlib')
+
+SCRIPT = """
+import resource
+import time
+import json
+import sys
+start = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+seconds = time.perf_counter() - start
+print(json.dumps({
+    'seconds': seconds,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'heavy_modules': sorted({
+        name.split('.')[0] for name in sys.modules
+        if name.split('.')[0] in %r}),
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_startup():
+    """
+    boot the web process once in a new
+    interpreter and return its measures.
+    """
+
+    result = subprocess.run(
+        [sys.executable, '-c', SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=os.environ.copy(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def run(repeat=5):
+    """
+    return the median boot time and memory
+    of several fresh web processes.
+    """
+
+    samples = [measure_startup() for _ in range(repeat)]
+    seconds = [sample['seconds'] for sample in samples]
+    return {
+        'repeat': repeat,
+        'seconds_median': statistics.median(seconds),
+        'seconds_min': min(seconds),
+        'max_rss_kb_median': statistics.median(
+            sample['max_rss_kb'] for sample in samples),
+        'modules': samples[-1]['modules'],
+        'heavy_modules': samples[-1]['heavy_modules'],
+    }
@@ -0,0 +1,80 @@
+"""
+Django cache backend on the redis client, for
+the caches shared by every web process. Values
+are pickled and keys expire with redis ttls.
+"""
+
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+import pickle
+import redis
+
+
+class RedisCache(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.client = redis.Redis.from_url(location)
+
+    def ttl(self, timeout):
+        """
+        return the seconds a key lives, None
+        to keep it until it is deleted.
+        """
+
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return None if timeout is None else int(timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version)
+        self.validate_key(key)
+        ttl = self.ttl(timeout)
+        if ttl is not None and ttl <= 0:
+            return False
+        return bool(self.client.set(
+            key, pickle.dumps(value), ex=ttl, nx=True))
+
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version)
+        self.validate_key(key)
+        value = self.client.get(key)
+        return default if value is None else pickle.loads(value)
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_key(key, version): key for key in keys}
+        values = self.client.mget(list(keys))
+        return {
+            keys[key]: pickle.loads(value)
+            for key, value in zip(keys, values) if value is not None}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version)
+        self.validate_key(key)
+        ttl = self.ttl(timeout)
+        if ttl is not None and ttl <= 0:
+            self.client.delete(key)
+        else:
+            self.client.set(key, pickle.dumps(value), ex=ttl)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version)
+        ttl = self.ttl(timeout)
+        if ttl is None:
+            return bool(
+                self.client.persist(key) or self.client.exists(key))
+        return bool(self.client.expire(key, ttl))
+
+    def delete(self, key, version=None):
+        key = self.make_key(key, version)
+        self.validate_key(key)
+        return bool(self.client.delete(key))
+
+    def has_key(self, key, version=None):
+        key = self.make_key(key, version)
+        self.validate_key(key)
+        return bool(self.client.exists(key))
+
+    def clear(self):
+        # the server may hold other data, such as the broker queues
+        for key in self.client.scan_iter(match=f'{self.key_prefix}:*'):
+            self.client.delete(key)
@@ -0,0 +1,76 @@
+from django.http import HttpResponse, StreamingHttpResponse
+import re
+
+CHUNK_SIZE = 64 * 1024
+RANGE_REGEX = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def byte_range(header, size):
+    """
+    return the inclusive (start, end) offsets
+    of a single range in a Range header, None when
+    the header is missing or can't be parsed,
+    or False when it can't be satisfied.
+    """
+
+    match = RANGE_REGEX.match(header or '')
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range, the last n bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def read_chunks(file, start, length):
+    """
+    yield length bytes of a file starting
+    at start, closing it when done.
+    """
+
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def file_response(file, size, filename, range_header=None,
+                  content_type='application/pdf'):
+    """
+    stream a stored file, or the part of it
+    requested in a Range header, without
+    loading it in memory.
+    """
+
+    requested = byte_range(range_header, size)
+    if requested is False:
+        file.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    start, end = requested or (0, size - 1)
+    response = StreamingHttpResponse(
+        read_chunks(file, start, end - start + 1),
+        status=206 if requested else 200,
+        content_type=content_type)
+    if requested:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
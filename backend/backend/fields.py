@@ -0,0 +1,103 @@
+from django.db import models
+import numpy as np
+import struct
+import base64
+
+# header: format version, dtype code, padding, scale
+HEADER = struct.Struct('<BBxxf')
+VERSION = 1
+DTYPES = {
+    'float32': (0, np.dtype('<f4')),
+    'float16': (1, np.dtype('<f2')),
+}
+CODES = {code: dtype for code, dtype in DTYPES.values()}
+# largest magnitude stored in float16 columns after scaling
+FLOAT16_RANGE = 1024.0
+
+
+def encode_array(values, dtype='float32'):
+    """
+    serialize a sequence of numbers as a header
+    followed by the raw little-endian samples.
+    float16 samples are scaled so the largest
+    magnitude maps to FLOAT16_RANGE.
+    """
+
+    code, sample = DTYPES[dtype]
+    array = np.asarray(values, dtype=np.float32).ravel()
+    scale = 1.0
+    if dtype == 'float16' and array.size:
+        peak = float(np.abs(array).max())
+        if peak:
+            scale = peak / FLOAT16_RANGE
+            array = array / scale
+    header = HEADER.pack(VERSION, code, scale)
+    return header + array.astype(sample).tobytes()
+
+
+def decode_array(value):
+    """
+    return the samples of an encoded array.
+    float32 arrays are read-only views over
+    the buffer, so no parsing takes place.
+    """
+
+    buffer = memoryview(value)
+    version, code, scale = HEADER.unpack_from(buffer)
+    if version != VERSION:
+        raise ValueError(f'unsupported array format {version}')
+    array = np.frombuffer(buffer, dtype=CODES[code], offset=HEADER.size)
+    if array.dtype != np.float32 or scale != 1.0:
+        array = array.astype(np.float32) * np.float32(scale)
+    return array
+
+
+class CompactArrayField(models.BinaryField):
+
+    """
+    bytea column storing a numeric array as
+    float32 or float16 samples. Values are
+    returned as NumPy arrays, lists are
+    accepted on assignment.
+    """
+
+    description = 'Compact numeric array'
+
+    def __init__(self, *args, dtype='float32', **kwargs):
+        if dtype not in DTYPES:
+            raise ValueError(f'unsupported dtype {dtype}')
+        self.dtype = dtype
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.dtype != 'float32':
+            kwargs['dtype'] = self.dtype
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decode_array(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, np.ndarray):
+            return value
+        if isinstance(value, str):
+            value = base64.b64decode(value.encode('ascii'))
+        if isinstance(value, (bytes, memoryview)):
+            return decode_array(value)
+        return np.asarray(value, dtype=np.float32)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None or isinstance(value, (bytes, memoryview)):
+            return value
+        return encode_array(value, self.dtype)
+
+    def value_to_string(self, obj):
+        value = self.get_prep_value(self.value_from_object(obj))
+        if value is None:
+            return value
+        return base64.b64encode(value).decode('ascii')
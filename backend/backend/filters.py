@@ -0,0 +1,247 @@
+"""
+Filter sets of the api viewsets. Besides exact
+matches, ids accept comma separated lists with
+the __in suffix, numeric and date fields accept
+ranges with __gte and __lte, and every list can
+be sorted with the ordering param. Rows with an
+updated_at date can be synced incrementally
+with updated_at__gte.
+"""
+
+from django_filters import rest_framework as filters
+from . import models as custom_models
+
+IDS = ['exact', 'in']
+RANGE = ['exact', 'gte', 'lte']
+
+
+class CityFilter(filters.FilterSet):
+
+    ordering = filters.OrderingFilter(fields=('id', 'name', 'state'))
+
+    class Meta:
+        model = custom_models.City
+        fields = {
+            'id': IDS,
+            'name': ['exact'],
+            'state': ['exact'],
+        }
+
+
+class CompanyFilter(filters.FilterSet):
+
+    ordering = filters.OrderingFilter(fields=('id', 'name'))
+
+    class Meta:
+        model = custom_models.Company
+        fields = {
+            'id': IDS,
+            'name': ['exact'],
+            'nit': ['exact'],
+            'address': ['exact'],
+            'phone': ['exact'],
+            'city': IDS,
+        }
+
+
+class VibroUserFilter(filters.FilterSet):
+
+    company_name = filters.CharFilter(
+        field_name='company__name', lookup_expr='contains')
+    first_name = filters.CharFilter(lookup_expr='contains')
+    last_name = filters.CharFilter(lookup_expr='contains')
+    ordering = filters.OrderingFilter(
+        fields=('id', 'first_name', 'last_name', 'user_type'))
+
+    class Meta:
+        model = custom_models.VibroUser
+        fields = {
+            'id': IDS,
+            'user_type': ['exact', 'in'],
+            'company': IDS,
+        }
+
+
+class MachineFilter(filters.FilterSet):
+
+    company_id = filters.NumberFilter(field_name='company')
+    ordering = filters.OrderingFilter(
+        fields=('id', 'name', 'hierarchy', 'power', 'rpm'))
+
+    class Meta:
+        model = custom_models.Machine
+        fields = {
+            'id': IDS,
+            'company': ['in'],
+            'name': ['exact'],
+            'code': ['exact'],
+            'electric_feed': ['exact'],
+            'brand': ['exact'],
+            'power': RANGE,
+            'power_units': ['exact'],
+            'norm': ['exact'],
+            'hierarchy': RANGE,
+            'rpm': RANGE,
+            'updated_at': RANGE,
+        }
+
+
+class SensorFilter(filters.FilterSet):
+
+    machine_id = filters.NumberFilter(field_name='machine')
+    ordering = filters.OrderingFilter(fields=('id', 'channel'))
+
+    class Meta:
+        model = custom_models.Sensor
+        fields = {
+            'id': IDS,
+            'machine': ['in'],
+            'sensor_type': ['exact'],
+            'channel': RANGE,
+            'arduino': ['exact'],
+        }
+
+
+class GearFilter(filters.FilterSet):
+
+    gear_id = filters.NumberFilter(field_name='id')
+    machine_id = filters.NumberFilter(field_name='machine')
+    ordering = filters.OrderingFilter(fields=('id', 'gear_type'))
+
+    class Meta:
+        model = custom_models.Gear
+        fields = {
+            'id': IDS,
+            'machine': ['in'],
+            'gear_type': ['exact', 'in'],
+            'support': ['exact'],
+            'transmission': ['exact'],
+        }
+
+
+class AxisFilter(filters.FilterSet):
+
+    gear_id = filters.NumberFilter(field_name='gear')
+    ordering = filters.OrderingFilter(fields=('id', 'velocity'))
+
+    class Meta:
+        model = custom_models.Axis
+        fields = {
+            'id': IDS,
+            'gear': ['in'],
+            'type_axis': ['exact'],
+            'velocity': RANGE,
+        }
+
+
+class BearingFilter(filters.FilterSet):
+
+    axis_id = filters.NumberFilter(field_name='axis')
+    ordering = filters.OrderingFilter(fields=('id', 'reference'))
+
+    class Meta:
+        model = custom_models.Bearing
+        fields = {
+            'id': IDS,
+            'axis': ['in'],
+            'reference': ['exact', 'in'],
+            'frequency': ['exact'],
+        }
+
+
+class BearingGeometryFilter(filters.FilterSet):
+
+    ordering = filters.OrderingFilter(fields=('id', 'reference'))
+
+    class Meta:
+        model = custom_models.BearingGeometry
+        fields = {
+            'id': IDS,
+            'reference': ['exact', 'in'],
+        }
+
+
+class MeasurementFilter(filters.FilterSet):
+
+    company = filters.NumberFilter(field_name='machine__company')
+    ordering = filters.OrderingFilter(
+        fields=('id', 'date', 'severity', ('machine__hierarchy', 'hierarchy')))
+
+    class Meta:
+        model = custom_models.Measurement
+        fields = {
+            'id': IDS,
+            'service': ['exact', 'in'],
+            'measurement_type': ['exact', 'in'],
+            'machine': IDS,
+            'date': RANGE,
+            'severity': ['exact', 'in'],
+            'engineer_one': ['exact'],
+            'engineer_two': ['exact'],
+            'analyst': ['exact'],
+            'certifier': ['exact'],
+            'revised': ['exact'],
+            'resolved': ['exact'],
+            'updated_at': RANGE,
+        }
+
+
+class FlawFilter(filters.FilterSet):
+
+    ordering = filters.OrderingFilter(fields=('id', 'severity'))
+
+    class Meta:
+        model = custom_models.Flaw
+        fields = {
+            'id': IDS,
+            'measurement': IDS,
+            'flaw_type': ['exact', 'in'],
+            'severity': ['exact', 'in'],
+        }
+
+
+class TermoImageFilter(filters.FilterSet):
+
+    ordering = filters.OrderingFilter(fields=('id',))
+
+    class Meta:
+        model = custom_models.TermoImage
+        fields = {
+            'id': IDS,
+            'measurement': IDS,
+            'image_type': ['exact'],
+            'updated_at': RANGE,
+        }
+
+
+class PointFilter(filters.FilterSet):
+
+    # points have values in every measurement of their machine
+    measurement = filters.NumberFilter(
+        field_name='values__measurement', distinct=True)
+    ordering = filters.OrderingFilter(fields=('id', 'position'))
+
+    class Meta:
+        model = custom_models.Point
+        fields = {
+            'id': IDS,
+            'machine': IDS,
+            'position': RANGE,
+            'direction': ['exact'],
+            'point_type': ['exact'],
+        }
+
+
+class ValuesFilter(filters.FilterSet):
+
+    ordering = filters.OrderingFilter(fields=('id', 'tendency'))
+
+    class Meta:
+        model = custom_models.Values
+        fields = {
+            'id': IDS,
+            'point': IDS,
+            'measurement': IDS,
+            'tendency': RANGE,
+            'updated_at': RANGE,
+        }
@@ -0,0 +1,275 @@
+"""
+Binary acquisition format used by arduino users
+to upload a whole measurement in one request.
+
+All numbers are little-endian. A payload is a
+header followed by `frames` frames:
+
+    header  magic 'VIBR', version (uint8), pad byte,
+            frames (uint16), sample rate in Hz (uint32),
+            unix timestamp of the acquisition (uint32)
+    frame   channel (uint8), position (uint8),
+            direction (char), point type (char),
+            tendency (float32), spectrum lines (uint32),
+            signal samples (uint32), followed by the
+            spectrum and the time signal as float32.
+
+Frames sent with an empty spectrum get it computed
+from their time signal on the server.
+"""
+
+from rest_framework.exceptions import ParseError, ValidationError
+from collections import namedtuple
+from django.utils import timezone
+from django.db import transaction
+from .response_cache import invalidate_queryset
+from . import models as custom_models
+from .spectrum import compute_spectra
+import numpy as np
+import datetime
+import struct
+import math
+
+
+MAGIC = b'VIBR'
+VERSION = 1
+HEADER = struct.Struct('<4sBxHII')
+FRAME = struct.Struct('<BBccfII')
+SAMPLE = np.dtype('<f4')
+
+Acquisition = namedtuple(
+    'Acquisition', ['sample_rate', 'timestamp', 'frames'])
+Frame = namedtuple(
+    'Frame', [
+        'channel',
+        'position',
+        'direction',
+        'point_type',
+        'tendency',
+        'espectra',
+        'time_signal'])
+
+
+def encode_acquisition(frames, sample_rate, timestamp):
+    """
+    encode an iterable of Frame tuples
+    into the binary acquisition format.
+    """
+
+    frames = list(frames)
+    chunks = [HEADER.pack(
+        MAGIC, VERSION, len(frames), sample_rate, int(timestamp))]
+    for frame in frames:
+        espectra = np.asarray(frame.espectra, dtype=SAMPLE)
+        time_signal = np.asarray(frame.time_signal, dtype=SAMPLE)
+        chunks.append(FRAME.pack(
+            frame.channel,
+            frame.position,
+            frame.direction.encode(),
+            frame.point_type.encode(),
+            frame.tendency,
+            espectra.size,
+            time_signal.size))
+        chunks.append(espectra.tobytes())
+        chunks.append(time_signal.tobytes())
+    return b''.join(chunks)
+
+
+def decode_acquisition(payload):
+    """
+    decode a binary acquisition. Sample arrays
+    are read-only views over the payload so
+    no per-sample parsing takes place.
+    """
+
+    if len(payload) < HEADER.size:
+        raise ParseError('Carga binaria incompleta')
+    magic, version, count, sample_rate, timestamp = \
+        HEADER.unpack_from(payload)
+    if magic != MAGIC or version != VERSION:
+        raise ParseError('Formato de carga binaria no soportado')
+
+    frames = []
+    offset = HEADER.size
+    try:
+        for _ in range(count):
+            (channel, position, direction, point_type,
+             tendency, lines, samples) = FRAME.unpack_from(payload, offset)
+            offset += FRAME.size
+            espectra = np.frombuffer(
+                payload, dtype=SAMPLE, count=lines, offset=offset)
+            offset += espectra.nbytes
+            time_signal = np.frombuffer(
+                payload, dtype=SAMPLE, count=samples, offset=offset)
+            offset += time_signal.nbytes
+            frames.append(Frame(
+                channel,
+                position,
+                direction.decode('ascii'),
+                point_type.decode('ascii'),
+                tendency,
+                espectra,
+                time_signal))
+    except (struct.error, ValueError, UnicodeDecodeError):
+        raise ParseError('Trama binaria invalida')
+    if offset != len(payload):
+        raise ParseError('Carga binaria con bytes sobrantes')
+    return Acquisition(sample_rate, timestamp, frames)
+
+
+def store_acquisition(arduino, acquisition):
+    """
+    write every frame of an acquisition as Values
+    rows of the machines mapped to the arduino
+    channels. Points and measurements that do not
+    exist yet are created, and all values are
+    written with a single bulk insert.
+    """
+
+    for frame in acquisition.frames:
+        _validate_frame(frame)
+    sensors = {}
+    duplicated = set()
+    for sensor in custom_models.Sensor.objects.filter(
+            arduino=arduino, machine__isnull=False):
+        if sensor.channel in sensors:
+            duplicated.add(sensor.channel)
+        sensors[sensor.channel] = sensor
+    if duplicated:
+        raise ValidationError(
+            f'Canales con varios sensores: {sorted(duplicated)}')
+    missing = {frame.channel for frame in acquisition.frames} - set(sensors)
+    if missing:
+        raise ValidationError(
+            f'Canales sin sensor asignado: {sorted(missing)}')
+
+    date = datetime.datetime.fromtimestamp(
+        acquisition.timestamp, tz=timezone.get_current_timezone()).date()
+    machines = {sensors[frame.channel].machine_id
+                for frame in acquisition.frames}
+
+    with transaction.atomic():
+        measurements = _get_or_create_measurements(machines, date)
+        points = _get_or_create_points(acquisition.frames, sensors)
+        spectra = _compute_missing_spectra(acquisition)
+        values = [
+            custom_models.Values(
+                point=points[_point_key(frame, sensors)],
+                measurement=measurements[sensors[frame.channel].machine_id],
+                tendency=round(frame.tendency, 2),
+                espectra=spectra.get(index, frame.espectra),
+                time_signal=frame.time_signal,
+                sample_rate=acquisition.sample_rate)
+            for index, frame in enumerate(acquisition.frames)]
+        # bulk inserts send no signals
+        invalidate_queryset(
+            custom_models.Machine.objects.filter(id__in=machines))
+        return custom_models.Values.objects.bulk_create(values)
+
+
+def _compute_missing_spectra(acquisition):
+    """
+    compute in one batch the spectra of frames
+    uploaded with a time signal only. Returns
+    a dict of spectra keyed by frame index.
+    """
+
+    indexes = [
+        index for index, frame in enumerate(acquisition.frames)
+        if not frame.espectra.size and frame.time_signal.size]
+    if not indexes or not acquisition.sample_rate:
+        return {}
+    spectra = compute_spectra(
+        [acquisition.frames[index].time_signal for index in indexes],
+        acquisition.sample_rate,
+        [acquisition.frames[index].point_type for index in indexes])
+    return dict(zip(indexes, spectra))
+
+
+def _validate_frame(frame):
+    """
+    check the point description of a frame
+    against the choices of the Point model and
+    that its tendency and samples are finite.
+    """
+
+    positions = {choice for choice, _ in custom_models.Point.POSITION_CHOICES}
+    directions = {choice for choice, _ in custom_models.Point.DIRECTION_CHOICES}
+    point_types = {choice for choice, _ in custom_models.Point.TYPE_CHOICES}
+    if frame.position not in positions \
+            or frame.direction not in directions \
+            or frame.point_type not in point_types:
+        raise ValidationError(
+            f'Punto invalido en el canal {frame.channel}')
+    if not math.isfinite(frame.tendency):
+        raise ValidationError(
+            f'Tendencia invalida en el canal {frame.channel}')
+    if not np.isfinite(frame.espectra).all() \
+            or not np.isfinite(frame.time_signal).all():
+        raise ValidationError(
+            f'Muestras invalidas en el canal {frame.channel}')
+    if abs(frame.tendency) >= 100:
+        raise ValidationError(
+            'La tendencia debe ser menor a 100')
+
+
+def _point_key(frame, sensors):
+    return (
+        sensors[frame.channel].machine_id,
+        frame.position,
+        frame.direction,
+        frame.point_type)
+
+
+def _get_or_create_measurements(machines, date):
+    """
+    return a dict of vibration measurements
+    of the given date keyed by machine id.
+    """
+
+    queryset = custom_models.Measurement.objects.filter(
+        machine__id__in=machines,
+        date=date,
+        measurement_type=custom_models.Measurement.VIB)
+    measurements = {
+        measurement.machine_id: measurement for measurement in queryset}
+    created = custom_models.Measurement.objects.bulk_create([
+        custom_models.Measurement(
+            machine_id=machine,
+            date=date,
+            service=custom_models.Measurement.MON,
+            measurement_type=custom_models.Measurement.VIB,
+            analysis='',
+            diagnostic='')
+        for machine in machines if machine not in measurements])
+    measurements.update(
+        {measurement.machine_id: measurement for measurement in created})
+    return measurements
+
+
+def _get_or_create_points(frames, sensors):
+    """
+    return a dict of points keyed by
+    (machine, position, direction, type).
+    """
+
+    keys = {_point_key(frame, sensors) for frame in frames}
+    queryset = custom_models.Point.objects.filter(
+        machine__id__in={key[0] for key in keys})
+    points = {
+        (point.machine_id, point.position,
+         point.direction, point.point_type): point
+        for point in queryset}
+    created = custom_models.Point.objects.bulk_create([
+        custom_models.Point(
+            machine_id=machine,
+            position=position,
+            direction=direction,
+            point_type=point_type)
+        for machine, position, direction, point_type in keys
+        if (machine, position, direction, point_type) not in points])
+    points.update({
+        (point.machine_id, point.position,
+         point.direction, point.point_type): point
+        for point in created})
+    return points
@@ -0,0 +1,106 @@
+from .report.artifacts import report_key
+from django.core.cache import cache
+from .tasks import generate_report
+import time
+
+# states of jobs waiting in the queue or being built
+QUEUED = 'QUEUED'
+FAILED = 'FAILED'
+IN_FLIGHT = {QUEUED, 'STARTED', 'PROGRESS', 'RETRY'}
+# celery state -> status shown to clients
+STATUS = {
+    QUEUED: 'queued',
+    'STARTED': 'running',
+    'PROGRESS': 'running',
+    'RETRY': 'running',
+    'SUCCESS': 'done',
+    FAILED: 'failed',
+    'FAILURE': 'failed',
+    'REVOKED': 'failed',
+}
+# seconds a request holds the claim of a job while queueing
+# it, bounds the wait of the others if its process dies
+CLAIM_TIMEOUT = 30
+
+
+def start_report_job(user, measurement_ids):
+    """
+    queue the report of the given measurements
+    and return its job id. The id is the key of
+    the report, so identical requests share the
+    job while it is in flight or done instead
+    of rendering the same report again.
+    """
+
+    job_id = report_key(user, measurement_ids)
+    if queued_or_done(job_id):
+        return job_id
+    # only the request that claims the job queues it, the
+    # others find it in flight once the claim is released
+    claim = f'report-job:{job_id}'
+    if not cache.add(claim, True, CLAIM_TIMEOUT):
+        return job_id
+    try:
+        if queued_or_done(job_id):
+            return job_id
+        queued = time.time()
+        # mark the job before queueing it so concurrent
+        # requests see it in flight
+        generate_report.backend.store_result(
+            job_id, {'user': user.id, 'stage': 'queued', 'timings': {}},
+            QUEUED)
+        generate_report.apply_async(
+            args=(user.id, sorted(measurement_ids), queued), task_id=job_id)
+    finally:
+        cache.delete(claim)
+    return job_id
+
+
+def queued_or_done(job_id):
+    """
+    return whether a job is in flight
+    or its report was built.
+    """
+
+    state = generate_report.AsyncResult(job_id).state
+    return state in IN_FLIGHT or state == 'SUCCESS'
+
+
+def queued_status(job_id, user):
+    """
+    return the status of a job claimed by a
+    concurrent request that is still queueing it.
+    """
+
+    return {
+        'id': job_id,
+        'user': user.id,
+        'status': STATUS[QUEUED],
+        'stage': 'queued',
+        'timings': {},
+        'report': None,
+    }
+
+
+def job_status(job_id):
+    """
+    return the status of a job as a dict with
+    its owner, state, current stage, the time
+    spent in each stage and the id of the
+    stored report once it is done, or None if
+    the job doesn't exist.
+    """
+
+    result = generate_report.AsyncResult(job_id)
+    state = result.state
+    if state not in STATUS:
+        return None
+    info = result.info if isinstance(result.info, dict) else {}
+    return {
+        'id': job_id,
+        'user': info.get('user'),
+        'status': STATUS[state],
+        'stage': info.get('stage'),
+        'timings': info.get('timings', {}),
+        'report': info.get('report'),
+    }
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from backend.benchmarks import SUITES
+import json
+
+
+class Command(BaseCommand):
+
+    help = 'run a performance benchmark suite and print its results as json'
+
+    def add_arguments(self, parser):
+        parser.add_argument('suite', choices=sorted(SUITES))
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='times each measure is repeated')
+        parser.add_argument(
+            '--option',
+            action='append',
+            default=[],
+            metavar='NAME=VALUE',
+            help='integer parameter of the suite, e.g. machines=200')
+        parser.add_argument(
+            '--output',
+            help='also write the results to this file')
+
+    def handle(self, *args, **options):
+        parameters = {}
+        for option in options['option']:
+            name, _, value = option.partition('=')
+            try:
+                parameters[name] = int(value)
+            except ValueError:
+                raise CommandError(f'invalid option {option}')
+        results = SUITES[options['suite']](
+            repeat=options['repeat'], **parameters)
+        text = json.dumps(results, indent=2, default=str)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(text)
+        self.stdout.write(text)
@@ -0,0 +1,86 @@
+from django.db import migrations
+import backend.fields
+
+BATCH_SIZE = 500
+
+
+def arrays_to_compact(apps, schema_editor):
+    """
+    copy decimal arrays into the compact columns.
+    """
+
+    Values = apps.get_model('backend', 'Values')
+    batch = []
+    for value in Values.objects.only('espectra', 'time_signal').iterator():
+        value.espectra_compact = [float(num) for num in value.espectra]
+        value.time_signal_compact = [float(num) for num in value.time_signal]
+        batch.append(value)
+        if len(batch) == BATCH_SIZE:
+            Values.objects.bulk_update(
+                batch, ['espectra_compact', 'time_signal_compact'])
+            batch = []
+    Values.objects.bulk_update(
+        batch, ['espectra_compact', 'time_signal_compact'])
+
+
+def compact_to_arrays(apps, schema_editor):
+    """
+    copy compact columns back into decimal arrays,
+    clipping samples the decimal columns can't hold.
+    """
+
+    Values = apps.get_model('backend', 'Values')
+    batch = []
+    fields = ['espectra', 'time_signal']
+    for value in Values.objects.only(
+            'espectra_compact', 'time_signal_compact').iterator():
+        value.espectra = [
+            round(min(max(float(num), -99.99), 99.99), 2)
+            for num in value.espectra_compact]
+        value.time_signal = [
+            round(min(max(float(num), -99.99), 99.99), 2)
+            for num in value.time_signal_compact]
+        batch.append(value)
+        if len(batch) == BATCH_SIZE:
+            Values.objects.bulk_update(batch, fields)
+            batch = []
+    Values.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='values',
+            name='espectra_compact',
+            field=backend.fields.CompactArrayField(default=list),
+        ),
+        migrations.AddField(
+            model_name='values',
+            name='time_signal_compact',
+            field=backend.fields.CompactArrayField(default=list),
+        ),
+        migrations.RunPython(arrays_to_compact, compact_to_arrays),
+        migrations.RemoveField(
+            model_name='values',
+            name='espectra',
+        ),
+        migrations.RemoveField(
+            model_name='values',
+            name='time_signal',
+        ),
+        migrations.RenameField(
+            model_name='values',
+            old_name='espectra_compact',
+            new_name='espectra',
+        ),
+        migrations.RenameField(
+            model_name='values',
+            old_name='time_signal_compact',
+            new_name='time_signal',
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0002_values_compact_arrays'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='values',
+            name='sample_rate',
+            field=models.IntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0003_values_sample_rate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BearingGeometry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reference', models.CharField(max_length=30, unique=True)),
+                ('rolling_elements', models.IntegerField()),
+                ('ball_diameter', models.FloatField()),
+                ('pitch_diameter', models.FloatField()),
+                ('contact_angle', models.FloatField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,89 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0005_report'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bearing',
+            index=models.Index(
+                fields=['reference'],
+                name='backend_bea_referen_7c2583_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='city',
+            index=models.Index(
+                fields=['state'],
+                name='backend_cit_state_725ee5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flaw',
+            index=models.Index(
+                fields=['flaw_type'],
+                name='backend_fla_flaw_ty_423349_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flaw',
+            index=models.Index(
+                fields=['severity'],
+                name='backend_fla_severit_d5bbf9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gear',
+            index=models.Index(
+                fields=['gear_type'],
+                name='backend_gea_gear_ty_0c03e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='machine',
+            index=models.Index(
+                fields=['company', 'hierarchy'],
+                name='backend_mac_company_d303f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='machine',
+            index=models.Index(
+                fields=['brand'],
+                name='backend_mac_brand_a0da4a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='machine',
+            index=models.Index(
+                fields=['power'],
+                name='backend_mac_power_29a5b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='machine',
+            index=models.Index(
+                fields=['rpm'],
+                name='backend_mac_rpm_617367_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(
+                fields=['machine', 'date'],
+                name='backend_mea_machine_5161d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(
+                fields=['date'],
+                name='backend_mea_date_334013_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(
+                fields=['severity'],
+                name='backend_mea_severit_be650e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='point',
+            index=models.Index(
+                fields=['machine', 'position'],
+                name='backend_poi_machine_28755d_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0006_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='measurement',
+            name='backend_mea_date_334013_idx',
+        ),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(
+                fields=['date', 'id'],
+                name='backend_mea_date_d5f362_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+import backend.validators
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bearinggeometry',
+            name='rolling_elements',
+            field=models.IntegerField(validators=[
+                django.core.validators.MinValueValidator(
+                    1, message='El valor debe ser un número mayor a cero')]),
+        ),
+        migrations.AlterField(
+            model_name='bearinggeometry',
+            name='ball_diameter',
+            field=models.FloatField(
+                validators=[backend.validators.validate_positive]),
+        ),
+        migrations.AlterField(
+            model_name='bearinggeometry',
+            name='pitch_diameter',
+            field=models.FloatField(
+                validators=[backend.validators.validate_positive]),
+        ),
+    ]
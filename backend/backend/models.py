@@ -1,17 +1,21 @@
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.auth.models import AbstractUser
+from .fields import CompactArrayField
 from django.db import models
 from .validators import (
     PHONE_REGEX_VALIDATOR,
     CELPHONE_REGEX_VALIDATOR,
     NIT_REGEX_VALIDATOR,
-    ADDRESS_REGEX_VALIDATOR)
+    ADDRESS_REGEX_VALIDATOR,
+    validate_positive,
+    COUNT_VALIDATOR)
 
 
 class City(models.Model):
 
     class Meta:
         unique_together = ["name", "state"]
+        indexes = [models.Index(fields=['state'])]
 
     name = models.CharField(max_length=30)
     state = models.CharField(max_length=30)
@@ -102,6 +106,12 @@ class Machine(models.Model):
 
     class Meta:
         unique_together = ["name", "company"]
+        indexes = [
+            models.Index(fields=['company', 'hierarchy']),
+            models.Index(fields=['brand']),
+            models.Index(fields=['power']),
+            models.Index(fields=['rpm']),
+        ]
 
     # codes
     SAP = 'sap'
@@ -158,6 +168,7 @@ class Machine(models.Model):
     diagram = models.ImageField(
         upload_to="machines/diagrams",
         null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class Sensor(models.Model):
@@ -187,6 +198,10 @@ class Sensor(models.Model):
 
 
 class Gear(models.Model):  # equipo
+
+    class Meta:
+        indexes = [models.Index(fields=['gear_type'])]
+
     # gear type
     MOTOR_ELECTRICO = 'motor eléctrico'
     MOTOR_DIESEL = 'motor diesel'
@@ -299,6 +314,9 @@ class Axis(models.Model):  # eje
 
 class Bearing(models.Model):  # cojinetes
 
+    class Meta:
+        indexes = [models.Index(fields=['reference'])]
+
     NA = 'N/A'
     BPFI = 'BPFI'
     BPFO = 'BPFO'
@@ -323,6 +341,20 @@ class Bearing(models.Model):  # cojinetes
         on_delete=models.CASCADE)
 
 
+class BearingGeometry(models.Model):  # catalogo de rodamientos
+
+    reference = models.CharField(max_length=30, unique=True)
+    rolling_elements = models.IntegerField(validators=[COUNT_VALIDATOR])
+    ball_diameter = models.FloatField(
+        validators=[validate_positive])  # mm
+    pitch_diameter = models.FloatField(
+        validators=[validate_positive])  # mm
+    contact_angle = models.FloatField(default=0)  # degrees
+
+    def __str__(self):
+        return self.reference
+
+
 class Coupling(models.Model):
     RIG = "Rígido"
     FLEX = 'Flexible'
@@ -330,6 +362,9 @@ class Coupling(models.Model):
 
 class Point(models.Model):
 
+    class Meta:
+        indexes = [models.Index(fields=['machine', 'position'])]
+
     POSITION_CHOICES = [
         (num, num) for num in range(1, 13)
     ]
@@ -389,6 +424,11 @@ class Measurement(models.Model):
 
     class Meta:
         unique_together = ['measurement_type', 'date', 'machine']
+        indexes = [
+            models.Index(fields=['machine', 'date']),
+            models.Index(fields=['date', 'id']),
+            models.Index(fields=['severity']),
+        ]
 
     # severity
     RED = "red"
@@ -494,6 +534,7 @@ class Measurement(models.Model):
     resolved = models.BooleanField(default=False)
     prev_changes = models.TextField(null=True, )
     prev_changes_date = models.DateField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class Values(models.Model):
@@ -511,18 +552,20 @@ class Values(models.Model):
         decimal_places=2,
         max_digits=4,
         default=0)
-    espectra = ArrayField(
-        models.DecimalField(
-            decimal_places=2,
-            max_digits=4),
-        default=list)
-    time_signal = ArrayField(models.DecimalField(
-        decimal_places=2,
-        max_digits=4),
-        default=list)
+    espectra = CompactArrayField(default=list)
+    time_signal = CompactArrayField(default=list)
+    sample_rate = models.IntegerField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class Flaw(models.Model):  # falla
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['flaw_type']),
+            models.Index(fields=['severity']),
+        ]
+
     # severity
     RED = "red"
     GREEN = 'green'
@@ -608,3 +651,28 @@ class TermoImage(models.Model):
         default='undefined')
     description = models.TextField(null=True)
     image = models.ImageField(upload_to="termals")
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class Report(models.Model):
+
+    """
+    generated report document kept in the
+    default storage. The key identifies the
+    measurements, recipient, content and
+    version it was built from.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    version = models.IntegerField()
+    user = models.ForeignKey(
+        VibroUser,
+        related_name='reports',
+        on_delete=models.CASCADE)
+    measurements = models.ManyToManyField(
+        Measurement,
+        related_name='reports')
+    file = models.FileField(upload_to='reports')
+    filename = models.CharField(max_length=100)
+    size = models.IntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
@@ -1,4 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.utils.urls import replace_query_param
+from django.core.exceptions import ValidationError
+from rest_framework.exceptions import NotFound
+from django.db.models import Q
+import base64
+import json
 
 
 class CustomPagination(PageNumberPagination):
@@ -6,3 +13,126 @@ class CustomPagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = 'page_size'
     max_page_size = 1000
+
+
+class KeysetPagination(CursorPagination):
+
+    """
+    cursor pagination that seeks on every column
+    of the ordering instead of the first one, so
+    ties are never skipped with offsets. The
+    ordering is the one requested with the
+    ordering param or the ordering of the view,
+    always ending in the id to make it unique.
+    """
+
+    ordering = ('id',)
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = 'Cursor invalido'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(
+            field for field in queryset.query.order_by
+            if isinstance(field, str)) or tuple(
+                getattr(view, 'ordering', self.ordering))
+        if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering += ('id',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.reverse, position = self.decode_cursor(request)
+        ordering = tuple(
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering) if self.reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.seek(ordering, position))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        # an empty page past either end has no links
+        self.has_next = bool(self.page) and (self.reverse or has_more)
+        self.has_previous = bool(self.page) and (
+            has_more if self.reverse else position is not None)
+        return self.page
+
+    @staticmethod
+    def seek(ordering, position):
+        """
+        return the filter of the rows after the
+        position in the given ordering. Nulls
+        are sorted last in ascending order and
+        first in descending order.
+        """
+
+        condition = None
+        for field, value in reversed(list(zip(ordering, position))):
+            name = field.lstrip('-')
+            if field.startswith('-'):
+                after = Q(**{f'{name}__isnull': False}) if value is None \
+                    else Q(**{f'{name}__lt': value})
+            else:
+                after = Q(pk__in=[]) if value is None else \
+                    Q(**{f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+            if condition is not None:
+                equal = Q(**{f'{name}__isnull': True}) if value is None \
+                    else Q(**{name: value})
+                after |= equal & condition
+            condition = after
+        return condition
+
+    def position(self, instance):
+        values = []
+        for field in self.ordering:
+            value = instance
+            for attribute in field.lstrip('-').split('__'):
+                value = getattr(value, attribute, None)
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            reverse, position = bool(cursor['r']), list(cursor['p'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def encode_cursor(self, reverse, instance):
+        cursor = json.dumps(
+            {'r': int(reverse), 'p': self.position(instance)},
+            cls=DjangoJSONEncoder)
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(cursor.encode()).decode())
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(True, self.page[0])
@@ -0,0 +1,16 @@
+from rest_framework.parsers import BaseParser
+
+
+class BinaryParser(BaseParser):
+
+    """
+    Parser returning the raw bytes
+    of an octet-stream request body.
+    """
+
+    media_type = 'application/octet-stream'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return b''
+        return stream.read()
@@ -2,7 +2,8 @@ from rest_framework.permissions import BasePermission, SAFE_METHODS
 from .user_groups import (
     STAFF,
     ADMIN,
-    CLIENT
+    CLIENT,
+    ARDUINO
 )
 
 
@@ -63,3 +64,38 @@ class IsGetRequest(BasePermission):
 
     def has_permission(self, request, view):
         return request.user.is_authenticated and (request.method == 'GET') and request.user.is_active
+
+
+class CanRequestReport(BasePermission):
+
+    """
+    allow active users to queue report
+    jobs and poll their status.
+    """
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and \
+            request.user.is_active and request.method in {'GET', 'POST'}
+
+
+class IsDownloadRequest(BasePermission):
+
+    """
+    allow reading stored files, access to each
+    file is checked by the view.
+    """
+
+    def has_permission(self, request, view):
+        return request.method in {'GET', 'HEAD'}
+
+
+class IsArduino(BasePermission):
+
+    """
+    allow access to active arduino users only.
+    """
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and \
+            request.user.is_active and \
+            (request.user.user_type in ARDUINO)
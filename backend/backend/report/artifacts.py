@@ -0,0 +1,161 @@
+from django.core.files.base import ContentFile
+from backend import models as custom_models
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from io import BytesIO
+import hashlib
+import json
+
+# bump to rebuild every stored report when the layout changes
+VERSION = 1
+SALT = 'backend.report.download'
+
+
+def changes(queryset):
+    """
+    return the size, last id and last update of a
+    table, which change with every insert, delete
+    and edit of its rows.
+    """
+
+    return queryset.aggregate(
+        count=Count('id'), last=Max('id'), updated=Max('updated_at'))
+
+
+def fingerprint(user, measurement_ids):
+    """
+    return the state of the rows a report is built
+    from, so editing any of them builds a new
+    report. The machines, their history and its
+    values are summarized by their changes, the
+    few gears, points, companies and users shown
+    are listed with the fields the report prints.
+    """
+
+    measurements = custom_models.Measurement.objects.filter(
+        id__in=measurement_ids)
+    machines = measurements.values_list('machine_id', flat=True)
+    users = measurements.values_list(
+        'engineer_one', 'engineer_two', 'analyst', 'certifier')
+    user_ids = {user.id} | {
+        id for row in users for id in row if id is not None}
+    return [
+        changes(custom_models.Machine.objects.filter(id__in=machines)),
+        changes(custom_models.Measurement.objects.filter(
+            machine__id__in=machines)),
+        changes(custom_models.Values.objects.filter(
+            measurement__machine__id__in=machines)),
+        list(custom_models.Gear.objects.filter(
+            machine__id__in=machines).order_by('id').values_list(
+                'id', 'machine_id', 'gear_type', 'transmission')),
+        list(custom_models.Point.objects.filter(
+            machine__id__in=machines).order_by('id').values_list(
+                'id', 'machine_id', 'position', 'direction', 'point_type')),
+        list(custom_models.Company.objects.filter(
+            Q(machines__id__in=machines) | Q(id=user.company_id)).distinct(
+                ).order_by('id').values_list('id', 'name')),
+        list(custom_models.VibroUser.objects.filter(
+            id__in=user_ids).order_by('id').values_list(
+                'id', 'first_name', 'last_name', 'email', 'certifications')),
+    ]
+
+
+def report_key(user, measurement_ids):
+    """
+    return the key of the report of the given
+    measurements addressed to a user.
+    """
+
+    content = json.dumps(
+        [VERSION, user.id, sorted(measurement_ids),
+         fingerprint(user, measurement_ids)],
+        default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def plant_measurements(company_id, date):
+    """
+    return the ids of every measurement of a
+    company on a date, the ones shown in a
+    consolidated plant report.
+    """
+
+    return list(custom_models.Measurement.objects.filter(
+        machine__company__id=company_id, date=date).order_by(
+            'machine__hierarchy', 'id').values_list('id', flat=True))
+
+
+def build_report(user, measurement_ids, stage=None):
+    """
+    return the stored report of the given
+    measurements, building and storing it
+    if it doesn't exist yet. Returns None if
+    none of the measurements exist.
+
+    stage is called with the name of each
+    step as it starts, to track progress.
+    """
+
+    stage = stage or (lambda name: None)
+    stage('loading')
+    queryset = custom_models.Measurement.objects.filter(
+        id__in=measurement_ids).order_by('machine__hierarchy', 'id')
+    if not queryset.exists():
+        return None
+    key = report_key(user, measurement_ids)
+    report = custom_models.Report.objects.filter(key=key).first()
+    if report is not None:
+        return report
+
+    # the report engine is only loaded by the worker
+    from .plant import PlantReport
+
+    stage('rendering')
+    with BytesIO() as buffer:
+        PlantReport(buffer, queryset, user).build_doc()
+        content = buffer.getvalue()
+    stage('storing')
+    company_name = queryset.first().machine.company.name.upper()
+    report = custom_models.Report(
+        key=key,
+        version=VERSION,
+        user=user,
+        size=len(content))
+    report.file.save(f'{key}.pdf', ContentFile(content), save=False)
+    try:
+        with transaction.atomic():
+            report.save()
+            # named after its own creation, not the day it is sent
+            date = timezone.localdate(report.created)
+            report.filename = f'INFORME_PREDICTIVO_{company_name}_{date}.pdf'
+            report.save(update_fields=['filename'])
+    except IntegrityError:
+        # another worker stored the same report first
+        report.file.delete(save=False)
+        return custom_models.Report.objects.get(key=key)
+    report.measurements.set(queryset)
+    return report
+
+
+def download_token(report):
+    """
+    return a signed token granting access to
+    a report without logging in, used in the
+    links sent by email.
+    """
+
+    return signing.dumps(report.id, salt=SALT)
+
+
+def token_report_id(token, max_age):
+    """
+    return the report id of a token, or None
+    if it is invalid or older than max_age.
+    """
+
+    try:
+        return signing.loads(token, salt=SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
@@ -0,0 +1,128 @@
+from django.conf import settings
+from .charts import STYLE
+import hashlib
+import logging
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+# bump to invalidate every image when the drawing code changes
+VERSION = 1
+DEFAULT_SIZE = 256 * 1024 * 1024
+
+
+def _serialize(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'{type(value)} is not serializable')
+
+
+class ChartCache:
+
+    """
+    content addressed disk cache of rendered
+    charts. Images are keyed by a hash of the
+    chart series and rendering parameters and
+    the least recently used ones are evicted
+    once the cache grows over max_size bytes.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def key(chart):
+        """
+        return the hash of everything that
+        affects the rendered image.
+        """
+
+        content = json.dumps(
+            [VERSION, STYLE, chart], default=_serialize, sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.jpg')
+
+    def get(self, key):
+        """
+        return the cached image or None,
+        marking it as recently used.
+        """
+
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as image:
+                content = image.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return content
+
+    def set(self, key, content):
+        """
+        store an image atomically so concurrent
+        workers never read a partial file. The
+        cache is best effort, a failed write is
+        logged and the image is still used.
+        """
+
+        path = self.path(key)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temporary, 'wb') as image:
+                image.write(content)
+            os.replace(temporary, path)
+        except OSError as exc:
+            logger.warning('No se pudo guardar la grafica %s: %s', key, exc)
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    def evict(self):
+        """
+        remove the least recently used images
+        until the cache fits in max_size. Files
+        being written by other workers are left
+        alone.
+        """
+
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError as exc:
+                logger.warning(
+                    'No se pudo borrar la grafica %s: %s', path, exc)
+            total -= size
+
+
+def chart_cache():
+    """
+    return the cache configured in settings,
+    or None when caching is disabled.
+    """
+
+    directory = getattr(settings, 'REPORT_CHART_CACHE_DIR', None)
+    if not directory:
+        return None
+    return ChartCache(
+        directory,
+        getattr(settings, 'REPORT_CHART_CACHE_SIZE', DEFAULT_SIZE))
@@ -0,0 +1,155 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from collections import namedtuple
+import matplotlib.dates as mpl_dates
+from django.conf import settings
+from matplotlib import style
+from io import BytesIO
+import billiard
+import atexit
+import os
+
+# colors used in graphs
+COLORS = (
+    '#0000FF',
+    '#FF0000',
+    '#006600',
+    '#ff66cc',
+    '#00ff00',
+    '#ffff00',
+    '#660066',
+    '#00ffff',
+    '#F39C12',
+    '#148F77',
+    '#C0392B',
+    '#0E6251'
+)
+# renamed in newer matplotlib releases
+STYLE = 'seaborn-ticks' if 'seaborn-ticks' in style.available \
+    else 'seaborn-v0_8-ticks'
+SIZE = (10, 3.5)
+DPI = 300
+
+# series is a tuple of (label, dates, values)
+Chart = namedtuple('Chart', ['title', 'units', 'series', 'size', 'dpi'])
+
+# (process id, size, pool) of the pool of the current process
+_pool = (None, 0, None)
+
+
+def tendency_chart(title, units, data, size=SIZE, dpi=DPI):
+    """
+    build the description of a tendency chart
+    from the output of format_tendency_data.
+    """
+
+    series = tuple(
+        (key, tuple(entry['dates']), tuple(entry['values']))
+        for key, entry in data.items())
+    return Chart(title, units, series, size, dpi)
+
+
+def render_tendency(chart):
+    """
+    draw a tendency chart with the object
+    oriented Agg API, free of pyplot state,
+    so it can run in any process.
+
+    Returns the image as jpg bytes.
+    """
+
+    with style.context(STYLE):
+        figure = Figure(figsize=chart.size)
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        for index, (label, dates, values) in enumerate(chart.series):
+            ax.plot(
+                dates,
+                values,
+                linestyle='solid',
+                label=label,
+                color=COLORS[index % len(COLORS)],
+                marker='.')
+        ax.set_title(chart.title)
+        ax.xaxis.set_major_formatter(mpl_dates.DateFormatter('%d/%m/%Y'))
+        ax.set_xlabel('Fecha', labelpad=5)
+        ax.set_ylabel(chart.units)
+        if chart.series:
+            ax.legend(
+                loc='center left',
+                bbox_to_anchor=(1, 0.5),
+                fancybox=True,
+                shadow=True, ncol=1)
+        ax.set_ylim(bottom=0)
+        ax.grid(True)
+        figure.tight_layout()
+        buffer = BytesIO()
+        figure.savefig(
+            buffer,
+            bbox_inches="tight",
+            transparent=True,
+            dpi=chart.dpi,
+            format='jpg')
+    return buffer.getvalue()
+
+
+def render_workers():
+    """
+    return the number of processes
+    used to render charts.
+    """
+
+    return getattr(settings, 'REPORT_RENDER_WORKERS', 2)
+
+
+def render_pool(workers):
+    """
+    return the pool of the current process,
+    started on first use and kept for the next
+    reports. Forked children and other sizes
+    get a pool of their own.
+    """
+
+    global _pool
+    pid, size, pool = _pool
+    if pid == os.getpid() and size == workers:
+        return pool
+    if pid == os.getpid():
+        pool.terminate()
+    pool = billiard.Pool(processes=workers)
+    atexit.register(pool.terminate)
+    _pool = (os.getpid(), workers, pool)
+    return pool
+
+
+def render_charts(charts, workers=None, cache=None):
+    """
+    render a batch of charts concurrently in a
+    process pool. The pool is the one of celery,
+    whose processes may start children even in
+    the daemon processes of prefork workers, and
+    is reused by every batch of the process.
+    Charts found in the cache are not rendered
+    again. Returns the images in the same order
+    as the charts.
+    """
+
+    charts = list(charts)
+    keys = [cache.key(chart) for chart in charts] if cache else []
+    images = [cache.get(key) for key in keys] if cache else [None] * len(charts)
+    missing = [index for index, image in enumerate(images) if image is None]
+
+    workers = workers or render_workers()
+    if workers <= 1 or len(missing) <= 1:
+        rendered = [render_tendency(charts[index]) for index in missing]
+    else:
+        rendered = render_pool(workers).map(
+            render_tendency, [charts[index] for index in missing])
+
+    for index, image in zip(missing, rendered):
+        images[index] = image
+        if cache:
+            cache.set(keys[index], image)
+    if cache and missing:
+        cache.evict()
+    return images
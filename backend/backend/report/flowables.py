@@ -7,6 +7,8 @@ from reportlab.platypus.tables import Table
 from reportlab.platypus.frames import Frame
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import cm
+from .loader import ReportData
+from functools import lru_cache
 import datetime
 import sys
 import os
@@ -19,11 +21,6 @@ LOGO = os.path.join(B_DIR, 'static', 'images', 'logo.jpg')
 SKF = os.path.join(B_DIR, 'static', 'images', 'skf.jpg')
 DIAGRAM = os.path.join(B_DIR, 'static', 'images', 'numeration.png')
 ARROW = os.path.join(B_DIR, 'static', 'images', 'arrow.png')
-# register fonts
-registerFont(TTFont('Arial', os.path.join(
-    B_DIR, 'static', 'fonts', 'arial.ttf')))
-registerFont(
-    TTFont('Arial-Bold', os.path.join(B_DIR, 'static', 'fonts', 'arialbd.ttf')))
 
 
 # datetime constants
@@ -41,10 +38,6 @@ MONTHS = (
     'noviembre',
     'diciembre'
 )
-NOW = datetime.datetime.now()
-CURRENT_YEAR = NOW.year
-CURRENT_MONTH = NOW.month
-CURRENT_DAY = NOW.day
 # constants for footer
 ADDRESS = 'Calle 9A  No. 54 - 129 Guayabal'
 PHONE = 'PBX: (4) 362 00 62'
@@ -108,11 +101,9 @@ LEVEL_ONE = ParagraphStyle(
 LEVEL_TWO = ParagraphStyle(
     name='level_two', fontName='Arial', fontSize=10, leftIndent=30, endDots=' . ')
 # footer paragraph lines
-LINE_ONE = Paragraph('_' * 80, style=BLUE_FOOTER)
-LINE_TWO = Paragraph(
-    f'{ADDRESS} {PHONE} {CELPHONE} {WHATSAPP}', style=BLACK_SMALL)
-LINE_THREE = Paragraph(
-    text=f'{WEBSITE} E-mail: <a href="mailto:{EMAIL}"><font color="blue">{EMAIL}</font></a> {FOOTER_CITY}', style=GREEN_SMALL)
+LINE_ONE = '_' * 80
+LINE_TWO = f'{ADDRESS} {PHONE} {CELPHONE} {WHATSAPP}'
+LINE_THREE = f'{WEBSITE} E-mail: <a href="mailto:{EMAIL}"><font color="blue">{EMAIL}</font></a> {FOOTER_CITY}'
 # Frames used for templates
 STANDARD_FRAME = Frame(1.6*cm, 2*cm, 18*cm, 26*cm,
                        id='standard')
@@ -120,6 +111,19 @@ MACHINE_FRAME = Frame(1.6*cm, 2*cm, 18*cm, 23*cm,
                       id='big_header')
 
 
+@lru_cache(maxsize=None)
+def register_fonts():
+    """
+    register the report fonts once per process,
+    the first time a document is created.
+    """
+
+    registerFont(TTFont('Arial', os.path.join(
+        B_DIR, 'static', 'fonts', 'arial.ttf')))
+    registerFont(
+        TTFont('Arial-Bold', os.path.join(B_DIR, 'static', 'fonts', 'arialbd.ttf')))
+
+
 class Flowables(BaseDocTemplate):
 
     """
@@ -128,15 +132,20 @@ class Flowables(BaseDocTemplate):
     """
 
     def __init__(self, filename, queryset, user, **kwargs):
+        register_fonts()
         super().__init__(filename, **kwargs)
         self.filename = filename
         self.queryset = queryset
+        self.data = ReportData(queryset)
         self.user = user
         self.company = self.user.company.name
-        self.date = self.queryset.first().date.date.strftime('%d/%m/%Y')
-        self.engineer_one = self.queryset.first().engineer_one
-        self.engineer_two = self.queryset.first().engineer_two
+        self.date = self.data.first().date.strftime('%d/%m/%Y')
+        self.engineer_one = self.data.first().engineer_one
+        self.engineer_two = self.data.first().engineer_two
         self.width = 18 * cm
+        # header tables by date and footer table
+        self._headers = {}
+        self._footer_table = None
         self.leftMargin = 1.6 * cm
         self.bottomMargin = 2 * cm
         self.templates = [
@@ -178,8 +187,7 @@ class Flowables(BaseDocTemplate):
         w, h = page.wrap(self.width, 1 * cm)
         page.drawOn(canvas, self.leftMargin + 0.5 * cm +
                     ((self.width - w) / 2), (29 * cm) - h)
-        report_date = Paragraph(self.date.upper(), style=STANDARD_HEADER)
-        table = self._create_header_table(report_date)
+        table = self._header_table(self.date)
         _, ht = table.wrap(self.width, 3 * cm)
         table.drawOn(canvas, self.leftMargin, 28 * cm - ht)
         canvas.restoreState()
@@ -216,7 +224,7 @@ class Flowables(BaseDocTemplate):
         w, h = page.wrap(self.width, 1 * cm)
         page.drawOn(canvas, self.leftMargin + 0.5 * cm +
                     ((self.width - w) / 2), (29 * cm) - h)
-        table = self._create_header_table('')
+        table = self._header_table('')
         _, ht = table.wrap(self.width, 3 * cm)
         table.drawOn(canvas, self.leftMargin, 28 * cm - ht)
         canvas.restoreState()
@@ -229,12 +237,27 @@ class Flowables(BaseDocTemplate):
         """
 
         canvas.saveState()
-        table = self._create_footer_table()
+        if self._footer_table is None:
+            self._footer_table = self._create_footer_table()
+        table = self._footer_table
         _, h = table.wrap(self.width, self.bottomMargin)
         table.drawOn(canvas, self.leftMargin, (2 * cm - h) / 2)
         canvas.restoreState()
 
     # flowables used in footers/headers
+    def _header_table(self, report_date):
+        """
+        return the header table for a date, built
+        once per report and drawn on every page.
+        """
+
+        if report_date not in self._headers:
+            paragraph = Paragraph(
+                report_date.upper(),
+                style=STANDARD_HEADER) if report_date else ''
+            self._headers[report_date] = self._create_header_table(paragraph)
+        return self._headers[report_date]
+
     def _create_header_table(self, report_date):
         """
         create table to manage
@@ -277,7 +300,11 @@ class Flowables(BaseDocTemplate):
         elements in footer.
         """
 
-        data = [[LINE_ONE], [LINE_TWO], [LINE_THREE]]
+        data = [
+            [Paragraph(LINE_ONE, style=BLUE_FOOTER)],
+            [Paragraph(LINE_TWO, style=BLACK_SMALL)],
+            [Paragraph(LINE_THREE, style=GREEN_SMALL)]
+        ]
         styles = [
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER')
@@ -302,8 +329,9 @@ class Flowables(BaseDocTemplate):
         """
 
         name = f'{self.user.first_name} {self.user.last_name}'
+        today = datetime.date.today()
         date = Paragraph(
-            f'Medellín, {CURRENT_DAY} de {MONTHS[CURRENT_MONTH - 1]} de {CURRENT_YEAR},',
+            f'Medellín, {today.day} de {MONTHS[today.month - 1]} de {today.year},',
             style=STANDARD)
         engineer_client = Paragraph(
             f"""Ingeniero:<br/><font name="Arial-Bold">{name.upper()}
@@ -399,9 +427,9 @@ class Flowables(BaseDocTemplate):
                 ],
                 [  # TODO verify linebreaks \t in certifications of each engineer
                     self.create_signature_line(
-                        self.engineer_one.profile.certifications),
+                        ', '.join(self.engineer_one.certifications)),
                     self.create_signature_line(
-                        self.engineer_two.profile.certifications)
+                        ', '.join(self.engineer_two.certifications))
                 ]
             ]
         else:
@@ -409,7 +437,7 @@ class Flowables(BaseDocTemplate):
                 [self.create_signature_line(line), ''],
                 [self.create_signature_name(first_engineer_full_name), ''],
                 [self.create_signature_line(
-                    self.engineer_one.profile.certifications),
+                    ', '.join(self.engineer_one.certifications)),
                     '']
             ]
         styles = [
@@ -858,6 +886,16 @@ class Flowables(BaseDocTemplate):
 
     # Pred flowables
 
+    def machine_title(self, machine):
+        """
+        return the type and name of
+        a machine used in titles.
+        """
+
+        gear = self.data.main_gear(machine)
+        gear_type = gear.gear_type if gear else ''
+        return f'{gear_type} {machine.name}'.strip()
+
     @staticmethod
     def create_measurement_title_entry(string):
         """
@@ -878,10 +916,11 @@ class Flowables(BaseDocTemplate):
             B_DIR, 'static', 'images', f'{query_instance.severity}.png')
         severity_image = Image(image, width=1.8 * cm, height=2 * cm)
         machine = query_instance.machine
-        code = machine.code.upper()
-        transmission = machine.transmission.upper()
+        code = (machine.code or 'N/A').upper()
+        gear = self.data.main_gear(machine)
+        transmission = gear.transmission.upper() if gear else 'N/A'
         brand = machine.brand.upper()
-        power = machine.power.upper()
+        power = f'{machine.power} {machine.power_units}'.upper()
         rpm = f'{machine.rpm}'.upper()
 
         data = [
@@ -921,14 +960,15 @@ class Flowables(BaseDocTemplate):
 
         img_width = 7 * cm
         img_height = 6 * cm
+        # machines without pictures leave the cell empty
         diagram_img = Image(
             diagram_img,
             width=img_width,
-            height=img_height)
+            height=img_height) if diagram_img else ''
         machine_img = Image(
             machine_img,
             width=img_width,
-            height=img_height)
+            height=img_height) if machine_img else ''
         diagram = Paragraph('DIAGRAMA ESQUEMATICO', style=BLACK_BOLD_CENTER)
         machine = Paragraph('IMAGEN MAQUINA', style=BLACK_BOLD_CENTER)
         data = [[diagram, machine], [diagram_img, machine_img]]
@@ -1,11 +1,13 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from .charts import COLORS, render_charts, tendency_chart
 from reportlab.lib.colors import black, Color
 from .flowables import Flowables, TABLE_BLUE
 from reportlab.platypus.tables import Table
 from reportlab.platypus import TableStyle
-from backend import models as custom_models
+from matplotlib.figure import Figure
 import matplotlib.dates as mpl_dates
 from reportlab.lib.units import cm
-import matplotlib.pyplot as plt
+from .cache import chart_cache
 from io import BytesIO
 import datetime
 
@@ -19,38 +21,23 @@ class Graphs(Flowables):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.buffers = []
-        self.custom_colors = [
-            # colors used in graphs
-            '#0000FF',
-            '#FF0000',
-            '#006600',
-            '#ff66cc',
-            '#00ff00',
-            '#ffff00',
-            '#660066',
-            '#00ffff',
-            '#F39C12',
-            '#148F77',
-            '#C0392B',
-            '#0E6251'
-        ]
+        # (measurement id, point type) -> rendered tendency graph
+        self.graphs = {}
 
     def retrieve_measurements(self, query_instance):
         """
-        retrieve queryset of all 'pred'
-        measurements for a given machiine
-        ordered by date.
+        retrieve the 'pred' readings of the
+        machine of a measurement, newest first,
+        from the data loaded for the report.
         """
 
-        return custom_models.Measurement.objects.filter(
-            machine=query_instance.machine,
-            measurement_type='pred').order_by('date__date')
+        return self.data.history(query_instance)
 
-    def format_table_data(self, measurements, title):
+    def format_table_data(self, readings, title):
         """
-        abstract data from measurements models
-        generators and format it to be consumed
-        by create_table_graph method.
+        abstract data from the loaded readings
+        and format it to be consumed by
+        create_table_graph method.
 
         Returns two list. A 2d lists containing
         all the rows used in the table and a row
@@ -58,19 +45,13 @@ class Graphs(Flowables):
         """
 
         # TODO check if its only V and A
-        points = ((measurement.points.filter(point_type__in=['A', 'V']),
-                   measurement.date.date.strftime('%d/%m/%Y')) for measurement in measurements[:2])
         data = {'dates': []}
-        keys = set()
-        for point_generator, date in points:
+        for reading in readings[:2]:
+            date = reading.date.strftime('%d/%m/%Y')
             data['dates'].append(date)
-            for point in point_generator:
-                key = f'{point.number}{point.position}{point.point_type}'
-                if key in keys:
-                    data[key][date] = point.tendency.value
-                else:
-                    data[key] = {date: point.tendency.value}
-                    keys.add(key)
+            for key, tendency in reading.tendencies.items():
+                if key[-1] in ('A', 'V'):
+                    data.setdefault(key, {})[date] = tendency
 
         try:
             previous_date = data['dates'][1]
@@ -148,10 +129,10 @@ class Graphs(Flowables):
         Returns an image in bytes format.
         """
 
-        measurements = self.retrieve_measurements(query_instance)
+        readings = self.retrieve_measurements(query_instance)
         # TODO confirm title
-        title = f'{query_instance.machine.machine_type} {query_instance.machine.name}'.upper()
-        rows = self.format_table_data(measurements, title)
+        title = self.machine_title(query_instance.machine).upper()
+        rows = self.format_table_data(readings, title)
 
         styles = [
             ('SPAN', (0, 0), (-1, 0)),
@@ -169,11 +150,11 @@ class Graphs(Flowables):
         table.setStyle(TableStyle(styles))
         return table
 
-    def format_tendency_data(self, measurements, position):
+    def format_tendency_data(self, readings, point_type):
         """
-        abstract data from measurements models
-        generators and format it to be consumed
-        by create_tendency_graph method.
+        abstract data from the loaded readings
+        and format it to be consumed by
+        create_tendency_graph method.
 
         Returns a dictionary populated with data
         in the format:
@@ -181,79 +162,64 @@ class Graphs(Flowables):
         {key: {values: [v1..vn], dates: [d1..dn]}}
         """
 
-        points = ((measurement.points.filter(point_type=position),
-                   measurement.date.date) for measurement in measurements[:10])
         data = {}
-        keys = set()
-        for point_generator, date in points:
-            for point in point_generator:
-                key = f'{point.number}{point.position}{point.point_type}'
-                if key in keys:
-                    data[key]['values'].append(point.tendency.value)
-                    data[key]['dates'].append(date)
-                else:
-                    data[key] = {
-                        'values': [point.tendency.value],
-                        'dates': [date]
-                    }
-                    keys.add(key)
+        # oldest first so the lines are drawn in order
+        for reading in reversed(readings[:10]):
+            for key, tendency in reading.tendencies.items():
+                if key.endswith(point_type):
+                    entry = data.setdefault(key, {'values': [], 'dates': []})
+                    entry['values'].append(tendency)
+                    entry['dates'].append(reading.date)
         return data
 
-    def create_tendency_graph(self, query_instance, position):
+    def describe_tendency(self, query_instance, position):
         """
-        create chart graph of tendency
-        values for vel or acc.
-
-        Returns an image in bytes format.
+        describe the tendency chart of vel or
+        acc values of a measurement so it can
+        be rendered in another process.
         """
 
-        measurements = self.retrieve_measurements(query_instance)
-        data = self.format_tendency_data(measurements, position)
-
-        _, ax = plt.subplots(figsize=(10, 3.5))
-        for index, key in enumerate(data.keys()):
-            ax.plot_date(
-                data[key]['dates'],
-                data[key]['values'],
-                linestyle='solid',
-                label=key,
-                color=self.custom_colors[index],
-                marker='.')
-
+        readings = self.retrieve_measurements(query_instance)
+        data = self.format_tendency_data(readings, position)
         if position == 'V':
             units = 'mm/s - Pico'
         else:
             units = 'g - RMS'
-
-        date_format = mpl_dates.DateFormatter('%d/%m/%Y')
         # TODO title needs review
-        ax.set_title(
-            f"""Tendencia\n{query_instance.machine.machine_type}
-            {query_instance.machine.name}, Canal X""")
-        ax.xaxis.set_major_formatter(date_format)  # set format to x  axis
-        ax.xaxis_date()
-        ax.set_xlabel('Fecha', labelpad=5)
-        ax.set_ylabel(units)
-        ax.legend(
-            loc='center left',
-            bbox_to_anchor=(1, 0.5),
-            fancybox=True,
-            shadow=True, ncol=1)
-        ax.set_ylim(bottom=0)
-        plt.style.use('seaborn-ticks')
-        plt.grid(True)
-        plt.tight_layout()
-        buff = BytesIO()
-        plt.savefig(
-            buff,
-            bbox_inches="tight",
-            transparent=True,
-            dpi=300,
-            format='jpg'
-        )
-        buff.seek(0)
-        self.buffers.append(buff)
-        return buff
+        title = f'Tendencia\n{self.machine_title(query_instance.machine)}, Canal X'
+        return tendency_chart(title, units, data)
+
+    def render_tendency_graphs(self, measurements, positions=('V', 'A')):
+        """
+        render the tendency graphs of every
+        measurement at once in a process pool,
+        reusing the cached ones.
+        """
+
+        keys = [(measurement, position)
+                for measurement in measurements for position in positions]
+        images = render_charts(
+            (self.describe_tendency(measurement, position)
+             for measurement, position in keys),
+            cache=chart_cache())
+        for (measurement, position), image in zip(keys, images):
+            buff = BytesIO(image)
+            self.buffers.append(buff)
+            self.graphs[(measurement.id, position)] = buff
+
+    def create_tendency_graph(self, query_instance, position):
+        """
+        return the chart graph of tendency
+        values for vel or acc, rendering it
+        when it was not rendered in advance.
+
+        Returns an image in bytes format.
+        """
+
+        key = (query_instance.id, position)
+        if key not in self.graphs:
+            self.render_tendency_graphs([query_instance], [position])
+        return self.graphs[key]
 
     def create_time_signal_graph(self, query_instance, position):
         """
@@ -273,19 +239,20 @@ class Graphs(Flowables):
         else:
             units = 'g - RMS'
 
-        _, ax = plt.subplots(figsize=(10, 3.5))
-        ax.plot_date(
+        figure = Figure(figsize=(10, 3.5))
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        ax.plot(
             time,
             values,
             linestyle='solid',
             label=label,
-            color=self.custom_colors[0],
+            color=COLORS[0],
             linewidth=0.6)
         date_format = mpl_dates.DateFormatter('%d/%m/%Y')
         # TODO review title
         ax.set_title(
-            f"""Señal en el Tiempo\n{query_instance.machine.machine_type}
-            {query_instance.machine.name}, Canal X""")
+            f'Señal en el Tiempo\n{self.machine_title(query_instance.machine)}, Canal X')
         ax.xaxis.set_major_formatter(date_format)  # set format to x  axis
         ax.set_xlabel('Fecha', labelpad=5)
         ax.set_ylabel(units)
@@ -295,11 +262,10 @@ class Graphs(Flowables):
             fancybox=True,
             shadow=True, ncol=1)
 
-        plt.style.use('seaborn-ticks')
-        plt.grid(True)
-        plt.tight_layout()
+        ax.grid(True)
+        figure.tight_layout()
         buff = BytesIO()
-        plt.savefig(
+        figure.savefig(
             buff,
             bbox_inches="tight",
             transparent=True,
@@ -323,8 +289,9 @@ class Graphs(Flowables):
 
         df_spec = pd.read_csv('Export_Spectra.csv', delimiter=';',
                               encoding='ISO-8859-1')  # open csv to create a dataframe
-        fig = plt.figure(figsize=(10, 5))
-        ax = fig.add_subplot(111, projection='3d')
+        figure = Figure(figsize=(10, 5))
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot(111, projection='3d')
         z_ticks = []
         if point.upper().startswith(('AC', 'VE', 'EN')):
             _rows = []
@@ -388,13 +355,13 @@ class Graphs(Flowables):
         rcParams['axes.labelpad'] = 25  # distance of labels from ticks
         ax.legend(loc="upper left", bbox_to_anchor=(0.08, 1),
                   fancybox=True, shadow=True, ncol=1)  # specify params for legend
-        plt.tight_layout()
+        figure.tight_layout()
         ax.set_yticks(z_ticks)
         ax.margins(0, 0, 0)
         ax.view_init(elev=70, azim=-90)
 
         buff = BytesIO()
-        plt.savefig(
+        figure.savefig(
             buff,
             bbox_inches="tight",
             format='jpg',
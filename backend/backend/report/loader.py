@@ -0,0 +1,114 @@
+from backend import models as custom_models
+from collections import namedtuple
+from django.db.models import Q
+
+# measurements of each machine shown in the tendency graphs
+HISTORY = 10
+
+# tendencies is a dict of point key -> tendency value
+Reading = namedtuple('Reading', ['date', 'tendencies'])
+
+
+def point_key(position, direction, point_type):
+    """
+    return the label of a point in
+    the report tables, e.g. 1HV.
+    """
+
+    return f'{position}{direction}{point_type}'
+
+
+class ReportData:
+
+    """
+    load every measurement, point and value
+    a report needs with a fixed number of
+    queries and keep them in memory so the
+    segments never hit the database.
+    """
+
+    def __init__(self, queryset, history=HISTORY):
+        self.history_size = history
+        self.measurements = list(queryset.select_related(
+            'machine',
+            'machine__company',
+            'engineer_one',
+            'engineer_two',
+            'analyst',
+            'certifier').prefetch_related('machine__gears'))
+        self.histories = self._load_histories()
+
+    def _load_histories(self):
+        """
+        return a dict of measurement id -> list of
+        readings of its machine, newest first, up
+        to the date of the measurement.
+        """
+
+        anchors = {
+            (measurement.machine_id, measurement.date)
+            for measurement in self.measurements}
+        if not anchors:
+            return {}
+        # one query for the history of every machine in the report,
+        # each limited in SQL to the last readings up to its dates
+        predictive = custom_models.Measurement.objects.filter(
+            service=custom_models.Measurement.PRED)
+        latest = Q()
+        for machine, date in anchors:
+            latest |= Q(id__in=predictive.filter(
+                machine_id=machine, date__lte=date).order_by(
+                    '-date').values('id')[:self.history_size])
+        history = predictive.filter(latest).order_by(
+            'machine_id', '-date').values_list('id', 'machine_id', 'date')
+        machine_history = {}
+        for id, machine, date in history:
+            machine_history.setdefault(machine, []).append((id, date))
+
+        # one query for the values of every measurement in those histories
+        tendencies = {}
+        values = custom_models.Values.objects.filter(
+            measurement__id__in=[
+                id for entries in machine_history.values()
+                for id, _ in entries]).order_by(
+                    'point__position', 'point__direction', 'point__point_type'
+        ).values_list(
+            'measurement_id',
+            'point__position',
+            'point__direction',
+            'point__point_type',
+            'tendency')
+        for measurement, position, direction, point_type, tendency in values:
+            tendencies.setdefault(measurement, {})[
+                point_key(position, direction, point_type)] = float(tendency)
+
+        return {
+            measurement.id: [
+                Reading(date, tendencies.get(id, {}))
+                for id, date in machine_history.get(measurement.machine_id, [])
+                if date <= measurement.date][:self.history_size]
+            for measurement in self.measurements}
+
+    def first(self):
+        """
+        return the first measurement of the report.
+        """
+
+        return self.measurements[0] if self.measurements else None
+
+    def main_gear(self, machine):
+        """
+        return the first gear of a machine, the
+        one that describes it in the report.
+        """
+
+        gears = machine.gears.all()
+        return gears[0] if gears else None
+
+    def history(self, measurement):
+        """
+        return the readings of the machine of a
+        measurement, newest first.
+        """
+
+        return self.histories.get(measurement.id, [])
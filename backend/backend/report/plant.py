@@ -0,0 +1,198 @@
+from reportlab.pdfgen.canvas import Canvas
+from .static import ReportCanvas, IMAGES_DIR
+from django.conf import settings
+from .report import Report
+import os
+
+# measurements whose charts are rendered and laid out together
+SECTION_SIZE = 20
+# drafts don't draw images, any file gives the layout its size
+PLACEHOLDER = os.path.join(IMAGES_DIR, 'logo.jpg')
+# drafts of the front matter until its page count settles
+FRONT_DRAFTS = 3
+
+
+class DraftCanvas(Canvas):
+
+    """
+    canvas used to measure the layout of a part
+    of the report. Images are skipped so they
+    are never decoded or encoded.
+    """
+
+    def drawImage(self, image, x, y, width=None, height=None, **kwargs):
+        return (width, height)
+
+    def drawInlineImage(self, image, x, y, width=None, height=None,
+                        **kwargs):
+        return (width, height)
+
+
+class SectionStory(list):
+
+    """
+    story that pulls the flowables of the next
+    section once the previous ones have been
+    laid out, so only one section is kept in
+    memory at a time.
+    """
+
+    def __init__(self, sections):
+        super().__init__()
+        self.sections = iter(sections)
+
+    def __len__(self):
+        while not super().__len__():
+            section = next(self.sections, None)
+            if section is None:
+                return 0
+            self.extend(section)
+        return super().__len__()
+
+
+class PlantReport(Report):
+
+    """
+    report laid out in a single pass, suited
+    for every machine of a plant. The page
+    counts of each section are measured first
+    in drafts without charts or images, which
+    number the table of contents. Machine
+    sections are then created, rendered and
+    laid out a batch at a time.
+    """
+
+    canvasmaker = ReportCanvas
+
+    def __init__(self, *args, section_size=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.section_size = section_size or getattr(
+            settings, 'REPORT_SECTION_SIZE', SECTION_SIZE)
+        self.drafting = False
+        self.entries = []
+
+    def notify(self, kind, stuff):
+        """
+        collect the TOC entries registered by
+        afterFlowable while laying out.
+        """
+
+        if kind == 'TOCEntry':
+            self.entries.append(stuff)
+
+    def section(self, *writers):
+        """
+        return the flowables added to the
+        story by the given segment methods.
+        """
+
+        self.story = []
+        for write, *args in writers:
+            write(*args)
+        story, self.story = self.story, []
+        return story
+
+    def front_matter(self):
+        return self.section(
+            (self.create_first_letter,),
+            (self.create_toc,),
+            (self.create_second_letter,),
+            (self.create_ISO,))
+
+    def create_tendency_graph(self, query_instance, position):
+        if self.drafting:
+            return PLACEHOLDER
+        return super().create_tendency_graph(query_instance, position)
+
+    def release_graphs(self):
+        """
+        drop the graphs of the sections
+        already laid out.
+        """
+
+        self.closer_buffers()
+        self.buffers = []
+        self.graphs = {}
+
+    def draft(self, story, template):
+        """
+        lay out part of the report without saving
+        it. Returns its page count and its TOC
+        entries, numbered from its first page.
+        """
+
+        self.entries = []
+        self._firstPageTemplateIndex = [
+            page.id for page in self.pageTemplates].index(template)
+        self._doSave = 0
+        try:
+            self.build(story, canvasmaker=DraftCanvas)
+        finally:
+            self._firstPageTemplateIndex = 0
+            self._doSave = 1
+        return self.page, self.entries
+
+    def paginate(self):
+        """
+        return the TOC entries of the whole report
+        from the page counts of its sections, so
+        it is laid out only once.
+        """
+
+        self.drafting = True
+        section_entries = []
+        pages = 0
+        for measurement in self.data.measurements:
+            count, entries = self.draft(
+                self.section((self.create_pred, measurement)), 'measurement')
+            section_entries += [
+                (level, text, pages + page) for level, text, page, _
+                in entries]
+            pages += count
+
+        front_pages = None
+        front_entries = []
+        for _ in range(FRONT_DRAFTS):
+            self.toc._lastEntries = [
+                (level, text, page, None) for level, text, page
+                in front_entries + section_entries]
+            count, entries = self.draft(self.front_matter(), 'letter')
+            front_entries = [
+                (level, text, page) for level, text, page, _ in entries]
+            if count == front_pages:
+                break
+            front_pages = count
+        self.drafting = False
+
+        return [
+            (level, text, page, str(page)) for level, text, page
+            in front_entries + [
+                (level, text, front_pages + page)
+                for level, text, page in section_entries]]
+
+    def sections(self):
+        """
+        yield the front matter and then each machine
+        section, rendering the charts of a batch of
+        measurements right before laying it out.
+        """
+
+        yield self.front_matter()
+        measurements = self.data.measurements
+        for start in range(0, len(measurements), self.section_size):
+            batch = measurements[start:start + self.section_size]
+            self.release_graphs()
+            self.render_tendency_graphs(batch)
+            for measurement in batch:
+                yield self.section((self.create_pred, measurement))
+
+    def build_doc(self):
+        """
+        number the report from its drafts and
+        build it in a single layout pass.
+        """
+
+        self.toc._lastEntries = self.paginate()
+        self.build(
+            SectionStory(self.sections()), canvasmaker=self.canvasmaker)
+        self.release_graphs()
@@ -1,5 +1,6 @@
 from reportlab.platypus import Paragraph, NextPageTemplate, Spacer, PageBreak
 from .flowables import STANDARD_CENTER
+from .static import ReportCanvas
 from .segment import Segment
 from backend.models import VibroUser, Measurement
 
@@ -22,11 +23,12 @@ class Report(Segment):
 
     def write_preds(self):
         """
-        calls create_pred for all
-        measurements in query instance.
+        render the graphs of every measurement
+        at once and call create_pred for each.
         """
 
-        for query_instance in self.queryset:
+        self.render_tendency_graphs(self.data.measurements)
+        for query_instance in self.data.measurements:
             self.create_pred(query_instance)
 
     def write_pdf(self):
@@ -49,7 +51,7 @@ class Report(Segment):
         """
 
         self.write_pdf()
-        self.multiBuild(self.story)
+        self.multiBuild(self.story, canvasmaker=ReportCanvas)
         self.closer_buffers()
 
     def afterFlowable(self, flowable):
@@ -3,6 +3,20 @@ from reportlab.platypus import Paragraph, NextPageTemplate, Spacer, PageBreak, I
 from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib.units import cm
 from .graph import Graphs
+from io import BytesIO
+
+
+def stored_image(field):
+    """
+    return the content of an image field read
+    through its storage, which may be remote
+    and have no local path, or None if empty.
+    """
+
+    if not field:
+        return None
+    with field.open('rb') as file:
+        return BytesIO(file.read())
 
 
 class Segment(Graphs):
@@ -17,8 +31,16 @@ class Segment(Graphs):
         super().__init__(*args, **kwargs)
         self.toc = TableOfContents()
         self.story = []
-        self.spacer_one = Spacer(self.width, 1 * cm)
-        self.spacer_two = Spacer(self.width, 0.5 * cm)
+
+    # platypus keeps layout state on each flowable
+    # so spacers can't be shared across the story
+    @property
+    def spacer_one(self):
+        return Spacer(self.width, 1 * cm)
+
+    @property
+    def spacer_two(self):
+        return Spacer(self.width, 0.5 * cm)
 
     def create_first_letter(self):
         """
@@ -152,7 +174,7 @@ class Segment(Graphs):
 
         summary_title = self.create_summary_title()
         self.story.append(summary_title)
-        for query_instance in self.queryset:
+        for query_instance in self.data.measurements:
             table = self.create_summary_table(query_instance)
             self.story += [table, self.spacer_two]
         title_two = self.create_second_summary_title()
@@ -203,13 +225,14 @@ class Segment(Graphs):
         # TODO check title
         title = self.create_measurement_title_entry(
             query_instance.machine.name.upper())
+        machine = query_instance.machine
         diagram = self.pictures_table(
-            query_instance.machine.images.diagram,
-            query_instance.machine.images.image)
+            stored_image(machine.diagram),
+            stored_image(machine.image))
         graphs = self.add_graphs(query_instance)
         analysis = self.create_analysis_table(
             query_instance.analysis,
-            query_instance.recomendation)
+            query_instance.diagnostic)
 
         self.story += [
             especifications,
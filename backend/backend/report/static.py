@@ -0,0 +1,71 @@
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfbase import pdfdoc
+from functools import lru_cache
+from .flowables import B_DIR
+import copy
+import os
+
+# every image in this directory is the same for all reports
+IMAGES_DIR = os.path.join(B_DIR, 'static', 'images')
+
+
+@lru_cache(maxsize=None)
+def static_image(path, mask):
+    """
+    decode and encode a static image into its PDF
+    objects once per process. Returns the image
+    object and its soft mask object, if any.
+    """
+
+    image = pdfdoc.PDFImageXObject(
+        _digester(f'{path}{mask}'.encode('utf-8')),
+        ImageReader(path),
+        mask=mask)
+    smask = image.__dict__.pop('_smask', None)
+    return image, smask
+
+
+class ReportCanvas(Canvas):
+
+    """
+    canvas that embeds the static images of the
+    report, the logos and diagrams repeated in
+    every document, with the PDF objects encoded
+    once per process instead of once per build.
+    """
+
+    def drawImage(self, image, x, y, width=None, height=None, mask=None,
+                  **kwargs):
+        path = image if isinstance(image, str) \
+            else getattr(image, 'fileName', None)
+        if kwargs or not isinstance(path, str) or \
+                os.path.dirname(path) != IMAGES_DIR:
+            return super().drawImage(
+                image, x, y, width, height, mask=mask, **kwargs)
+
+        image, smask = static_image(path, mask)
+        name = self._doc.getXObjectName(image.name)
+        if name in self._doc.idToObject:
+            image = self._doc.idToObject[name]
+        else:
+            # documents register objects in place, so each one
+            # gets a shallow copy sharing the encoded stream
+            image = copy.copy(image)
+            self._doc.addForm(image.name, image)
+            if smask:
+                mask_name = self._doc.getXObjectName(smask.name)
+                if mask_name not in self._doc.idToObject:
+                    self._doc.Reference(copy.copy(smask), mask_name)
+                image.smask = pdfdoc.PDFObjectReference(mask_name)
+
+        self._currentPageHasImages = 1
+        width = image.width if width is None else width
+        height = image.height if height is None else height
+        self.saveState()
+        self.translate(x, y)
+        self.scale(width, height)
+        self._code.append(f'/{name} Do')
+        self.restoreState()
+        self._formsinuse.append(image.name)
+        return (image.width, image.height)
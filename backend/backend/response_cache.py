@@ -0,0 +1,283 @@
+"""
+Cache of the api responses of client users. Clients
+only read and only see the data of their company,
+so a response is shared by every client of the
+company and keyed by the endpoint and its query
+params. Each company has a generation token that
+is replaced when its data changes, which retires
+every cached response of the company at once.
+The tokens also give every read of clients and
+staff an ETag, so conditional requests of
+unchanged data are answered with 304 before
+any serialization. Reads of rows with an
+updated_at date also get a Last-Modified date.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.utils.cache import get_conditional_response
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.http import http_date
+from django.core.cache import cache
+from django.db.models import Max
+from django.db import transaction
+from rest_framework.response import Response
+from django.conf import settings
+from . import models as custom_models
+from .user_groups import CLIENT, STAFF
+from functools import wraps
+import hashlib
+import uuid
+
+# path from each model to the company of its rows
+COMPANY_PATHS = {
+    custom_models.Company: 'id',
+    custom_models.VibroUser: 'company',
+    custom_models.Machine: 'company',
+    custom_models.Sensor: 'machine__company',
+    custom_models.Gear: 'machine__company',
+    custom_models.Point: 'machine__company',
+    custom_models.Measurement: 'machine__company',
+    custom_models.Axis: 'gear__machine__company',
+    custom_models.Bearing: 'axis__gear__machine__company',
+    custom_models.Values: 'measurement__machine__company',
+    custom_models.Flaw: 'measurement__machine__company',
+    custom_models.TermoImage: 'measurement__machine__company',
+}
+# catalogs every company sees
+SHARED_MODELS = (custom_models.City, custom_models.BearingGeometry)
+SHARED = 'shared'
+# changes of any company, seen by the staff
+ALL = 'all'
+
+
+def generation(tenant):
+    """
+    return the current token of a company,
+    or of the shared catalogs.
+    """
+
+    key = f'api:generation:{tenant}'
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        token = cache.get(key)
+    return token
+
+
+def invalidate(tenants):
+    """
+    retire the cached responses of the given
+    companies once the transaction commits, so
+    no response is cached from data about to
+    change under a new token.
+    """
+
+    tenants = {tenant for tenant in tenants if tenant is not None}
+    if not settings.API_CACHE or not tenants:
+        return
+    if tenants != {SHARED}:
+        tenants.add(ALL)
+
+    def replace_tokens():
+        for tenant in tenants:
+            cache.set(f'api:generation:{tenant}', uuid.uuid4().hex, None)
+    transaction.on_commit(replace_tokens)
+
+
+def invalidate_queryset(queryset):
+    """
+    retire the responses of the companies of a
+    queryset, for bulk changes that send no
+    signals.
+    """
+
+    if not settings.API_CACHE:
+        return
+    path = COMPANY_PATHS[queryset.model]
+    invalidate(set(queryset.values_list(path, flat=True)))
+
+
+def instance_companies(instance):
+    """
+    return the ids of the companies that see an
+    instance. Only the rows above it are queried,
+    so it still works after it was deleted.
+    """
+
+    first, _, rest = COMPANY_PATHS[type(instance)].partition('__')
+    if first == 'id':
+        return {instance.id}
+    field = instance._meta.get_field(first)
+    value = getattr(instance, field.attname)
+    if value is None or not rest:
+        return {value}
+    return set(field.related_model.objects.filter(
+        pk=value).values_list(rest, flat=True))
+
+
+def model_changed(sender, instance, **kwargs):
+    if not settings.API_CACHE:
+        return
+    if sender in SHARED_MODELS:
+        invalidate({SHARED})
+    else:
+        invalidate(instance_companies(instance))
+
+
+def connect_signals():
+    for model in (*COMPANY_PATHS, *SHARED_MODELS):
+        post_save.connect(
+            model_changed, sender=model,
+            dispatch_uid=f'api-cache-save-{model.__name__}')
+        post_delete.connect(
+            model_changed, sender=model,
+            dispatch_uid=f'api-cache-delete-{model.__name__}')
+
+
+def request_tenants(request):
+    """
+    return the tenants whose data a read
+    depends on, or None when it is not
+    validated with their tokens.
+    """
+
+    user_type = getattr(request.user, 'user_type', None)
+    if request.method != 'GET':
+        return None
+    if user_type in STAFF:
+        return (ALL, SHARED)
+    if user_type in CLIENT and request.user.company_id is not None:
+        return (request.user.company_id, SHARED)
+    return None
+
+
+def request_digest(request):
+    params = '&'.join(sorted(
+        f'{name}={value}' for name, values in request.query_params.lists()
+        for value in values))
+    return hashlib.sha1(
+        f'{request.get_host()}{request.path}?{params}'.encode()).hexdigest()
+
+
+def response_key(request):
+    """
+    return the cache key of a request, or None
+    when its response is not shared or the
+    cache is not shared by every process.
+    """
+
+    tenants = request_tenants(request)
+    if not settings.API_CACHE or tenants is None or ALL in tenants:
+        return None
+    tokens = ':'.join(generation(tenant) for tenant in tenants)
+    return f'api:response:{tenants[0]}:{tokens}:{request_digest(request)}'
+
+
+def response_etag(request):
+    """
+    return the ETag of a read, or None when it
+    has no tokens or they are not shared by
+    every process. A date would not tell apart
+    changes made in the same second, so reads
+    are only validated with the ETag.
+    """
+
+    tenants = request_tenants(request)
+    if not settings.API_CACHE or tenants is None:
+        return None
+    tokens = [generation(tenant) for tenant in tenants]
+    etag = hashlib.sha1(':'.join((
+        request.user.user_type, *map(str, tenants), *tokens,
+        request_digest(request))).encode()).hexdigest()
+    return f'"{etag}"'
+
+
+def cached_response(request, handler, *args, **kwargs):
+    """
+    return 304 when the conditional headers match
+    the data, else the cached response of a request
+    or the response of the handler, cached.
+    """
+
+    etag = response_etag(request)
+    if etag is not None:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response['ETag'] = etag
+            return response
+
+    key = response_key(request)
+    cached = None if key is None else cache.get(key)
+    if cached is not None:
+        data, last_modified = cached
+        response = Response(data)
+        if last_modified is not None:
+            response['Last-Modified'] = last_modified
+        response['X-Cache'] = 'HIT'
+    else:
+        response = handler(request, *args, **kwargs)
+        if key is not None and response.status_code == 200:
+            cache.set(
+                key, (response.data, response.get('Last-Modified')),
+                settings.API_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+    if etag is not None and response.status_code == 200:
+        response['ETag'] = etag
+    return response
+
+
+def cache_action(handler):
+    """
+    cache the responses of a viewset action
+    and answer its conditional requests.
+    """
+
+    @wraps(handler)
+    def action(self, request, *args, **kwargs):
+        return cached_response(
+            request, lambda *args, **kwargs: handler(self, *args, **kwargs),
+            *args, **kwargs)
+    return action
+
+
+class CachedReadMixin:
+
+    """
+    cache the list and retrieve responses of
+    a viewset for client users and answer
+    conditional reads of every user.
+    """
+
+    @cache_action
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        return self.last_modified(
+            response, self.filter_queryset(self.get_queryset()))
+
+    @cache_action
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        return self.last_modified(
+            response, self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup]}))
+
+    @staticmethod
+    def last_modified(response, queryset):
+        """
+        date the response with the last update of
+        its rows. Deleted rows don't move the date
+        and it drops fractions of a second, so
+        requests are only validated with the ETag.
+        """
+
+        try:
+            queryset.model._meta.get_field('updated_at')
+        except FieldDoesNotExist:
+            return response
+        if response.status_code == 200:
+            updated = queryset.aggregate(
+                updated=Max('updated_at'))['updated']
+            if updated is not None:
+                response['Last-Modified'] = http_date(updated.timestamp())
+        return response
@@ -5,9 +5,66 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, Pass
 from django.contrib.auth import password_validation
 from rest_framework.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
+import numpy as np
 
+# levels of the asset tree: machines, gears, axes and bearings
+TREE_DEPTH = 4
 
-class CitySerializer(serializers.ModelSerializer):
+
+class WaveformField(serializers.ListField):
+
+    """
+    list of float samples stored in a
+    CompactArrayField as a NumPy array.
+    """
+
+    child = serializers.FloatField()
+    default_error_messages = {
+        'invalid_samples': _('Se esperaba una lista de numeros finitos.')
+    }
+
+    def to_representation(self, data):
+        return np.asarray(data, dtype=float).tolist()
+
+    def to_internal_value(self, data):
+        if isinstance(data, (str, dict)) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        try:
+            array = np.asarray(list(data), dtype=np.float32)
+        except (TypeError, ValueError):
+            self.fail('invalid_samples')
+        if array.ndim != 1 or not np.isfinite(array).all():
+            self.fail('invalid_samples')
+        return array
+
+
+class SparseFieldsMixin:
+
+    """
+    keep only the given fields and replace the
+    given relations by their nested objects. The
+    relations that can be expanded map to the
+    serializer of their objects.
+    """
+
+    expandable = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.expand = expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.expand:
+            fields[name] = self.expandable[name](read_only=True)
+        if self.sparse_fields:
+            for name in set(fields) - set(self.sparse_fields):
+                fields.pop(name)
+        return fields
+
+
+class CitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = custom_models.City
@@ -21,8 +78,9 @@ class DefaultCompanySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class GetCompanySerializer(serializers.ModelSerializer):
+class GetCompanySerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
+    expandable = {'city': CitySerializer}
     city = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -52,6 +110,13 @@ class VibroUserSerializer(serializers.ModelSerializer):
         ]
 
 
+class UserNameSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = custom_models.VibroUser
+        fields = ['id', 'first_name', 'last_name']
+
+
 # Register Serializer
 class RegisterVibroUserSerializer(serializers.ModelSerializer):
 
@@ -204,51 +269,59 @@ class LoginSerializer(TokenObtainPairSerializer):
         return data
 
 
-class MachineSerializer(serializers.ModelSerializer):
+class MachineSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # company = DefaultCompanySerializer()
+    expandable = {'company': DefaultCompanySerializer}
 
     class Meta:
         model = custom_models.Machine
         fields = '__all__'
 
 
-class SensorSerializer(serializers.ModelSerializer):
+class SensorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # machine = MachineSerializer()
+    expandable = {'machine': MachineSerializer}
 
     class Meta:
         model = custom_models.Sensor
         fields = "__all__"
 
 
-class GearSerializer(serializers.ModelSerializer):
+class GearSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # machine = MachineSerializer()
+    expandable = {'machine': MachineSerializer}
 
     class Meta:
         model = custom_models.Gear
         fields = "__all__"
 
 
-class AxisSerializer(serializers.ModelSerializer):
+class AxisSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # gear = GearSerializer()
+    expandable = {'gear': GearSerializer}
 
     class Meta:
         model = custom_models.Axis
         fields = '__all__'
 
 
-class BearingSerializer(serializers.ModelSerializer):
+class BearingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # axis = AxisSerializer()
+    expandable = {'axis': AxisSerializer}
 
     class Meta:
         model = custom_models.Bearing
         fields = '__all__'
 
 
+class BearingGeometrySerializer(
+        SparseFieldsMixin, serializers.ModelSerializer):
+
+    class Meta:
+        model = custom_models.BearingGeometry
+        fields = '__all__'
+
+
 class CouplingSerializer(serializers.ModelSerializer):
 
     # gear = GearSerializer()
@@ -258,53 +331,126 @@ class CouplingSerializer(serializers.ModelSerializer):
         feilds = '__all__'
 
 
-class MeasurementSerializer(serializers.ModelSerializer):
+class MeasurementSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # machine = MachineSerializer()
-    # engineer_one = VibroUserSerializer()
-    # engineer_two = VibroUserSerializer()
-    # analyst = VibroUserSerializer()
-    # certifier = VibroUserSerializer()
+    expandable = {
+        'machine': MachineSerializer,
+        'engineer_one': UserNameSerializer,
+        'engineer_two': UserNameSerializer,
+        'analyst': UserNameSerializer,
+        'certifier': UserNameSerializer,
+    }
 
     class Meta:
         model = custom_models.Measurement
         fields = '__all__'
 
 
-class FlawSerializer(serializers.ModelSerializer):
+class FlawSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # measurement = MeasurementSerializer()
+    expandable = {'measurement': MeasurementSerializer}
 
     class Meta:
         model = custom_models.Flaw
         fields = '__all__'
 
 
-class TermoImageSerializer(serializers.ModelSerializer):
+class TermoImageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # measurement = MeasurementSerializer()
+    expandable = {'measurement': MeasurementSerializer}
 
     class Meta:
         model = custom_models.TermoImage
         fields = '__all__'
 
 
-class PointSerializer(serializers.ModelSerializer):
+class PointSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
-    # measurement = MeasurementSerializer()
-    espectra = serializers.ListField(
-        child=serializers.DecimalField(
-            decimal_places=2,
-            max_digits=4,
-            default=0),
-        required=False)
-    time_signal = serializers.ListField(
-        child=serializers.DecimalField(
-            decimal_places=2,
-            max_digits=4,
-            default=0),
-        required=False)
+    expandable = {'machine': MachineSerializer}
 
     class Meta:
         model = custom_models.Point
         fields = '__all__'
+
+
+class ValuesSerializer(serializers.ModelSerializer):
+
+    espectra = WaveformField(required=False)
+    time_signal = WaveformField(required=False)
+
+    class Meta:
+        model = custom_models.Values
+        fields = '__all__'
+
+
+class ValuesSummarySerializer(
+        SparseFieldsMixin, serializers.ModelSerializer):
+
+    expandable = {
+        'point': PointSerializer,
+        'measurement': MeasurementSerializer,
+    }
+
+    class Meta:
+        model = custom_models.Values
+        exclude = ['espectra', 'time_signal']
+
+
+class ValuesWaveformSerializer(serializers.ModelSerializer):
+
+    espectra = WaveformField(read_only=True)
+    time_signal = WaveformField(read_only=True)
+
+    class Meta:
+        model = custom_models.Values
+        fields = ['id', 'espectra', 'time_signal']
+
+
+class AssetTreeMixin:
+
+    """
+    drop the nested fields of a node of the asset
+    tree when they are deeper than the depth
+    requested in the context.
+    """
+
+    # depth of the nested fields of the node
+    tree_level = 1
+    tree_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('depth', TREE_DEPTH) < self.tree_level:
+            for name in self.tree_fields:
+                fields.pop(name)
+        return fields
+
+
+class AxisTreeSerializer(AssetTreeMixin, AxisSerializer):
+
+    tree_level = 4
+    tree_fields = ('bearings',)
+    bearings = BearingSerializer(many=True, read_only=True)
+
+
+class GearTreeSerializer(AssetTreeMixin, GearSerializer):
+
+    tree_level = 3
+    tree_fields = ('axis',)
+    axis = AxisTreeSerializer(many=True, read_only=True)
+
+
+class MachineTreeSerializer(AssetTreeMixin, MachineSerializer):
+
+    tree_level = 2
+    tree_fields = ('gears', 'points', 'sensors')
+    gears = GearTreeSerializer(many=True, read_only=True)
+    points = PointSerializer(many=True, read_only=True)
+    sensors = SensorSerializer(source='sensor', many=True, read_only=True)
+
+
+class CompanyTreeSerializer(AssetTreeMixin, GetCompanySerializer):
+
+    tree_level = 1
+    tree_fields = ('machines',)
+    machines = MachineTreeSerializer(many=True, read_only=True)
@@ -0,0 +1,126 @@
+"""
+ISO 10816-1 severity classification of measurements
+based on the velocity readings of their points.
+"""
+
+from .response_cache import invalidate_queryset
+from . import models as custom_models
+from collections import namedtuple
+from django.utils import timezone
+import numpy as np
+
+# zone boundaries A/B, B/C and C/D in mm/s RMS for classes I to IV
+ISO_10816_LIMITS = np.array([
+    [0.71, 1.8, 4.5],
+    [1.12, 2.8, 7.1],
+    [1.8, 4.5, 11.2],
+    [2.8, 7.1, 18.0],
+])
+ZONES = ('A', 'B', 'C', 'D')
+ZONE_SEVERITY = (
+    custom_models.Measurement.GREEN,
+    custom_models.Measurement.GREEN,
+    custom_models.Measurement.YELLOW,
+    custom_models.Measurement.RED,
+)
+# velocity readings are stored in mm/s peak
+PEAK_TO_RMS = 0.707
+HP_TO_KW = 0.7457
+
+Classification = namedtuple(
+    'Classification', ['machine_class', 'velocity', 'zone', 'severity'])
+
+
+def machine_classes(power_kw, flexible):
+    """
+    return the ISO 10816-1 class index (0 for class I)
+    of machines given their power in kW and whether
+    they are mounted on flexible supports.
+    """
+
+    power_kw = np.asarray(power_kw, dtype=np.float64)
+    flexible = np.asarray(flexible, dtype=bool)
+    large = np.where(flexible, 3, 2)
+    medium = np.where(flexible, 2, 1)
+    return np.select(
+        [power_kw <= 15, power_kw <= 75, power_kw <= 300],
+        [0, 1, medium],
+        large)
+
+
+def classify_velocities(velocities, classes):
+    """
+    return the zone index of RMS velocities
+    in mm/s for machines of the given classes.
+    """
+
+    velocities = np.asarray(velocities, dtype=np.float64)
+    limits = ISO_10816_LIMITS[np.asarray(classes)]
+    return (velocities[:, None] >= limits).sum(axis=1)
+
+
+def classify_measurements(measurement_ids):
+    """
+    classify a batch of measurements with three queries
+    and one pass over all their velocity readings.
+    Measurements without velocity readings are left
+    out of the returned dict keyed by measurement id.
+    """
+
+    measurements = list(custom_models.Measurement.objects.filter(
+        id__in=measurement_ids).values_list(
+            'id', 'machine_id', 'machine__power', 'machine__power_units'))
+    if not measurements:
+        return {}
+    ids, machines, power, units = zip(*measurements)
+    flexible_machines = set(custom_models.Gear.objects.filter(
+        machine__id__in=set(machines),
+        support=custom_models.Gear.FLEXIBLE).values_list(
+            'machine_id', flat=True))
+    readings = custom_models.Values.objects.filter(
+        measurement__id__in=ids,
+        point__point_type=custom_models.Point.VEL).values_list(
+            'measurement_id', 'tendency')
+
+    index = {id: position for position, id in enumerate(ids)}
+    rows = np.fromiter(
+        (index[measurement] for measurement, _ in readings),
+        dtype=np.int64)
+    velocities = np.fromiter(
+        (tendency for _, tendency in readings),
+        dtype=np.float64) * PEAK_TO_RMS
+    maxima = np.full(len(ids), -np.inf)
+    np.maximum.at(maxima, rows, velocities)
+
+    power_kw = np.array(power, dtype=np.float64)
+    power_kw[np.array(units) == custom_models.Machine.HP] *= HP_TO_KW
+    classes = machine_classes(
+        power_kw, [machine in flexible_machines for machine in machines])
+    zones = classify_velocities(maxima, classes)
+    return {
+        id: Classification(
+            int(classes[position]) + 1,
+            float(maxima[position]),
+            ZONES[zones[position]],
+            ZONE_SEVERITY[zones[position]])
+        for id, position in index.items() if np.isfinite(maxima[position])}
+
+
+def update_severities(measurement_ids):
+    """
+    classify measurements and store their severity
+    with one update per severity level.
+    """
+
+    results = classify_measurements(measurement_ids)
+    by_severity = {}
+    for id, result in results.items():
+        by_severity.setdefault(result.severity, []).append(id)
+    for severity, ids in by_severity.items():
+        custom_models.Measurement.objects.filter(
+            id__in=ids).update(severity=severity, updated_at=timezone.now())
+    if results:
+        # updates send no signals
+        invalidate_queryset(
+            custom_models.Measurement.objects.filter(id__in=list(results)))
+    return results
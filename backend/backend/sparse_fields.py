@@ -0,0 +1,104 @@
+"""
+Sparse fieldsets of the api reads. The fields
+param lists the fields of the response and the
+expand param the relations returned as nested
+objects instead of ids, e.g.
+?fields=id,date,severity&expand=machine,analyst
+Only the columns of the requested fields are
+selected and the expanded relations are joined
+in the same query.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from .serializers import SparseFieldsMixin
+
+
+def split_param(request, name):
+    value = request.query_params.get(name, '')
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SparseFieldsViewMixin:
+
+    """
+    pass the fields and expand params of the
+    list and retrieve actions to the serializer
+    and restrict the queryset to them.
+    """
+
+    sparse_actions = {'list', 'retrieve'}
+
+    def sparse_params(self):
+        """
+        return the requested fields, None for all,
+        and the relations to expand, validated
+        against the serializer of the action.
+        """
+
+        if not hasattr(self, '_sparse_params'):
+            self._sparse_params = None, ()
+            serializer_class = self.get_serializer_class()
+            if self.action in self.sparse_actions and \
+                    issubclass(serializer_class, SparseFieldsMixin):
+                self._sparse_params = self.parse_sparse_params(
+                    serializer_class)
+        return self._sparse_params
+
+    def parse_sparse_params(self, serializer_class):
+        fields = split_param(self.request, 'fields')
+        expand = split_param(self.request, 'expand')
+        invalid = set(expand) - set(serializer_class.expandable)
+        if invalid:
+            raise ValidationError(
+                f'Expansiones invalidas: {", ".join(sorted(invalid))}')
+        if not fields:
+            return None, tuple(expand)
+        invalid = set(fields) - set(serializer_class().fields)
+        if invalid:
+            raise ValidationError(
+                f'Campos invalidos: {", ".join(sorted(invalid))}')
+        # expanded relations are always returned
+        fields += [name for name in expand if name not in fields]
+        return tuple(fields), tuple(expand)
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.sparse_params()
+        if fields:
+            kwargs['fields'] = fields
+        if expand:
+            kwargs['expand'] = expand
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, expand = self.sparse_params()
+        if expand:
+            queryset = queryset.select_related(*expand)
+        if fields:
+            queryset = queryset.only(*self.sparse_columns(queryset, fields))
+        return queryset
+
+    def sparse_columns(self, queryset, fields):
+        """
+        return the columns of the requested fields
+        and of the ordering, which the pagination
+        reads from the rows.
+        """
+
+        serializer_fields = self.get_serializer_class()().fields
+        ordering = [
+            field.lstrip('-') for field in
+            (*queryset.query.order_by, *getattr(self, 'ordering', ()))
+            if isinstance(field, str)]
+        columns = {queryset.model._meta.pk.name}
+        for name in (
+                *(serializer_fields[field].source for field in fields),
+                *ordering):
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                columns.add(name)
+        return columns
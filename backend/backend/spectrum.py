@@ -0,0 +1,122 @@
+"""
+Spectrum computation from raw time signals.
+
+Signals are acceleration samples in g. Spectra follow
+the units used in the reports: velocity points are
+integrated to mm/s peak, displacement points to
+micrometers peak to peak and every other point type
+is returned as acceleration in g RMS.
+"""
+
+from .response_cache import invalidate_queryset
+from . import models as custom_models
+from django.utils import timezone
+import numpy as np
+
+# mm/s² in one g
+GRAVITY = 9806.65
+# samples per spectral line, fmax = sample rate / 2.56
+SAMPLES_PER_LINE = 2.56
+DEFAULT_LINES = 800
+# lines below this frequency are not integrated
+INTEGRATION_CUTOFF = 2.0
+WINDOWS = {
+    'hann': np.hanning,
+    'hamming': np.hamming,
+    'rectangular': np.ones,
+}
+
+
+def spectrum_frequencies(sample_rate, lines=DEFAULT_LINES):
+    """
+    return the frequency in Hz of every line.
+    """
+
+    samples = int(round(SAMPLES_PER_LINE * lines))
+    return np.arange(lines) * (sample_rate / samples)
+
+
+def compute_spectra(signals, sample_rate, point_types,
+                    lines=DEFAULT_LINES, window='hann'):
+    """
+    compute the spectra of a batch of time signals
+    sampled at the same rate with a single rFFT.
+
+    Signals are truncated or zero padded to the
+    2.56 * lines samples the resolution requires.
+    Returns a float32 array of shape (signals, lines).
+    """
+
+    if window not in WINDOWS:
+        raise ValueError(f'unsupported window {window}')
+    samples = int(round(SAMPLES_PER_LINE * lines))
+    batch = np.zeros((len(signals), samples))
+    for row, signal in enumerate(signals):
+        signal = np.asarray(signal, dtype=np.float64)[:samples]
+        if signal.size:
+            batch[row, :signal.size] = signal - signal.mean()
+
+    taper = WINDOWS[window](samples)
+    # single sided peak amplitude corrected by the window gain
+    amplitude = np.abs(np.fft.rfft(batch * taper, axis=1))[:, :lines]
+    amplitude *= 2 / taper.sum()
+
+    frequencies = spectrum_frequencies(sample_rate, lines)
+    omega = 2 * np.pi * frequencies
+    integrable = frequencies >= INTEGRATION_CUTOFF
+    velocity = np.zeros(lines)
+    velocity[integrable] = GRAVITY / omega[integrable]
+    displacement = np.zeros(lines)
+    # mm to micrometers and peak to peak
+    displacement[integrable] = \
+        2000 * GRAVITY / omega[integrable] ** 2
+
+    point_types = np.asarray(point_types)
+    factors = np.tile(1 / np.sqrt(2), (len(signals), lines))
+    factors[point_types == custom_models.Point.VEL] = velocity
+    factors[point_types == custom_models.Point.DES] = displacement
+    return (amplitude * factors).astype(np.float32)
+
+
+def measurement_spectra(measurement_ids, lines=DEFAULT_LINES,
+                        window='hann', sample_rate=None):
+    """
+    recompute the spectrum of every value of the
+    given measurements that has a time signal.
+    Values are batched by their sample rate. The
+    given sample rate is only used for values
+    stored without one, which are skipped when
+    none is given. Returns the number of updated
+    values.
+    """
+
+    queryset = custom_models.Values.objects.filter(
+        measurement__id__in=measurement_ids).select_related(
+            'point').only('id', 'time_signal', 'sample_rate', 'point__point_type')
+    batches = {}
+    for value in queryset:
+        rate = value.sample_rate or sample_rate
+        if rate and value.time_signal.size:
+            batches.setdefault(rate, []).append(value)
+
+    updated = []
+    now = timezone.now()
+    for rate, values in batches.items():
+        spectra = compute_spectra(
+            [value.time_signal for value in values],
+            rate,
+            [value.point.point_type for value in values],
+            lines=lines,
+            window=window)
+        for value, spectrum in zip(values, spectra):
+            value.espectra = spectrum
+            value.sample_rate = rate
+            value.updated_at = now
+        updated += values
+    custom_models.Values.objects.bulk_update(
+        updated, ['espectra', 'sample_rate', 'updated_at'], batch_size=500)
+    if updated:
+        # bulk updates send no signals
+        invalidate_queryset(custom_models.Measurement.objects.filter(
+            id__in=measurement_ids))
+    return len(updated)
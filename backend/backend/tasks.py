@@ -1,127 +1,232 @@
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.template.loader import render_to_string
-from django.core.mail import EmailMessage
-from .report.report import Report
+from django.core.mail import EmailMessage, get_connection
+from .report.artifacts import build_report, download_token
+from .spectrum import measurement_spectra, DEFAULT_LINES
+from .severity import update_severities
+from .models import VibroUser
+from django.db import DatabaseError
 from django.conf import settings
+from django.urls import reverse
+from celery.exceptions import Ignore
 from celery import shared_task
-from vibro.celery import app
-from celery import Task
-from io import BytesIO
-import datetime
-
-
-# @shared_task  # TODO delete after background tasks are tested
-# def send_email(data, user, queryset=None):
-#     """
-#     function to be used in a view to send emails.
-#     """
-
-#     template = render_to_string(data['template'], data['variables'])
-#     sender = settings.EMAIL_HOST_USER
-#     email = EmailMessage(
-#         data['subject'],
-#         template,
-#         sender,
-#         [user.email])
-#     email.content_subtype = "html"
-#     email.fail_silently = True
-#     if queryset:
-#         with BytesIO() as buffer:
-#             try:
-#                 pdf = Report(buffer, queryset, user)
-#                 pdf.build_doc()
-#                 buffer.seek(0)
-#             except Exception:
-#                 pass
-#             else:
-#                 company_name = queryset.first().company.name.upper()
-#                 date = datetime.date.today().__str__()
-#                 filename = f'INFORME_PREDICTIVO_{company_name}_{date}.pdf'
-#                 email.attach(
-#                     filename=filename,
-#                     content=buffer.getvalue(),
-#                     mimetype='application/pdf')
-#             email.send()
-#     else:
-#         email.send()
-
-
-class Email(Task, EmailMessage):
-
-    ignore_result = True
-    name = "email"
-
-    def __init__(self):
-        EmailMessage.__init__(self)
-        self.content_subtype = "html"
-        self.from_email = settings.EMAIL_HOST_USER
-        self.fail_silently = True
-
-    def set_user(self, request):
-
-        self.user = request.user
-        self.variables = {'name': request.user.first_name}
-        self.to = [request.user.email]
-
-    def register(self, request):
-
-        self.set_user(request)
-        self.subject = 'Bienvenido! - Vibromontajes'
-        self.template = 'email/welcome.html'
-        return self
-
-    def reset(self, request):
-
-        self.set_user(request)
-        self.subject = 'Cambio de Contraseña - Vibromontajes'
-        self.template = 'email/password_reset.html'
-        self.variables['host'] = self.request.get_host()
-        self.variables['token'] = str(RefreshToken.for_user(self.user))
-        return self
-
-    def change_password(self, request):
-
-        self.set_user(request)
-        self.subject = 'Cambio de Contraseña - Vibromontajes'
-        self.template = 'email/successful_change.html'
-        return self
-
-    def attach_report(self):
-
-        with BytesIO() as buffer:
-            try:
-                pdf = Report(buffer, self.queryset, self.user)
-                pdf.build_doc()
-                buffer.seek(0)
-            except Exception:
-                pass
-            else:
-                company_name = self.queryset.first().company.name.upper()
-                date = datetime.date.today().__str__()
-                filename = f'INFORME_PREDICTIVO_{company_name}_{date}.pdf'
-                self.attach(
-                    filename=filename,
-                    content=buffer.getvalue(),
-                    mimetype='application/pdf')
-            finally:
-                self.send()
-
-    def report(self, request, queryset):
-
-        self.set_user(request)
-        self.queryset = queryset
-        self.subject = 'Solicitud Informe Predictivo - Vibromontajes'
-        self.template = 'email/report.html'
-        return self
-
-    def run(self):
-
-        self.body = render_to_string(self.template, self.variables)
-
-        if self.queryset:
-            self.attach_report()
-        else:
-            self.send()
-
-
-app.tasks.register(Email())
+import logging
+import smtplib
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# template key -> (subject, template)
+EMAILS = {
+    'register': (
+        'Bienvenido! - Vibromontajes',
+        'email/welcome.html'),
+    'reset': (
+        'Cambio de Contraseña - Vibromontajes',
+        'email/password_reset.html'),
+    'change_password': (
+        'Cambio de Contraseña - Vibromontajes',
+        'email/successful_change.html'),
+    'report': (
+        'Solicitud Informe Predictivo - Vibromontajes',
+        'email/report.html'),
+}
+
+
+def report_link(user, measurement_ids, host):
+    """
+    return a download link to the stored report
+    of the given measurements, or None if it
+    can't be built.
+    """
+
+    # the report engine is only loaded by the worker
+    from reportlab.platypus.doctemplate import LayoutError
+
+    try:
+        report = build_report(user, measurement_ids)
+    except (DatabaseError, LayoutError, OSError, ValueError):
+        logger.exception(
+            'No se pudo generar el informe de %s', measurement_ids)
+        return None
+    if report is None:
+        return None
+    path = reverse('report-download', args=[report.id])
+    return f'https://{host}{path}?token={download_token(report)}'
+
+
+def build_email(user_id, template, measurement_ids=None, host=None):
+    """
+    build the email of a job, or return
+    None if the user no longer exists.
+    """
+
+    user = VibroUser.objects.filter(id=user_id).first()
+    if user is None:
+        return None
+    subject, template_name = EMAILS[template]
+    variables = {'name': user.first_name}
+    if template == 'reset':
+        variables['host'] = host
+        variables['token'] = str(RefreshToken.for_user(user))
+    if measurement_ids:
+        variables['link'] = report_link(user, measurement_ids, host)
+
+    email = EmailMessage(
+        subject,
+        render_to_string(template_name, variables),
+        settings.EMAIL_HOST_USER,
+        [user.email])
+    email.content_subtype = "html"
+    return email
+
+
+def refused(exc):
+    """
+    return whether the server refused a message
+    permanently, with a 5xx reply, so sending it
+    again would fail the same way.
+    """
+
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and \
+        not isinstance(exc, smtplib.SMTPConnectError) and \
+        exc.smtp_code >= 500
+
+
+def deliver(task, jobs):
+    """
+    send the emails of the jobs one by one reusing
+    one SMTP connection per batch. The messages of
+    a batch, and their reports, are built before
+    the connection is opened so it never sits idle.
+    Messages refused by the server are logged and
+    skipped. On any other failure the task is
+    retried with exponential backoff from the first
+    unsent job, so messages already sent are not
+    repeated.
+    """
+
+    size = settings.EMAIL_BATCH_SIZE
+    sent = 0
+    try:
+        for start in range(0, len(jobs), size):
+            messages = [
+                build_email(**job) for job in jobs[start:start + size]]
+            with get_connection() as connection:
+                for email in messages:
+                    if email is not None:
+                        try:
+                            connection.send_messages([email])
+                        except smtplib.SMTPException as exc:
+                            if not refused(exc):
+                                raise
+                            logger.warning(
+                                'Correo a %s rechazado: %s', email.to, exc)
+                    sent += 1
+    except (smtplib.SMTPException, OSError) as exc:
+        # without progress the task retries with its own arguments
+        raise task.retry(
+            args=(jobs[sent:],) if sent else None,
+            exc=exc,
+            countdown=settings.EMAIL_RETRY_DELAY *
+            2 ** task.request.retries)
+    return len(jobs)
+
+
+@shared_task(
+    name='email',
+    bind=True,
+    ignore_result=True,
+    max_retries=settings.EMAIL_MAX_RETRIES)
+def send_email(self, user_id, template, measurement_ids=None, host=None):
+    """
+    build and send an email to a user. Only
+    ids and keys travel through the broker,
+    every call builds its own message.
+    """
+
+    return deliver(self, [{
+        'user_id': user_id,
+        'template': template,
+        'measurement_ids': measurement_ids,
+        'host': host}])
+
+
+@shared_task(
+    name='emails',
+    bind=True,
+    ignore_result=True,
+    max_retries=settings.EMAIL_MAX_RETRIES)
+def send_emails(self, jobs):
+    """
+    send many emails at once, e.g. the reports
+    of every contact after a campaign. Each job
+    holds the arguments of send_email.
+    """
+
+    return deliver(self, jobs)
+
+
+@shared_task(name='report', bind=True)
+def generate_report(self, user_id, measurement_ids, queued=None):
+    """
+    build and store the report of the given
+    measurements, publishing the current stage
+    and the seconds spent in each one so the
+    job can be polled.
+    """
+
+    meta = {'user': user_id, 'stage': None, 'timings': {}}
+    clock = [time.time()]
+    if queued:
+        meta['timings']['queued'] = round(clock[0] - queued, 3)
+
+    def stage(name):
+        now = time.time()
+        if meta['stage']:
+            meta['timings'][meta['stage']] = round(now - clock[0], 3)
+        meta['stage'] = name
+        clock[0] = now
+        self.update_state(state='PROGRESS', meta=meta)
+
+    try:
+        user = VibroUser.objects.get(id=user_id)
+        report = build_report(user, measurement_ids, stage=stage)
+        if report is None:
+            raise ValueError('mediciones no encontradas')
+    except Exception as exc:
+        meta['error'] = str(exc)
+        self.update_state(state='FAILED', meta=meta)
+        # keep the failed state instead of the exception
+        raise Ignore()
+    meta['timings'][meta['stage']] = round(time.time() - clock[0], 3)
+    meta['stage'] = 'done'
+    meta['report'] = report.id
+    return meta
+
+
+@shared_task(name='spectra', ignore_result=True)
+def reprocess_spectra(measurement_ids, lines=DEFAULT_LINES, window='hann',
+                      sample_rate=None):
+    """
+    recompute the spectra of the given measurements
+    from their stored time signals. The sample rate
+    is used for values stored without one, such as
+    those ingested before it was recorded.
+    """
+
+    return measurement_spectra(
+        measurement_ids, lines=lines, window=window, sample_rate=sample_rate)
+
+
+@shared_task(name='severity', ignore_result=True)
+def classify_severity(measurement_ids):
+    """
+    classify the given measurements by ISO
+    10816-1 zone and store their severity.
+    """
+
+    return len(update_severities(measurement_ids))
@@ -1,6 +1,9 @@
 from .authentication_views import *
+from .benchmarks import *
 from .models import *
 from .permissions import *
+from .processing import *
+from .report import *
 from .serializers import *
 from .tasks import *
 from .views import *
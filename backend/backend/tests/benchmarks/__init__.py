@@ -0,0 +1,3 @@
+from .startup import TestStartup
+from .report import TestReportBenchmark
+from .api import TestApiBenchmark
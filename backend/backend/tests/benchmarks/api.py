@@ -0,0 +1,42 @@
+from backend.benchmarks.api import run, endpoints, USERS
+from backend.models import Measurement
+from django.test import TestCase
+
+DATASET = {'companies': 2, 'machines': 2, 'points': 2, 'history': 2,
+           'waveform': 16}
+
+
+class TestApiBenchmark(TestCase):
+
+    def test_every_endpoint_is_measured(self):
+        """
+        assert the list and retrieve of every
+        router endpoint are measured for staff
+        and client users.
+        """
+
+        results = run(repeat=2, **DATASET)
+        self.assertEqual(
+            set(results['endpoints']),
+            {basename for basename, _ in endpoints()})
+        for measures in results['endpoints'].values():
+            self.assertEqual(set(measures), set(USERS))
+        machine = results['endpoints']['machine']
+        self.assertEqual(machine['staff']['list']['status'], 200)
+        self.assertEqual(machine['staff']['list']['items'], 4)
+        self.assertEqual(machine['client']['list']['items'], 2)
+        self.assertGreater(machine['staff']['list']['bytes'], 0)
+        self.assertGreaterEqual(
+            machine['staff']['list']['p95_ms'],
+            machine['staff']['list']['p50_ms'])
+        self.assertEqual(machine['staff']['retrieve']['status'], 200)
+        self.assertEqual(results['dataset']['Machine'], 4)
+
+    def test_dataset_is_rolled_back(self):
+        """
+        assert the seeded dataset is not
+        kept after the benchmark.
+        """
+
+        run(repeat=1, **DATASET)
+        self.assertFalse(Measurement.objects.exists())
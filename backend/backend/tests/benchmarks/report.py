@@ -0,0 +1,53 @@
+from backend.benchmarks.report import run, STAGES
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from backend.models import Measurement
+from django.test import TestCase
+from io import StringIO
+import json
+
+PLANT = {'machines': 2, 'points': 2, 'history': 2, 'waveform': 16}
+
+
+class TestReportBenchmark(TestCase):
+
+    def test_stages_are_measured(self):
+        """
+        assert every stage of the report is
+        timed and only loading queries the
+        database.
+        """
+
+        results = run(repeat=1, **PLANT)
+        self.assertEqual(set(results['stages']), set(STAGES))
+        self.assertEqual(results['plant']['machines'], 2)
+        self.assertGreater(results['plant']['pages'], 0)
+        self.assertGreater(results['stages']['loading']['queries'], 0)
+        for stage in STAGES[1:]:
+            self.assertEqual(results['stages'][stage]['queries'], 0)
+        self.assertGreater(results['peak_memory_kb']['build'], 0)
+
+    def test_plant_is_rolled_back(self):
+        """
+        assert the synthetic plant is not kept
+        after the benchmark.
+        """
+
+        run(repeat=1, **PLANT)
+        self.assertFalse(Measurement.objects.exists())
+
+    def test_command_options(self):
+        """
+        assert the benchmark command passes its
+        options to the suite and rejects the
+        ones that aren't integers.
+        """
+
+        output = StringIO()
+        call_command(
+            'benchmark', 'report', repeat=1, stdout=output,
+            option=[f'{name}={value}' for name, value in PLANT.items()])
+        results = json.loads(output.getvalue())
+        self.assertEqual(results['plant']['history'], 2)
+        with self.assertRaises(CommandError):
+            call_command('benchmark', 'report', option=['machines=many'])
@@ -0,0 +1,30 @@
+from backend.benchmarks.startup import measure_startup
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from io import StringIO
+import json
+
+
+class TestStartup(SimpleTestCase):
+
+    def test_web_process_skips_report_engine(self):
+        """
+        assert booting the web process does
+        not import reportlab or matplotlib.
+        """
+
+        measures = measure_startup()
+        self.assertEqual(measures['heavy_modules'], [])
+        self.assertGreater(measures['seconds'], 0)
+
+    def test_benchmark_command(self):
+        """
+        assert the benchmark command prints
+        the results of a suite as json.
+        """
+
+        output = StringIO()
+        call_command('benchmark', 'startup', repeat=1, stdout=output)
+        results = json.loads(output.getvalue())
+        self.assertEqual(results['repeat'], 1)
+        self.assertIn('seconds_median', results)
@@ -2,3 +2,4 @@ from .city import TestCity
 from .point import TestPoint
 from .date import TestDate
 from .vibrouser import TestVibroUser
+from .values import TestValues
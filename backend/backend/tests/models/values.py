@@ -0,0 +1,55 @@
+from backend.fields import encode_array, decode_array
+from backend import models as custom_models
+from django.test import TestCase
+from model_bakery import baker
+import numpy as np
+
+
+class TestValues(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.samples = np.linspace(-250, 250, 1024, dtype=np.float32)
+        cls.values = custom_models.Values.objects.create(
+            point=baker.make('backend.Point', direction='H', point_type='V'),
+            measurement=baker.make('backend.Measurement'),
+            tendency=1.1,
+            espectra=cls.samples,
+            time_signal=[1.5, 2.5])
+
+    def test_arrays_are_loaded_as_numpy(self):
+        """
+        assert waveform columns are returned
+        as float32 NumPy arrays.
+        """
+
+        values = custom_models.Values.objects.get(id=self.values.id)
+        self.assertIsInstance(values.espectra, np.ndarray)
+        self.assertEqual(values.espectra.dtype, np.float32)
+        np.testing.assert_array_equal(values.espectra, self.samples)
+        np.testing.assert_array_equal(values.time_signal, [1.5, 2.5])
+
+    def test_default_is_empty_array(self):
+        """
+        assert values created without waveforms
+        load empty arrays.
+        """
+
+        values = custom_models.Values.objects.create(
+            point=self.values.point,
+            measurement=self.values.measurement)
+        values.refresh_from_db()
+        self.assertEqual(values.espectra.size, 0)
+        self.assertEqual(values.time_signal.size, 0)
+
+    def test_float16_encoding_is_scaled(self):
+        """
+        assert float16 encoding halves the size and
+        keeps values out of the float16 range.
+        """
+
+        samples = np.array([0.001, 1.5, 90000.0], dtype=np.float32)
+        half = encode_array(samples, 'float16')
+        single = encode_array(samples)
+        self.assertLess(len(half), len(single))
+        np.testing.assert_allclose(decode_array(half), samples, rtol=1e-2)
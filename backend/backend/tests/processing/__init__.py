@@ -0,0 +1,3 @@
+from .spectrum import TestSpectrum
+from .bearings import TestBearings
+from .severity import TestSeverity
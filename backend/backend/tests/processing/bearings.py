@@ -0,0 +1,65 @@
+from backend.bearings import defect_frequencies, machine_frequency_table, match_peaks
+from django.test import TestCase
+from model_bakery import baker
+import numpy as np
+
+
+class TestBearings(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # SKF 6205 deep groove ball bearing
+        baker.make(
+            'backend.BearingGeometry',
+            reference='6205',
+            rolling_elements=9,
+            ball_diameter=7.94,
+            pitch_diameter=39.04,
+            contact_angle=0)
+        cls.machine = baker.make('backend.Machine')
+        axis = baker.make(
+            'backend.Axis',
+            gear__machine=cls.machine,
+            velocity=1800,
+            units='rpm')
+        cls.bearing = baker.make(
+            'backend.Bearing', axis=axis, reference='6205')
+        cls.unknown = baker.make(
+            'backend.Bearing', axis=axis, reference='X-1')
+
+    def test_defect_frequencies(self):
+        """
+        assert defect frequencies match the
+        published orders of a 6205 bearing.
+        """
+
+        frequencies = defect_frequencies([[9, 7.94, 39.04, 0]], [1], 2)
+        self.assertEqual(frequencies.shape, (1, 4, 2))
+        np.testing.assert_allclose(
+            frequencies[0, :, 0], [5.415, 3.585, 2.357, 0.398], atol=1e-3)
+        np.testing.assert_allclose(
+            frequencies[0, :, 1], 2 * frequencies[0, :, 0])
+
+    def test_machine_frequency_table(self):
+        """
+        assert every cataloged bearing of a machine
+        is computed at the speed of its axis.
+        """
+
+        table = machine_frequency_table(self.machine, harmonics=3)
+        self.assertEqual(table.bearings, [self.bearing])
+        self.assertEqual(table.missing, [self.unknown])
+        self.assertEqual(table.speeds, [30])
+        self.assertAlmostEqual(table.frequencies[0, 1, 0], 3.585 * 30, 1)
+
+    def test_match_peaks(self):
+        """
+        assert peaks close to a defect
+        frequency are matched.
+        """
+
+        table = machine_frequency_table(self.machine)
+        matches = match_peaks([107.5, 70.7, 500.0], table)
+        self.assertEqual(
+            [(match.defect, match.harmonic) for match in matches],
+            [('BPFO', 1), ('BSF', 1)])
@@ -0,0 +1,101 @@
+from backend.severity import classify_measurements, machine_classes, update_severities
+from django.test.utils import CaptureQueriesContext
+from backend.models import Measurement
+from django.test import TestCase
+from django.db import connection
+from model_bakery import baker
+from itertools import count
+import numpy as np
+import datetime
+
+
+class TestSeverity(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.small = baker.make('backend.Machine', power=10, power_units='kW')
+        # 200 HP on flexible supports is a class III machine
+        cls.large = baker.make('backend.Machine', power=200, power_units='HP')
+        baker.make('backend.Gear', machine=cls.large, support='Flexible')
+        cls.velocity = baker.make(
+            'backend.Point', machine=cls.small, direction='H', point_type='V')
+        cls.acceleration = baker.make(
+            'backend.Point', machine=cls.small, direction='H', point_type='A')
+        cls.large_point = baker.make(
+            'backend.Point', machine=cls.large, direction='H', point_type='V')
+        # measurements are unique by type, date and machine
+        cls.days = count()
+
+    def make_measurement(self, machine, point, *tendencies):
+        measurement = baker.make(
+            'backend.Measurement',
+            machine=machine,
+            date=datetime.date(2021, 1, 1) + datetime.timedelta(
+                days=next(self.days)))
+        for tendency in tendencies:
+            baker.make(
+                'backend.Values',
+                measurement=measurement,
+                point=point,
+                tendency=tendency)
+        return measurement
+
+    def test_machine_classes(self):
+        """
+        assert machines are classified by
+        power and type of support.
+        """
+
+        classes = machine_classes(
+            [5, 50, 200, 200, 500, 500],
+            [False, True, False, True, False, True])
+        np.testing.assert_array_equal(classes, [0, 1, 1, 2, 2, 3])
+
+    def test_classify_measurements(self):
+        """
+        assert the highest velocity reading
+        sets the zone of each measurement.
+        """
+
+        green = self.make_measurement(self.small, self.velocity, 0.5, 1.0)
+        red = self.make_measurement(self.small, self.velocity, 1.0, 7.0)
+        # 5 mm/s peak is zone B for a class III machine
+        large = self.make_measurement(self.large, self.large_point, 5.0)
+        results = classify_measurements([green.id, red.id, large.id])
+        self.assertEqual(results[green.id].zone, 'A')
+        self.assertEqual(results[green.id].severity, 'green')
+        self.assertEqual(results[red.id].zone, 'D')
+        self.assertEqual(results[red.id].severity, 'red')
+        self.assertEqual(results[large.id].machine_class, 3)
+        self.assertEqual(results[large.id].zone, 'B')
+
+    def test_measurements_without_velocity_are_skipped(self):
+        """
+        assert measurements without velocity
+        readings are not classified.
+        """
+
+        measurement = self.make_measurement(
+            self.small, self.acceleration, 20.0)
+        self.assertEqual(classify_measurements([measurement.id]), {})
+        update_severities([measurement.id])
+        measurement.refresh_from_db()
+        self.assertEqual(measurement.severity, 'black')
+
+    def test_update_severities(self):
+        """
+        assert severities are stored with a
+        fixed number of queries per batch.
+        """
+
+        measurements = [
+            self.make_measurement(self.small, self.velocity, tendency)
+            for tendency in (0.5, 2.0, 7.0, 0.8, 3.0)]
+        with CaptureQueriesContext(connection) as queries:
+            update_severities([m.id for m in measurements])
+        self.assertLessEqual(len(queries), 6)
+        severities = dict(Measurement.objects.filter(
+            id__in=[m.id for m in measurements]).values_list('id', 'severity'))
+        self.assertEqual(
+            [severities[m.id] for m in measurements],
+            ['green', 'green', 'red', 'green', 'yellow'])
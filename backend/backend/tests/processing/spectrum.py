@@ -0,0 +1,105 @@
+from backend.spectrum import compute_spectra, spectrum_frequencies, measurement_spectra
+from backend import models as custom_models
+from django.test import TestCase
+from model_bakery import baker
+import numpy as np
+
+
+class TestSpectrum(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample_rate = 2560
+        time = np.arange(4096) / cls.sample_rate
+        # 1 g peak at 50 Hz, which falls on line 40 with 800 lines
+        cls.signal = np.sin(2 * np.pi * 50 * time)
+
+    def test_frequencies(self):
+        """
+        assert line resolution is fmax / lines.
+        """
+
+        frequencies = spectrum_frequencies(self.sample_rate, 800)
+        self.assertEqual(frequencies.size, 800)
+        self.assertAlmostEqual(frequencies[1], 1.25)
+
+    def test_acceleration_and_velocity(self):
+        """
+        assert acceleration is returned in g RMS
+        and velocity is integrated to mm/s peak.
+        """
+
+        spectra = compute_spectra(
+            [self.signal, self.signal], self.sample_rate, ['A', 'V'])
+        self.assertEqual(spectra.shape, (2, 800))
+        self.assertEqual(spectra.dtype, np.float32)
+        self.assertEqual(spectra[0].argmax(), 40)
+        self.assertAlmostEqual(spectra[0, 40], 1 / np.sqrt(2), places=3)
+        self.assertAlmostEqual(
+            spectra[1, 40], 9806.65 / (2 * np.pi * 50), places=1)
+
+    def test_signals_of_different_length(self):
+        """
+        assert short and empty signals are
+        zero padded within the same batch.
+        """
+
+        spectra = compute_spectra(
+            [self.signal, self.signal[:1000], []],
+            self.sample_rate,
+            ['A', 'A', 'A'],
+            lines=400)
+        self.assertEqual(spectra.shape, (3, 400))
+        self.assertFalse(spectra[2].any())
+
+    def test_measurement_spectra(self):
+        """
+        assert stored time signals of a
+        measurement are reprocessed.
+        """
+
+        measurement = baker.make('backend.Measurement')
+        point = baker.make('backend.Point', direction='H', point_type='V')
+        baker.make(
+            'backend.Values',
+            point=point,
+            measurement=measurement,
+            time_signal=self.signal,
+            sample_rate=self.sample_rate)
+        baker.make(
+            'backend.Values',
+            point=point,
+            measurement=measurement,
+            time_signal=self.signal)
+        updated = measurement_spectra([measurement.id], lines=400)
+        self.assertEqual(updated, 1)
+        value = custom_models.Values.objects.filter(
+            sample_rate=self.sample_rate).get()
+        self.assertEqual(value.espectra.size, 400)
+
+    def test_measurement_spectra_sample_rate(self):
+        """
+        assert the given sample rate only applies
+        to values stored without one.
+        """
+
+        measurement = baker.make('backend.Measurement')
+        point = baker.make('backend.Point', direction='H', point_type='V')
+        stored = baker.make(
+            'backend.Values',
+            point=point,
+            measurement=measurement,
+            time_signal=self.signal,
+            sample_rate=self.sample_rate)
+        missing = baker.make(
+            'backend.Values',
+            point=point,
+            measurement=measurement,
+            time_signal=self.signal)
+        updated = measurement_spectra(
+            [measurement.id], lines=400, sample_rate=5120)
+        self.assertEqual(updated, 2)
+        stored.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual(stored.sample_rate, self.sample_rate)
+        self.assertEqual(missing.sample_rate, 5120)
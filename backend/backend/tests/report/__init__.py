@@ -0,0 +1,6 @@
+from .loader import TestReportData
+from .charts import TestCharts
+from .cache import TestChartCache
+from .static import TestStaticImages
+from .artifacts import TestReportArtifacts
+from .plant import TestPlantReport
@@ -0,0 +1,117 @@
+from backend.report.artifacts import (
+    build_report,
+    report_key,
+    download_token,
+    token_report_id)
+from django.test import TestCase, override_settings
+from backend.models import Measurement, Report, Gear, Point, Company
+from django.utils import timezone
+from model_bakery import baker
+import datetime
+import tempfile
+import shutil
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestReportArtifacts(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        company = baker.make('backend.Company')
+        cls.user = baker.make(
+            'backend.VibroUser', company=company, user_type='engineer')
+        machine = baker.make('backend.Machine', company=company)
+        baker.make('backend.Gear', machine=machine, gear_type='bomba')
+        point = baker.make(
+            'backend.Point',
+            machine=machine,
+            position=1,
+            direction='H',
+            point_type='V')
+        cls.measurement = baker.make(
+            'backend.Measurement',
+            machine=machine,
+            engineer_one=cls.user,
+            severity='green',
+            date=datetime.date(2021, 1, 1))
+        baker.make(
+            'backend.Values',
+            measurement=cls.measurement,
+            point=point,
+            tendency=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_report_is_stored_once(self):
+        """
+        assert repeated requests reuse
+        the stored report.
+        """
+
+        report = build_report(self.user, [self.measurement.id])
+        with report.file.open('rb') as file:
+            self.assertTrue(file.read().startswith(b'%PDF'))
+        self.assertEqual(report.size, report.file.size)
+        self.assertTrue(report.filename.endswith(
+            f'_{timezone.localdate(report.created)}.pdf'))
+        self.assertEqual(
+            list(report.measurements.all()), [self.measurement])
+        self.assertEqual(
+            build_report(self.user, [self.measurement.id]).id, report.id)
+        self.assertEqual(Report.objects.count(), 1)
+
+    def test_changed_data_builds_new_report(self):
+        """
+        assert editing a measurement builds
+        a new report instead of a stale one.
+        """
+
+        report = build_report(self.user, [self.measurement.id])
+        measurement = Measurement.objects.get(id=self.measurement.id)
+        measurement.diagnostic = 'desbalanceo'
+        measurement.save()
+        self.assertNotEqual(
+            build_report(self.user, [self.measurement.id]).id, report.id)
+
+    def test_printed_rows_change_the_key(self):
+        """
+        assert editing the gears, points, company
+        or users printed in a report changes its key.
+        """
+
+        ids = [self.measurement.id]
+        edits = (
+            lambda: Gear.objects.update(gear_type='motor'),
+            lambda: Point.objects.update(direction='V'),
+            lambda: Company.objects.update(name='otra'),
+            lambda: type(self.user).objects.filter(
+                id=self.user.id).update(last_name='perez'),
+        )
+        for edit in edits:
+            key = report_key(self.user, ids)
+            edit()
+            self.assertNotEqual(report_key(self.user, ids), key)
+
+    def test_missing_measurements(self):
+        """
+        assert no report is built without
+        measurements.
+        """
+
+        self.assertIsNone(build_report(self.user, [0]))
+
+    def test_download_token(self):
+        """
+        assert tokens resolve to their report
+        and tampered ones are rejected.
+        """
+
+        report = baker.make('backend.Report', user=self.user)
+        token = download_token(report)
+        self.assertEqual(token_report_id(token, 60), report.id)
+        self.assertIsNone(token_report_id(f'{token}x', 60))
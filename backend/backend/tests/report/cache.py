@@ -0,0 +1,97 @@
+from backend.report.charts import render_charts, tendency_chart
+from backend.report.cache import ChartCache
+from django.test import SimpleTestCase
+from unittest import mock
+import tempfile
+import datetime
+import os
+
+
+class TestChartCache(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ChartCache(self.directory.name)
+        dates = [datetime.date(2021, 1, day) for day in range(1, 4)]
+        self.charts = [
+            tendency_chart(
+                'Tendencia', 'g - RMS',
+                {'1HA': {'dates': dates, 'values': [index, 1, 2]}},
+                size=(4, 2),
+                dpi=50)
+            for index in range(3)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key_depends_on_inputs(self):
+        """
+        assert the key changes with the series
+        and the rendering parameters only.
+        """
+
+        key = self.cache.key(self.charts[0])
+        self.assertEqual(key, self.cache.key(self.charts[0]._replace()))
+        self.assertNotEqual(key, self.cache.key(self.charts[1]))
+        self.assertNotEqual(
+            key, self.cache.key(self.charts[0]._replace(dpi=100)))
+
+    def test_cached_charts_are_not_rendered(self):
+        """
+        assert a second batch reuses every
+        image rendered by the first one.
+        """
+
+        first = render_charts(self.charts, workers=1, cache=self.cache)
+        with mock.patch('backend.report.charts.render_tendency') as render:
+            second = render_charts(self.charts, workers=1, cache=self.cache)
+        render.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_least_recently_used_are_evicted(self):
+        """
+        assert eviction removes the oldest
+        images until the cache fits.
+        """
+
+        for index, name in enumerate(('aa01', 'bb02', 'cc03')):
+            self.cache.set(name, b'x' * 100)
+            os.utime(self.cache.path(name), (index, index))
+        self.cache.get('aa01')
+        self.cache.max_size = 200
+        self.cache.evict()
+        self.assertIsNotNone(self.cache.get('aa01'))
+        self.assertIsNone(self.cache.get('bb02'))
+        self.assertIsNotNone(self.cache.get('cc03'))
+
+    def test_failed_write_keeps_the_image(self):
+        """
+        assert a cache that can't be written
+        still returns the rendered images.
+        """
+
+        with mock.patch('os.replace', side_effect=OSError('disco lleno')), \
+                self.assertLogs('backend.report.cache', 'WARNING'):
+            images = render_charts(self.charts, workers=1, cache=self.cache)
+        self.assertTrue(all(image.startswith(b'\xff\xd8') for image in images))
+        self.assertIsNone(self.cache.get(self.cache.key(self.charts[0])))
+        self.assertEqual(
+            [name for _, _, files in os.walk(self.directory.name)
+             for name in files], [])
+
+    def test_eviction_skips_partial_files(self):
+        """
+        assert files being written by other
+        workers are never evicted.
+        """
+
+        self.cache.set('aa01', b'x' * 100)
+        temporary = f'{self.cache.path("bb02")}.1.tmp'
+        os.makedirs(os.path.dirname(temporary))
+        with open(temporary, 'wb') as image:
+            image.write(b'x' * 100)
+        os.utime(temporary, (0, 0))
+        self.cache.max_size = 0
+        self.cache.evict()
+        self.assertTrue(os.path.exists(temporary))
+        self.assertIsNone(self.cache.get('aa01'))
@@ -0,0 +1,73 @@
+from backend.report.charts import render_charts, render_tendency, tendency_chart
+from backend.report import charts
+from django.test import SimpleTestCase
+from unittest import mock
+import datetime
+import billiard
+
+
+def render_in_daemon(charts, queue):
+    queue.put(render_charts(charts, workers=2))
+
+
+class TestCharts(SimpleTestCase):
+
+    def setUp(self):
+        dates = [datetime.date(2021, 1, day) for day in range(1, 6)]
+        self.charts = [
+            tendency_chart(
+                f'Tendencia\nbomba {index}',
+                'mm/s - Pico',
+                {'1HV': {'dates': dates, 'values': [index] * 5}},
+                size=(4, 2),
+                dpi=50)
+            for index in range(4)]
+
+    def test_render_tendency(self):
+        """
+        assert charts are rendered to jpg
+        without touching pyplot state.
+        """
+
+        with mock.patch('matplotlib.pyplot.figure') as figure:
+            image = render_tendency(self.charts[0])
+        figure.assert_not_called()
+        self.assertTrue(image.startswith(b'\xff\xd8'))
+
+    def test_pool_keeps_order(self):
+        """
+        assert images rendered in the process
+        pool come back in the chart order.
+        """
+
+        sequential = render_charts(self.charts, workers=1)
+        parallel = render_charts(self.charts, workers=2)
+        self.assertEqual(parallel, sequential)
+
+    def test_pool_is_reused(self):
+        """
+        assert every batch of the process renders
+        in the same pool, kept between reports.
+        """
+
+        render_charts(self.charts, workers=2)
+        pool = charts.render_pool(2)
+        with mock.patch('billiard.Pool') as new_pool:
+            render_charts(self.charts, workers=2)
+            render_charts(self.charts[:3], workers=2)
+        new_pool.assert_not_called()
+        self.assertIs(charts.render_pool(2), pool)
+
+    def test_pool_in_daemon_process(self):
+        """
+        assert the pool also renders inside daemon
+        processes, like prefork celery workers.
+        """
+
+        queue = billiard.Queue()
+        process = billiard.Process(
+            target=render_in_daemon, args=(self.charts, queue), daemon=True)
+        process.start()
+        images = queue.get(timeout=60)
+        process.join()
+        self.assertEqual(images, render_charts(self.charts, workers=1))
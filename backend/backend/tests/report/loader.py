@@ -0,0 +1,110 @@
+from django.test.utils import CaptureQueriesContext
+from backend.report.loader import ReportData
+from backend.report.report import Report
+from backend.models import Measurement
+from django.test import TestCase
+from django.db import connection
+from model_bakery import baker
+from io import BytesIO
+import datetime
+
+
+class TestReportData(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        company = baker.make('backend.Company')
+        cls.user = baker.make(
+            'backend.VibroUser', company=company, user_type='engineer')
+        cls.machines = baker.make(
+            'backend.Machine', company=company, _quantity=3)
+        for machine in cls.machines:
+            baker.make('backend.Gear', machine=machine, gear_type='bomba')
+            points = [
+                baker.make(
+                    'backend.Point',
+                    machine=machine,
+                    position=1,
+                    direction='H',
+                    point_type=point_type)
+                for point_type in ('V', 'A')]
+            for day in range(12):
+                measurement = baker.make(
+                    'backend.Measurement',
+                    machine=machine,
+                    engineer_one=cls.user,
+                    severity='green',
+                    date=datetime.date(2021, 1, 1) +
+                    datetime.timedelta(days=day))
+                for point in points:
+                    baker.make(
+                        'backend.Values',
+                        measurement=measurement,
+                        point=point,
+                        tendency=day)
+        cls.queryset = Measurement.objects.filter(
+            date=datetime.date(2021, 1, 11))
+
+    def test_history_is_loaded_up_front(self):
+        """
+        assert the history of every machine is
+        loaded with a fixed number of queries.
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            data = ReportData(self.queryset)
+        self.assertLessEqual(len(queries), 4)
+        measurement = data.first()
+        with CaptureQueriesContext(connection) as queries:
+            history = data.history(measurement)
+            data.main_gear(measurement.machine)
+        self.assertEqual(len(queries), 0)
+        # measurements after the report date are left out
+        self.assertEqual(len(history), 10)
+        self.assertEqual(history[0].date, datetime.date(2021, 1, 11))
+        self.assertEqual(history[0].tendencies, {'1HV': 10.0, '1HA': 10.0})
+
+    def test_history_is_limited_in_sql(self):
+        """
+        assert only the last readings of each
+        machine are loaded from the database.
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            data = ReportData(self.queryset, history=3)
+        values = next(
+            query['sql'] for query in queries.captured_queries
+            if 'backend_values' in query['sql'])
+        # the values of 3 measurements for each of the 3 machines
+        ids = values.split(' IN (')[1].split(')')[0]
+        self.assertEqual(len(ids.split(',')), 9)
+        history = data.history(data.first())
+        self.assertEqual(
+            [reading.date.day for reading in history], [11, 10, 9])
+
+    def test_segments_dont_query(self):
+        """
+        assert the graph data of every machine
+        is formatted without further queries.
+        """
+
+        report = Report(BytesIO(), self.queryset, self.user)
+        with CaptureQueriesContext(connection) as queries:
+            for measurement in report.data.measurements:
+                readings = report.retrieve_measurements(measurement)
+                rows = report.format_table_data(readings, 'title')
+                data = report.format_tendency_data(readings, 'V')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(rows[2], ['1HA', 'g', 9.0, 10.0, 11.11])
+        self.assertEqual(rows[3], ['1HV', 'mm/s', 9.0, 10.0, 11.11])
+        self.assertEqual(data['1HV']['values'], [float(x) for x in range(1, 11)])
+
+    def test_report_builds(self):
+        """
+        assert the whole report is built
+        from the loaded data.
+        """
+
+        buffer = BytesIO()
+        Report(buffer, self.queryset, self.user).build_doc()
+        self.assertTrue(buffer.getvalue().startswith(b'%PDF'))
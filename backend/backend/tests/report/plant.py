@@ -0,0 +1,147 @@
+from backend.report.plant import PlantReport, SectionStory
+from django.test import TestCase, override_settings
+from django.core.files.storage import Storage
+from django.core.files.base import ContentFile
+from backend.report.report import Report
+from backend.models import Measurement
+from model_bakery import baker
+from unittest import mock
+from io import BytesIO
+from PIL import Image
+import datetime
+
+
+class MemoryStorage(Storage):
+
+    """
+    storage without local paths,
+    like the s3 one of production.
+    """
+
+    files = {}
+
+    def _save(self, name, content):
+        MemoryStorage.files[name] = content.read()
+        return name
+
+    def _open(self, name, mode='rb'):
+        return ContentFile(MemoryStorage.files[name], name=name)
+
+    def exists(self, name):
+        return name in MemoryStorage.files
+
+    def size(self, name):
+        return len(MemoryStorage.files[name])
+
+    def url(self, name):
+        return f'/media/{name}'
+
+
+class TestPlantReport(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        company = baker.make('backend.Company')
+        cls.user = baker.make(
+            'backend.VibroUser', company=company, user_type='engineer')
+        for hierarchy in range(4):
+            machine = baker.make(
+                'backend.Machine', company=company, hierarchy=hierarchy)
+            baker.make('backend.Gear', machine=machine, gear_type='bomba')
+            point = baker.make(
+                'backend.Point',
+                machine=machine,
+                position=1,
+                direction='H',
+                point_type='V')
+            for day in range(2):
+                measurement = baker.make(
+                    'backend.Measurement',
+                    machine=machine,
+                    engineer_one=cls.user,
+                    severity='green',
+                    # longer analysis so sections span more pages
+                    analysis='desbalanceo ' * 100 * hierarchy,
+                    date=datetime.date(2021, 1, 1 + day))
+                baker.make(
+                    'backend.Values',
+                    measurement=measurement,
+                    point=point,
+                    tendency=day + 1)
+        cls.queryset = Measurement.objects.filter(
+            date=datetime.date(2021, 1, 2)).order_by('machine__hierarchy')
+
+    def test_single_pass_matches_report(self):
+        """
+        assert the TOC numbered from the drafts
+        matches the one of the multi pass build.
+        """
+
+        report = Report(BytesIO(), self.queryset, self.user)
+        report.build_doc()
+        plant = PlantReport(BytesIO(), self.queryset, self.user)
+        plant.build_doc()
+        self.assertEqual(plant.toc._lastEntries, report.toc._lastEntries)
+        self.assertEqual(plant.page, report.page)
+
+    def test_graphs_rendered_by_batch(self):
+        """
+        assert graphs are rendered a batch of
+        sections at a time and released after.
+        """
+
+        buffer = BytesIO()
+        plant = PlantReport(
+            buffer, self.queryset, self.user, section_size=3)
+        with mock.patch.object(
+                plant, 'render_tendency_graphs',
+                wraps=plant.render_tendency_graphs) as render:
+            plant.build_doc()
+        self.assertEqual(
+            [len(call.args[0]) for call in render.call_args_list], [3, 1])
+        self.assertEqual(plant.graphs, {})
+        self.assertTrue(buffer.getvalue().startswith(b'%PDF'))
+
+    def test_story_pulls_sections(self):
+        """
+        assert sections are only created once
+        the previous ones are consumed.
+        """
+
+        pulled = []
+
+        def sections():
+            for index in range(3):
+                pulled.append(index)
+                yield [index, index]
+
+        story = SectionStory(sections())
+        self.assertEqual(len(story), 2)
+        self.assertEqual(pulled, [0])
+        del story[:2]
+        self.assertEqual(len(story), 2)
+        self.assertEqual(pulled, [0, 1])
+        del story[:2]
+        del story[:len(story)]
+        self.assertEqual(len(story), 0)
+
+    @override_settings(
+        DEFAULT_FILE_STORAGE='backend.tests.report.plant.MemoryStorage')
+    def test_pictures_read_through_storage(self):
+        """
+        assert machine pictures are read through
+        storages without local paths.
+        """
+
+        self.addCleanup(MemoryStorage.files.clear)
+        with BytesIO() as buffer:
+            Image.new('RGB', (8, 8)).save(buffer, 'PNG')
+            picture = buffer.getvalue()
+        measurement = self.queryset.first()
+        machine = measurement.machine
+        machine.image.save('motor.png', ContentFile(picture))
+        machine.diagram.save('diagrama.png', ContentFile(picture))
+        buffer = BytesIO()
+        queryset = Measurement.objects.filter(id=measurement.id)
+        PlantReport(buffer, queryset, self.user).build_doc()
+        self.assertTrue(buffer.getvalue().startswith(b'%PDF'))
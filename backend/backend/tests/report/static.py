@@ -0,0 +1,47 @@
+from backend.report.static import static_image
+from backend.report.report import Report
+from backend.models import Measurement
+from django.test import TestCase
+from model_bakery import baker
+from io import BytesIO
+import re
+
+
+class TestStaticImages(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        company = baker.make('backend.Company')
+        cls.user = baker.make(
+            'backend.VibroUser', company=company, user_type='engineer')
+        point = baker.make(
+            'backend.Point', direction='H', point_type='V',
+            machine__company=company)
+        baker.make(
+            'backend.Values',
+            point=point,
+            measurement__machine=point.machine,
+            measurement__engineer_one=cls.user,
+            measurement__severity='red')
+        cls.queryset = Measurement.objects.all()
+
+    def build(self):
+        buffer = BytesIO()
+        Report(buffer, self.queryset, self.user).build_doc()
+        return buffer.getvalue()
+
+    def test_images_are_encoded_once(self):
+        """
+        assert a second report reuses the
+        static images encoded by the first.
+        """
+
+        self.build()
+        misses = static_image.cache_info().misses
+        pdf = self.build()
+        self.assertEqual(static_image.cache_info().misses, misses)
+        # every reference in the document points to an object
+        objects = set(re.findall(rb'\n(\d+) 0 obj', pdf))
+        references = set(re.findall(rb'(\d+) 0 R', pdf))
+        self.assertLessEqual(references, objects)
+        self.assertIn(b'/SMask', pdf)
@@ -1 +1,3 @@
 from .email import TestEmail
+from .send_emails import TestSendEmails
+from .generate_report import TestGenerateReport
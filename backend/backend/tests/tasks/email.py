@@ -1,6 +1,127 @@
-from django.test import TestCase
-from backend.tasks import Email
+from backend.tasks import send_email, EMAILS
+from django.test import TestCase, override_settings
+from backend.models import Report
+from model_bakery import baker
+from django.core import mail
+from unittest import mock
+import datetime
+import tempfile
+import shutil
+import json
 
+MEDIA_ROOT = tempfile.mkdtemp()
 
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
 class TestEmail(TestCase):
-    pass
+
+    @classmethod
+    def setUpTestData(cls):
+        company = baker.make('backend.Company')
+        cls.user = baker.make(
+            'backend.VibroUser',
+            company=company,
+            email='client@vibro.com',
+            user_type='engineer')
+        machine = baker.make('backend.Machine', company=company)
+        baker.make('backend.Gear', machine=machine, gear_type='bomba')
+        point = baker.make(
+            'backend.Point',
+            machine=machine,
+            position=1,
+            direction='H',
+            point_type='V')
+        cls.measurement = baker.make(
+            'backend.Measurement',
+            machine=machine,
+            engineer_one=cls.user,
+            severity='green',
+            date=datetime.date(2021, 1, 1))
+        baker.make(
+            'backend.Values',
+            measurement=cls.measurement,
+            point=point,
+            tendency=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_arguments_are_serializable(self):
+        """
+        assert the task signature only
+        carries json serializable data.
+        """
+
+        signature = send_email.s(
+            self.user.id, 'report', measurement_ids=[self.measurement.id])
+        json.dumps(signature)
+
+    def test_each_call_builds_its_own_email(self):
+        """
+        assert consecutive calls don't share
+        recipients, subjects or templates.
+        """
+
+        other = baker.make('backend.VibroUser', email='other@vibro.com')
+        send_email(self.user.id, 'register')
+        send_email(other.id, 'change_password')
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertEqual(mail.outbox[0].subject, EMAILS['register'][0])
+        self.assertEqual(mail.outbox[1].to, [other.email])
+        self.assertEqual(mail.outbox[1].subject, EMAILS['change_password'][0])
+        self.assertEqual(mail.outbox[0].content_subtype, 'html')
+
+    def test_reset_contains_host(self):
+        """
+        assert the reset email links
+        to the host of the request.
+        """
+
+        send_email(self.user.id, 'reset', host='vibro.com')
+        self.assertIn('www.vibro.com/password/reset/', mail.outbox[0].body)
+
+    def test_report_is_linked(self):
+        """
+        assert the worker stores the report of
+        the measurement ids and links to it.
+        """
+
+        send_email(
+            self.user.id,
+            'report',
+            measurement_ids=[self.measurement.id],
+            host='vibro.com')
+        report = Report.objects.get()
+        self.assertEqual(mail.outbox[0].attachments, [])
+        self.assertIn(
+            f'https://vibro.com/api/reports/{report.id}/download?token=',
+            mail.outbox[0].body)
+
+    def test_report_failure_is_logged(self):
+        """
+        assert a report that can't be built is
+        logged and the email is still sent.
+        """
+
+        with mock.patch(
+                'backend.tasks.build_report', side_effect=OSError('s3')), \
+                self.assertLogs('backend.tasks', 'ERROR'):
+            send_email(
+                self.user.id,
+                'report',
+                measurement_ids=[self.measurement.id],
+                host='vibro.com')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertNotIn('/download?token=', mail.outbox[0].body)
+
+    def test_missing_user_sends_nothing(self):
+        """
+        assert nothing is sent when the user
+        was deleted before the task ran.
+        """
+
+        send_email(0, 'register')
+        self.assertEqual(len(mail.outbox), 0)
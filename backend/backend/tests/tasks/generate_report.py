@@ -0,0 +1,73 @@
+from django.test import TestCase, override_settings
+from celery.backends.cache import CacheBackend
+from backend.tasks import generate_report
+from backend.models import Report
+from model_bakery import baker
+import datetime
+import tempfile
+import shutil
+import time
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestGenerateReport(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        company = baker.make('backend.Company')
+        cls.user = baker.make(
+            'backend.VibroUser', company=company, user_type='engineer')
+        machine = baker.make('backend.Machine', company=company)
+        baker.make('backend.Gear', machine=machine, gear_type='bomba')
+        cls.measurement = baker.make(
+            'backend.Measurement',
+            machine=machine,
+            engineer_one=cls.user,
+            severity='green',
+            date=datetime.date(2021, 1, 1))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        generate_report.backend = CacheBackend(
+            app=generate_report.app, backend='memory')
+        # the memory backend is shared by the whole process
+        generate_report.backend.client.cache.clear()
+
+    def tearDown(self):
+        generate_report.backend = None
+
+    def test_stage_timings(self):
+        """
+        assert the job times every stage and
+        returns the stored report.
+        """
+
+        result = generate_report.apply(
+            args=(self.user.id, [self.measurement.id], time.time()),
+            task_id='job').get()
+        self.assertEqual(result['stage'], 'done')
+        self.assertEqual(
+            set(result['timings']),
+            {'queued', 'loading', 'rendering', 'storing'})
+        self.assertEqual(Report.objects.get().id, result['report'])
+        # progress was published while building
+        self.assertEqual(
+            generate_report.backend.get_state('job'), 'PROGRESS')
+
+    def test_failure_is_stored(self):
+        """
+        assert failed jobs keep their owner
+        and the stage they failed in.
+        """
+
+        generate_report.apply(args=(self.user.id, [0]), task_id='job')
+        self.assertEqual(generate_report.backend.get_state('job'), 'FAILED')
+        info = generate_report.backend.get_task_meta('job')['result']
+        self.assertEqual(info['user'], self.user.id)
+        self.assertEqual(info['stage'], 'loading')
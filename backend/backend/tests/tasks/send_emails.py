@@ -0,0 +1,136 @@
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from backend.tasks import send_emails, build_email
+from model_bakery import baker
+from django.core import mail
+from unittest import mock
+import smtplib
+
+
+class CountingBackend(EmailBackend):
+
+    """
+    locmem backend that counts the connections
+    opened, fails the batches listed in fail,
+    disconnects once on the addresses listed in
+    drop and refuses the ones listed in refuse.
+    """
+
+    opened = 0
+    fail = set()
+    drop = set()
+    refuse = set()
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if CountingBackend.opened in CountingBackend.fail:
+            CountingBackend.fail.discard(CountingBackend.opened)
+            raise smtplib.SMTPServerDisconnected('conexion perdida')
+        for message in messages:
+            if message.to[0] in CountingBackend.drop:
+                CountingBackend.drop.discard(message.to[0])
+                raise smtplib.SMTPServerDisconnected('conexion perdida')
+            if message.to[0] in CountingBackend.refuse:
+                raise smtplib.SMTPRecipientsRefused(
+                    {message.to[0]: (550, b'buzon inexistente')})
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='backend.tests.tasks.send_emails.CountingBackend',
+    EMAIL_BATCH_SIZE=2,
+    EMAIL_RETRY_DELAY=0)
+class TestSendEmails(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = baker.make('backend.VibroUser', _quantity=5)
+        cls.jobs = [
+            {'user_id': user.id, 'template': 'register'}
+            for user in cls.users]
+
+    def setUp(self):
+        CountingBackend.opened = 0
+        CountingBackend.fail = set()
+        CountingBackend.drop = set()
+        CountingBackend.refuse = set()
+
+    def test_one_connection_per_batch(self):
+        """
+        assert every batch of emails is sent
+        through a single connection.
+        """
+
+        send_emails(self.jobs)
+        self.assertEqual(CountingBackend.opened, 3)
+        self.assertEqual(
+            [email.to[0] for email in mail.outbox],
+            [user.email for user in self.users])
+
+    def test_emails_built_before_connecting(self):
+        """
+        assert the messages of a batch are built
+        before its connection is opened.
+        """
+
+        built = []
+
+        def build(**job):
+            built.append(CountingBackend.opened)
+            return build_email(**job)
+
+        with mock.patch('backend.tasks.build_email', build):
+            send_emails(self.jobs)
+        self.assertEqual(built, [0, 0, 1, 1, 2])
+
+    def test_failed_batch_is_retried(self):
+        """
+        assert a failed batch is retried without
+        sending the previous batches again.
+        """
+
+        CountingBackend.fail = {2}
+        send_emails.apply(args=(self.jobs,))
+        self.assertEqual(CountingBackend.opened, 4)
+        self.assertEqual(
+            [email.to[0] for email in mail.outbox],
+            [user.email for user in self.users])
+
+    def test_missing_users_are_skipped(self):
+        """
+        assert jobs of deleted users don't
+        stop the rest of the batch.
+        """
+
+        send_emails([{'user_id': 0, 'template': 'register'}] + self.jobs[:1])
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failure_within_batch(self):
+        """
+        assert a failure after some messages of a
+        batch were sent only retries the rest.
+        """
+
+        CountingBackend.drop = {self.users[3].email}
+        send_emails.apply(args=(self.jobs,))
+        self.assertEqual(
+            [email.to[0] for email in mail.outbox],
+            [user.email for user in self.users])
+
+    def test_refused_recipient_is_skipped(self):
+        """
+        assert a permanently refused recipient is
+        skipped without retrying the task.
+        """
+
+        CountingBackend.refuse = {self.users[1].email}
+        with self.assertLogs('backend.tasks', 'WARNING'):
+            send_emails.apply(args=(self.jobs,))
+        self.assertEqual(CountingBackend.opened, 3)
+        self.assertEqual(
+            [email.to[0] for email in mail.outbox],
+            [user.email for index, user in enumerate(self.users)
+             if index != 1])
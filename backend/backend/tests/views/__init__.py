@@ -13,4 +13,17 @@ from .image_view import TestImageView
 from .date_view import TestDateView
 from .measurement_view import TestMeasurementView
 from .flaw_view import TestFlawView
+from .ingest_view import TestIngestView
+from .values_view import TestValuesView
+from .bearing_geometry_view import TestBearingGeometryView
 
+from .measurement_classify_view import TestMeasurementClassifyView
+from .report_download_view import TestReportDownloadView
+from .report_job_view import TestReportJobView
+from .metrics_view import TestMetricsView
+from .filters_view import TestFiltersView
+from .pagination_view import TestPaginationView
+from .asset_tree_view import TestAssetTreeView
+from .response_cache_view import TestResponseCacheView
+from .conditional_view import TestConditionalView
+from .sparse_fields_view import TestSparseFieldsView
@@ -0,0 +1,105 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+
+
+class TestAssetTreeView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = baker.make('backend.Company')
+        cls.engineer = baker.make('backend.VibroUser', user_type='engineer')
+        cls.client_user = baker.make('backend.VibroUser', user_type='client')
+        cls.machines = baker.make(
+            'backend.Machine', company=cls.company, _quantity=2)
+        cls.url = reverse('company-tree', args=[cls.company.id])
+
+    def setUp(self):
+        self.authenticate(self.engineer)
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def grow(self, machines):
+        for machine in machines:
+            baker.make(
+                'backend.Point',
+                machine=machine,
+                position=1,
+                direction='H',
+                point_type='V')
+            baker.make(
+                'backend.Sensor', machine=machine, sensitivity=100, channel=1)
+            for gear in baker.make(
+                    'backend.Gear', machine=machine, _quantity=2):
+                for axis in baker.make(
+                        'backend.Axis', gear=gear, velocity=1800,
+                        _quantity=2):
+                    baker.make('backend.Bearing', axis=axis, _quantity=2)
+
+    def test_whole_tree(self):
+        """
+        assert the tree nests every level
+        of each machine.
+        """
+
+        self.grow(self.machines)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['id'], self.company.id)
+        self.assertEqual(len(res.data['machines']), 2)
+        machine = res.data['machines'][0]
+        self.assertEqual(len(machine['points']), 1)
+        self.assertEqual(len(machine['sensors']), 1)
+        self.assertEqual(len(machine['gears']), 2)
+        self.assertEqual(len(machine['gears'][0]['axis']), 2)
+        self.assertEqual(len(machine['gears'][0]['axis'][0]['bearings']), 2)
+
+    def test_constant_queries(self):
+        """
+        assert the number of queries doesn't
+        grow with the size of the tree.
+        """
+
+        self.grow(self.machines[:1])
+        with self.assertNumQueries(8):
+            self.client.get(self.url)
+        self.grow(self.machines[1:] + baker.make(
+            'backend.Machine', company=self.company, _quantity=3))
+        with self.assertNumQueries(8):
+            res = self.client.get(self.url)
+        self.assertEqual(len(res.data['machines']), 5)
+
+    def test_depth_and_machine(self):
+        """
+        assert depth limits the nested levels and
+        machine restricts the tree to one machine.
+        """
+
+        self.grow(self.machines)
+        with self.assertNumQueries(6):
+            res = self.client.get(
+                self.url, {'depth': 2, 'machine': self.machines[1].id})
+        self.assertEqual(
+            [machine['id'] for machine in res.data['machines']],
+            [self.machines[1].id])
+        machine = res.data['machines'][0]
+        self.assertIn('points', machine)
+        self.assertNotIn('axis', machine['gears'][0])
+        res = self.client.get(self.url, {'depth': 1})
+        self.assertNotIn('gears', res.data['machines'][0])
+        res = self.client.get(self.url, {'depth': 5})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_client_only_sees_own_company(self):
+        """
+        assert clients can't get the tree
+        of other companies.
+        """
+
+        self.authenticate(self.client_user)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,95 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+
+
+class TestBearingGeometryView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.geometry_url = reverse('bearing-geometry-list')
+        cls.user = baker.make('backend.VibroUser', user_type='engineer')
+        cls.machine = baker.make('backend.Machine')
+        baker.make(
+            'backend.Bearing',
+            axis__gear__machine=cls.machine,
+            axis__velocity=30,
+            axis__units='Hz',
+            reference='6205')
+        cls.frequencies_url = reverse(
+            'machine-bearing-frequencies', kwargs={'pk': cls.machine.id})
+
+    def setUp(self):
+        refresh = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+        self.data = {
+            "reference": "6205",
+            "rolling_elements": 9,
+            "ball_diameter": 7.94,
+            "pitch_diameter": 39.04,
+        }
+
+    def test_staff_can_post_geometry(self):
+        """
+        assert staff users can add
+        bearings to the catalog.
+        """
+
+        res = self.client.post(self.geometry_url, self.data, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['contact_angle'], 0)
+
+    def test_bearing_frequencies(self):
+        """
+        assert the machine endpoint returns the
+        frequency table and matched peaks.
+        """
+
+        self.client.post(self.geometry_url, self.data, format='json')
+        res = self.client.get(
+            self.frequencies_url, {'harmonics': 2, 'peaks': '107.5'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['bearings']), 1)
+        self.assertEqual(len(res.data['bearings'][0]['frequencies']['BPFO']), 2)
+        self.assertEqual(res.data['matches'][0]['defect'], 'BPFO')
+        self.assertEqual(res.data['missing'], [])
+
+    def test_invalid_harmonics(self):
+        """
+        assert invalid params are rejected.
+        """
+
+        res = self.client.get(self.frequencies_url, {'harmonics': 'x'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_geometry_is_rejected(self):
+        """
+        assert geometries without rolling elements
+        or positive diameters are rejected.
+        """
+
+        for field, value in (
+                ('rolling_elements', 0),
+                ('ball_diameter', -1),
+                ('pitch_diameter', 0)):
+            res = self.client.post(
+                self.geometry_url, {**self.data, field: value}, format='json')
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(field, res.data)
+
+    def test_stored_invalid_geometry(self):
+        """
+        assert invalid geometries already in the
+        catalog are rejected by the frequencies.
+        """
+
+        baker.make(
+            'backend.BearingGeometry',
+            reference='6205',
+            rolling_elements=9,
+            ball_diameter=7.94,
+            pitch_diameter=0)
+        res = self.client.get(self.frequencies_url)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
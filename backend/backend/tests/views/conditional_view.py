@@ -0,0 +1,163 @@
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from django.utils.http import http_date
+from django.core.cache import cache
+from django.utils import timezone
+from django.db import connection
+from rest_framework import status
+from django.urls import reverse
+from unittest import mock
+from backend.models import Machine
+from model_bakery import baker
+import datetime
+
+
+# test cases never commit, so invalidations run at once
+@override_settings(API_CACHE=True)
+@mock.patch(
+    'backend.response_cache.transaction.on_commit', lambda callback: callback())
+class TestConditionalView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = baker.make('backend.Company')
+        cls.other_company = baker.make('backend.Company')
+        cls.engineer = baker.make('backend.VibroUser', user_type='engineer')
+        cls.client_user = baker.make(
+            'backend.VibroUser', user_type='client', company=cls.company)
+        cls.machine = baker.make(
+            'backend.Machine', company=cls.company, name='motor')
+        cls.url = reverse('machine-list')
+
+    def setUp(self):
+        cache.clear()
+        self.authenticate(self.client_user)
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def test_not_modified(self):
+        """
+        assert a request with the ETag of unchanged
+        data returns 304 without building the body.
+        """
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        # only the user is loaded
+        self.assertEqual(len(queries), 1)
+
+    def test_modified(self):
+        """
+        assert a change of the company
+        replaces the ETag.
+        """
+
+        etag = self.client.get(self.url)['ETag']
+        self.machine.name = 'pump'
+        self.machine.save()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(res.data['results'][0]['name'], 'pump')
+
+    def test_params(self):
+        """
+        assert requests with other query
+        params have other ETags.
+        """
+
+        etag = self.client.get(self.url)['ETag']
+        res = self.client.get(
+            f'{self.url}?name=pump', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_disabled(self):
+        """
+        assert reads have no ETag without a
+        cache shared by every process.
+        """
+
+        with self.settings(API_CACHE=False):
+            res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', res)
+        self.assertIn('Last-Modified', res)
+
+    def test_last_modified(self):
+        """
+        assert reads are dated with the last
+        update of their rows, cached or not.
+        """
+
+        old = baker.make('backend.Machine', company=self.company)
+        Machine.objects.filter(id=old.id).update(
+            updated_at=timezone.now() - datetime.timedelta(days=1))
+        self.machine.refresh_from_db()
+        expected = http_date(self.machine.updated_at.timestamp())
+        self.assertEqual(self.client.get(self.url)['Last-Modified'], expected)
+        res = self.client.get(self.url)
+        self.assertEqual(res['X-Cache'], 'HIT')
+        self.assertEqual(res['Last-Modified'], expected)
+
+        res = self.client.get(reverse('machine-detail', args=[old.id]))
+        self.assertEqual(
+            res['Last-Modified'],
+            http_date(Machine.objects.get(id=old.id).updated_at.timestamp()))
+        res = self.client.get(reverse('sensor-list'))
+        self.assertNotIn('Last-Modified', res)
+
+    def test_staff(self):
+        """
+        assert staff reads have ETags replaced
+        by changes of any company.
+        """
+
+        self.authenticate(self.engineer)
+        etag = self.client.get(self.url)['ETag']
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        baker.make('backend.Machine', company=self.other_company)
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_other_company(self):
+        """
+        assert changes of another company keep
+        the ETags of the clients.
+        """
+
+        etag = self.client.get(self.url)['ETag']
+        baker.make('backend.Machine', company=self.other_company)
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_updated_at(self):
+        """
+        assert saving a row stamps its updated_at
+        date, which filters incremental syncs.
+        """
+
+        since = timezone.now()
+        self.machine.save()
+        self.machine.refresh_from_db()
+        self.assertGreaterEqual(self.machine.updated_at, since)
+        old = baker.make('backend.Machine', company=self.company)
+        # auto_now stamps every save, so the date is updated
+        Machine.objects.filter(id=old.id).update(
+            updated_at=since - datetime.timedelta(days=1))
+
+        res = self.client.get(
+            self.url, {'updated_at__gte': since.isoformat()})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [machine['id'] for machine in res.data['results']],
+            [self.machine.id])
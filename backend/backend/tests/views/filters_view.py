@@ -0,0 +1,125 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+import datetime
+
+
+class TestFiltersView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = baker.make('backend.Company')
+        cls.engineer = baker.make('backend.VibroUser', user_type='engineer')
+        cls.client_user = baker.make(
+            'backend.VibroUser', user_type='client', company=cls.company)
+        cls.machines = [
+            baker.make(
+                'backend.Machine',
+                company=cls.company,
+                power=power,
+                hierarchy=hierarchy)
+            for hierarchy, power in enumerate((10, 50, 100))]
+        cls.other_machine = baker.make('backend.Machine', power=75)
+        cls.measurements = [
+            baker.make(
+                'backend.Measurement',
+                machine=cls.machines[0],
+                date=datetime.date(2021, month, 1),
+                severity=severity)
+            for month, severity in ((1, 'green'), (2, 'red'), (3, 'red'))]
+        point = baker.make(
+            'backend.Point',
+            machine=cls.machines[0],
+            position=1,
+            direction='H',
+            point_type='V')
+        baker.make(
+            'backend.Values',
+            point=point,
+            measurement=cls.measurements[0])
+        baker.make(
+            'backend.Flaw', measurement=cls.measurements[1],
+            flaw_type='balanceo')
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def ids(self, url, params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in res.data['results']]
+
+    def test_range_and_ordering(self):
+        """
+        assert numeric fields filter by range
+        and lists follow the requested order.
+        """
+
+        self.authenticate(self.engineer)
+        ids = self.ids(reverse('machine-list'), {
+            'power__gte': 50,
+            'power__lte': 100,
+            'ordering': '-power'})
+        self.assertEqual(
+            ids,
+            [self.machines[2].id, self.other_machine.id, self.machines[1].id])
+
+    def test_in_lookup(self):
+        """
+        assert ids can be requested as a
+        comma separated list.
+        """
+
+        self.authenticate(self.engineer)
+        ids = self.ids(reverse('machine-list'), {
+            'id__in': f'{self.machines[0].id},{self.other_machine.id}',
+            'ordering': 'id'})
+        self.assertEqual(ids, sorted([
+            self.machines[0].id, self.other_machine.id]))
+
+    def test_measurements_by_date(self):
+        """
+        assert measurements filter by date
+        range, severity and company.
+        """
+
+        self.authenticate(self.engineer)
+        ids = self.ids(reverse('measurement-list'), {
+            'date__gte': '2021-02-01',
+            'severity': 'red',
+            'company': self.company.id,
+            'ordering': '-date'})
+        self.assertEqual(
+            ids, [self.measurements[2].id, self.measurements[1].id])
+        ids = self.ids(
+            reverse('measurement-list'), {'date': '2021-01-01'})
+        self.assertEqual(ids, [self.measurements[0].id])
+
+    def test_invalid_value(self):
+        """
+        assert malformed values are rejected
+        instead of failing at query time.
+        """
+
+        self.authenticate(self.engineer)
+        res = self.client.get(
+            reverse('measurement-list'), {'date__gte': 'ayer'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_client_scope(self):
+        """
+        assert clients only list the points and
+        flaws of their company.
+        """
+
+        self.authenticate(self.client_user)
+        ids = self.ids(
+            reverse('point-list'), {'measurement': self.measurements[0].id})
+        self.assertEqual(len(ids), 1)
+        ids = self.ids(reverse('flaw-list'), {'flaw_type': 'balanceo'})
+        self.assertEqual(len(ids), 1)
+        ids = self.ids(reverse('machine-list'), {})
+        self.assertNotIn(self.other_machine.id, ids)
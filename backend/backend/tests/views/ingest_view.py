@@ -0,0 +1,181 @@
+from backend.ingestion import Frame, encode_acquisition
+from rest_framework_simplejwt.tokens import RefreshToken
+from backend.models import Point, Values, Measurement
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+import time
+
+
+class TestIngestView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ingest_url = reverse('ingest')
+        cls.arduino = baker.make('backend.VibroUser', user_type='arduino')
+        cls.machine = baker.make('backend.Machine')
+        cls.other_machine = baker.make('backend.Machine')
+        baker.make(
+            'backend.Sensor',
+            arduino=cls.arduino,
+            machine=cls.machine,
+            channel=1)
+        baker.make(
+            'backend.Sensor',
+            arduino=cls.arduino,
+            machine=cls.other_machine,
+            channel=2)
+
+    def setUp(self):
+        self.frames = [
+            Frame(1, 1, 'H', 'V', 1.5, [0.5] * 400, [1.25] * 1024),
+            Frame(1, 2, 'V', 'A', 0.25, [0.1] * 400, [0.75] * 1024),
+            Frame(2, 1, 'A', 'V', 3.5, [250.5] * 400, []),
+        ]
+        self.payload = encode_acquisition(self.frames, 2560, time.time())
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def post(self, payload):
+        return self.client.post(
+            self.ingest_url,
+            data=payload,
+            content_type='application/octet-stream')
+
+    def test_arduino_can_post_acquisition(self):
+        """
+        assert an arduino user can upload a whole
+        acquisition and every frame is stored.
+        """
+
+        self.authenticate(self.arduino)
+        res = self.post(self.payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['values'], 3)
+        self.assertEqual(Point.objects.filter(
+            machine=self.machine).count(), 2)
+        self.assertEqual(Measurement.objects.filter(
+            machine__in=[self.machine, self.other_machine]).count(), 2)
+        value = Values.objects.get(
+            point__machine=self.machine, point__position=1)
+        self.assertEqual(float(value.tendency), 1.5)
+        self.assertEqual(len(value.espectra), 400)
+        self.assertEqual(float(value.time_signal[0]), 1.25)
+        value = Values.objects.get(point__machine=self.other_machine)
+        self.assertEqual(float(value.espectra[0]), 250.5)
+        self.assertEqual(len(value.time_signal), 0)
+
+    def test_spectrum_is_computed_from_time_signal(self):
+        """
+        assert frames uploaded without a spectrum
+        get it computed from their time signal.
+        """
+
+        self.authenticate(self.arduino)
+        payload = encode_acquisition(
+            [Frame(1, 3, 'H', 'A', 0.7, [], [0.5, -0.5] * 1024)],
+            2560,
+            time.time())
+        res = self.post(payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        value = Values.objects.get(point__position=3)
+        self.assertEqual(value.espectra.size, 800)
+        self.assertEqual(value.sample_rate, 2560)
+
+    def test_points_are_reused(self):
+        """
+        assert uploading twice does not
+        duplicate points or measurements.
+        """
+
+        self.authenticate(self.arduino)
+        self.post(self.payload)
+        res = self.post(self.payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Point.objects.filter(
+            machine=self.machine).count(), 2)
+        self.assertEqual(Values.objects.filter(
+            measurement__machine=self.machine).count(), 4)
+
+    def test_client_cant_post_acquisition(self):
+        """
+        assert non arduino users are
+        forbidden from uploading data.
+        """
+
+        self.authenticate(baker.make('backend.VibroUser', user_type='client'))
+        res = self.post(self.payload)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_payload_is_rejected(self):
+        """
+        assert truncated payloads are rejected
+        without storing any value.
+        """
+
+        self.authenticate(self.arduino)
+        res = self.post(self.payload[:-3])
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Values.objects.exists())
+
+    def test_unknown_channel_is_rejected(self):
+        """
+        assert frames of channels without
+        a sensor are rejected.
+        """
+
+        self.authenticate(self.arduino)
+        payload = encode_acquisition(
+            [Frame(9, 1, 'H', 'V', 1.0, [], [])], 2560, time.time())
+        res = self.post(payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Values.objects.exists())
+
+    def test_non_finite_tendency_is_rejected(self):
+        """
+        assert NaN and infinite tendencies are
+        rejected without storing any value.
+        """
+
+        self.authenticate(self.arduino)
+        for tendency in (float('nan'), float('inf')):
+            payload = encode_acquisition(
+                [Frame(1, 1, 'H', 'V', tendency, [], [])], 2560, time.time())
+            res = self.post(payload)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Values.objects.exists())
+
+    def test_non_finite_samples_are_rejected(self):
+        """
+        assert NaN and infinite spectra or time
+        signals are rejected without storing
+        any value.
+        """
+
+        self.authenticate(self.arduino)
+        for frame in (
+                Frame(1, 1, 'H', 'V', 1.0, [float('nan')] * 4, []),
+                Frame(1, 1, 'H', 'V', 1.0, [], [0.5, float('inf')])):
+            payload = encode_acquisition([frame], 2560, time.time())
+            res = self.post(payload)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Values.objects.exists())
+
+    def test_duplicated_channel_is_rejected(self):
+        """
+        assert channels assigned to several
+        sensors are rejected.
+        """
+
+        baker.make(
+            'backend.Sensor',
+            arduino=self.arduino,
+            machine=self.other_machine,
+            channel=1)
+        self.authenticate(self.arduino)
+        res = self.post(self.payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Values.objects.exists())
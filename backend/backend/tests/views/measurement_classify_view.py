@@ -0,0 +1,70 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from backend.models import Measurement
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+
+
+class TestMeasurementClassifyView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.classify_url = reverse('measurement-classify')
+        cls.user = baker.make('backend.VibroUser', user_type='engineer')
+        machine = baker.make('backend.Machine', power=10, power_units='kW')
+        point = baker.make(
+            'backend.Point', machine=machine, direction='H', point_type='V')
+        cls.measurement = baker.make(
+            'backend.Measurement', machine=machine, date='2021-01-01')
+        baker.make(
+            'backend.Values',
+            measurement=cls.measurement,
+            point=point,
+            tendency=7.0)
+        cls.empty = baker.make(
+            'backend.Measurement', machine=machine, date='2021-01-02')
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def test_staff_can_classify(self):
+        """
+        assert staff can classify measurements
+        and their severity is stored.
+        """
+
+        self.authenticate(self.user)
+        res = self.client.post(self.classify_url, {
+            "measurements": [self.measurement.id, self.empty.id]
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['measurements'][0]['zone'], 'D')
+        self.assertEqual(res.data['unclassified'], [self.empty.id])
+        self.assertEqual(Measurement.objects.get(
+            id=self.measurement.id).severity, 'red')
+
+    def test_invalid_ids_are_rejected(self):
+        """
+        assert requests without a list
+        of ids are rejected.
+        """
+
+        self.authenticate(self.user)
+        res = self.client.post(self.classify_url, {
+            "measurements": 'all'
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_client_cant_classify(self):
+        """
+        assert clients are forbidden
+        from classifying measurements.
+        """
+
+        self.authenticate(baker.make('backend.VibroUser', user_type='client'))
+        res = self.client.post(self.classify_url, {
+            "measurements": [self.measurement.id]
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
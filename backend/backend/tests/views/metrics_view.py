@@ -0,0 +1,76 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from vibro.metrics import registry
+from django.urls import reverse
+from model_bakery import baker
+import re
+
+TOKEN = 'secret'
+
+
+@override_settings(METRICS_TOKEN=TOKEN)
+class TestMetricsView(APITestCase):
+
+    def setUp(self):
+        registry.clear()
+        user = baker.make('backend.VibroUser', user_type='engineer')
+        baker.make('backend.Machine', _quantity=3)
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def tearDown(self):
+        registry.clear()
+
+    def test_server_timing(self):
+        """
+        assert responses carry the database,
+        serializer and total time of the request.
+        """
+
+        res = self.client.get(reverse('machine-list'))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        timing = res['Server-Timing']
+        self.assertRegex(timing, r'db;desc="\d+ queries";dur=[\d.]+')
+        self.assertRegex(timing, r'serialize;dur=[\d.]+')
+        self.assertRegex(timing, r'total;dur=[\d.]+')
+        queries = int(re.search(r'(\d+) queries', timing).group(1))
+        self.assertGreater(queries, 0)
+
+    def test_metrics_are_aggregated_per_view(self):
+        """
+        assert the endpoint exposes the totals
+        of each view in prometheus format.
+        """
+
+        for _ in range(2):
+            machines = self.client.get(reverse('machine-list'))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {TOKEN}')
+        res = self.client.get(reverse('metrics'))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        text = res.content.decode()
+        labels = 'method="GET",view="machine-list",status="200"'
+        self.assertIn(f'http_requests_total{{{labels}}} 2', text)
+        self.assertIn(
+            f'http_request_bytes_total{{{labels}}} '
+            f'{2 * len(machines.content)}', text)
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+            text)
+        self.assertRegex(
+            text, rf'http_request_queries_total{{{labels}}} [1-9]')
+
+    def test_endpoint_requires_token(self):
+        """
+        assert the endpoint is hidden without
+        the token or when none is configured.
+        """
+
+        res = self.client.get(reverse('metrics'))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {TOKEN}')
+        with override_settings(METRICS_TOKEN=''):
+            res = self.client.get(reverse('metrics'))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
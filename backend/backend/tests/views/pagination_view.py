@@ -0,0 +1,113 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from backend.models import Machine, Measurement
+from backend.pagination import KeysetPagination
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+from unittest import mock
+import datetime
+
+
+class TestPaginationView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make('backend.VibroUser', user_type='engineer')
+        company = baker.make('backend.Company')
+        machines = [
+            baker.make(
+                'backend.Machine',
+                company=company,
+                hierarchy=index % 3,
+                rpm=None if index % 4 == 0 else 1800 - 100 * (index % 5))
+            for index in range(12)]
+        # several machines measured on each date
+        for index, machine in enumerate(machines):
+            for week in range(3):
+                baker.make(
+                    'backend.Measurement',
+                    machine=machine,
+                    date=datetime.date(2021, 1, 1) + datetime.timedelta(
+                        weeks=week + index % 2))
+
+    def setUp(self):
+        refresh = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def walk(self, url, params):
+        """
+        follow the next links and return the
+        ids of every page.
+        """
+
+        pages = []
+        res = self.client.get(url, params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            pages.append([item['id'] for item in res.data['results']])
+            if not res.data['next']:
+                return pages, res
+            res = self.client.get(res.data['next'])
+
+    def test_measurements_newest_first(self):
+        """
+        assert measurements are paged by date and
+        id without skipping or repeating rows
+        that share a date.
+        """
+
+        pages, _ = self.walk(reverse('measurement-list'), {'page_size': 5})
+        expected = list(Measurement.objects.order_by(
+            '-date', '-id').values_list('id', flat=True))
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual([len(page) for page in pages], [5] * 7 + [1])
+
+    def test_previous_page(self):
+        """
+        assert previous links return the page
+        before the current one.
+        """
+
+        url = reverse('measurement-list')
+        first = self.client.get(url, {'page_size': 5})
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual(previous.data['results'], first.data['results'])
+        self.assertIsNotNone(previous.data['next'])
+
+    def test_requested_ordering_with_nulls(self):
+        """
+        assert the ordering param is kept across
+        pages, including nullable columns.
+        """
+
+        pages, _ = self.walk(
+            reverse('machine-list'), {'ordering': '-rpm', 'page_size': 4})
+        machines = sorted(
+            Machine.objects.all(),
+            key=lambda machine: (machine.rpm is not None,
+                                 -(machine.rpm or 0), machine.id))
+        self.assertEqual(
+            sum(pages, []), [machine.id for machine in machines])
+
+    def test_page_size_is_capped(self):
+        """
+        assert clients can't ask for more rows
+        than the maximum page size.
+        """
+
+        with mock.patch.object(KeysetPagination, 'max_page_size', 10):
+            res = self.client.get(
+                reverse('measurement-list'), {'page_size': 5000})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 10)
+
+    def test_invalid_cursor(self):
+        """
+        assert tampered cursors are rejected.
+        """
+
+        res = self.client.get(reverse('measurement-list'), {'cursor': 'x'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
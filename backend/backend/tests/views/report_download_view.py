@@ -0,0 +1,98 @@
+from backend.report.artifacts import download_token
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+import tempfile
+import shutil
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = b'0123456789'
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestReportDownloadView(APITestCase):
+
+    def setUp(self):
+        self.owner = baker.make('backend.VibroUser', user_type='client')
+        self.other = baker.make('backend.VibroUser', user_type='client')
+        self.report = baker.make(
+            'backend.Report',
+            user=self.owner,
+            filename='INFORME.pdf',
+            size=len(CONTENT))
+        self.report.file.save('report.pdf', ContentFile(CONTENT))
+        self.url = reverse('report-download', args=[self.report.id])
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def test_owner_can_download(self):
+        """
+        assert the owner gets the whole file.
+        """
+
+        self.authenticate(self.owner)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(res.streaming_content), CONTENT)
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        self.assertIn('INFORME.pdf', res['Content-Disposition'])
+
+    def test_range_requests(self):
+        """
+        assert ranges and suffix ranges return
+        only the requested bytes.
+        """
+
+        self.authenticate(self.owner)
+        res = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(res.streaming_content), b'2345')
+        self.assertEqual(res['Content-Range'], 'bytes 2-5/10')
+        res = self.client.get(self.url, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(res.streaming_content), b'789')
+
+    def test_unsatisfiable_range(self):
+        """
+        assert ranges past the end of
+        the file are rejected.
+        """
+
+        self.authenticate(self.owner)
+        res = self.client.get(self.url, HTTP_RANGE='bytes=20-')
+        self.assertEqual(
+            res.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(res['Content-Range'], 'bytes */10')
+
+    def test_link_token_grants_access(self):
+        """
+        assert the signed email link works
+        without logging in.
+        """
+
+        res = self.client.get(
+            self.url, {'token': download_token(self.report)})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_other_users_cant_download(self):
+        """
+        assert reports of other users are
+        not found.
+        """
+
+        self.authenticate(self.other)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.credentials()
+        res = self.client.get(self.url, {'token': 'invalido'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
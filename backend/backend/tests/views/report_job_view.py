@@ -0,0 +1,172 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from celery.backends.cache import CacheBackend
+from rest_framework.test import APITestCase
+from backend.tasks import generate_report
+from django.core.cache import cache
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+from unittest import mock
+
+
+class TestReportJobView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jobs_url = reverse('report-job-list')
+        company = baker.make('backend.Company')
+        cls.client_user = baker.make(
+            'backend.VibroUser', company=company, user_type='client')
+        cls.other = baker.make('backend.VibroUser', user_type='client')
+        machine = baker.make('backend.Machine', company=company)
+        cls.measurement = baker.make(
+            'backend.Measurement', machine=machine, date='2021-01-01')
+
+    def setUp(self):
+        generate_report.backend = CacheBackend(
+            app=generate_report.app, backend='memory')
+        # the memory backend is shared by the whole process
+        generate_report.backend.client.cache.clear()
+        cache.clear()
+        patcher = mock.patch.object(generate_report, 'apply_async')
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        generate_report.backend = None
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def create_job(self):
+        return self.client.post(self.jobs_url, {
+            "measurements": [self.measurement.id]
+        }, format='json')
+
+    def test_create_queues_job(self):
+        """
+        assert a job is queued and its
+        status can be polled.
+        """
+
+        self.authenticate(self.client_user)
+        res = self.create_job()
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['status'], 'queued')
+        self.apply_async.assert_called_once()
+        res = self.client.get(
+            reverse('report-job-detail', args=[res.data['id']]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['stage'], 'queued')
+
+    def test_identical_requests_share_job(self):
+        """
+        assert a job in flight is not
+        queued a second time.
+        """
+
+        self.authenticate(self.client_user)
+        first = self.create_job()
+        second = self.create_job()
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.apply_async.assert_called_once()
+
+    def test_claimed_job_is_not_queued(self):
+        """
+        assert a job claimed by a concurrent
+        request is only queued by that one.
+        """
+
+        self.authenticate(self.client_user)
+        with mock.patch('backend.jobs.cache.add', return_value=False):
+            res = self.create_job()
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['status'], 'queued')
+        self.apply_async.assert_not_called()
+
+    def test_claim_rechecks_state(self):
+        """
+        assert a request that claims a job queued
+        while it waited doesn't queue it again.
+        """
+
+        self.authenticate(self.client_user)
+        first = self.create_job()
+        with mock.patch('backend.jobs.queued_or_done', side_effect=[
+                False, True]):
+            second = self.create_job()
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.apply_async.assert_called_once()
+
+    def test_failed_job_is_queued_again(self):
+        """
+        assert a new request retries
+        a failed job.
+        """
+
+        self.authenticate(self.client_user)
+        job_id = self.create_job().data['id']
+        generate_report.backend.store_result(
+            job_id, {'user': self.client_user.id, 'stage': 'rendering',
+                     'error': 'error'}, 'FAILED')
+        res = self.client.get(reverse('report-job-detail', args=[job_id]))
+        self.assertEqual(res.data['status'], 'failed')
+        self.create_job()
+        self.assertEqual(self.apply_async.call_count, 2)
+
+    def test_done_job_links_report(self):
+        """
+        assert finished jobs return their
+        timings and a download link.
+        """
+
+        self.authenticate(self.client_user)
+        job_id = self.create_job().data['id']
+        report = baker.make('backend.Report', user=self.client_user)
+        generate_report.backend.mark_as_done(job_id, {
+            'user': self.client_user.id,
+            'stage': 'done',
+            'timings': {'loading': 0.1, 'rendering': 2.0},
+            'report': report.id})
+        res = self.client.get(reverse('report-job-detail', args=[job_id]))
+        self.assertEqual(res.data['status'], 'done')
+        self.assertEqual(res.data['timings']['rendering'], 2.0)
+        self.assertIn(
+            reverse('report-download', args=[report.id]), res.data['url'])
+        self.create_job()
+        self.apply_async.assert_called_once()
+
+    def test_plant_report_job(self):
+        """
+        assert a job can cover every measurement
+        of a company on a date.
+        """
+
+        self.authenticate(self.client_user)
+        res = self.client.post(self.jobs_url, {
+            "company": self.client_user.company_id,
+            "date": "2021-01-01"
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        args = self.apply_async.call_args.kwargs['args']
+        self.assertEqual(args[1], [self.measurement.id])
+        res = self.client.post(self.jobs_url, {
+            "company": self.client_user.company_id,
+            "date": "enero"
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_users_cant_see_job(self):
+        """
+        assert jobs and measurements of other
+        companies are not found.
+        """
+
+        self.authenticate(self.client_user)
+        job_id = self.create_job().data['id']
+        self.authenticate(self.other)
+        res = self.client.get(reverse('report-job-detail', args=[job_id]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = self.create_job()
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
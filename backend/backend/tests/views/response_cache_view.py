@@ -0,0 +1,146 @@
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from django.core.cache import cache
+from django.db import connection
+from rest_framework import status
+from django.urls import reverse
+from unittest import mock
+from model_bakery import baker
+
+
+# test cases never commit, so invalidations run at once
+@override_settings(API_CACHE=True)
+@mock.patch(
+    'backend.response_cache.transaction.on_commit', lambda callback: callback())
+class TestResponseCacheView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = baker.make('backend.Company')
+        cls.other_company = baker.make('backend.Company')
+        cls.engineer = baker.make('backend.VibroUser', user_type='engineer')
+        cls.client_user = baker.make(
+            'backend.VibroUser', user_type='client', company=cls.company)
+        cls.machine = baker.make(
+            'backend.Machine', company=cls.company, name='motor')
+        cls.url = reverse('machine-list')
+
+    def setUp(self):
+        cache.clear()
+        self.authenticate(self.client_user)
+
+    def authenticate(self, user):
+        refresh = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, len(queries)
+
+    def test_hit(self):
+        """
+        assert a repeated request of a client is
+        served from the cache with fewer queries.
+        """
+
+        first, first_queries = self.get(self.url)
+        second, second_queries = self.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+        self.assertLess(second_queries, first_queries)
+
+    def test_params(self):
+        """
+        assert requests with other query
+        params are cached apart.
+        """
+
+        self.get(self.url)
+        res, _ = self.get(f'{self.url}?name=pump')
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'], [])
+
+    def test_save_invalidates(self):
+        """
+        assert saving a row of the company
+        retires its cached responses.
+        """
+
+        self.get(self.url)
+        self.machine.name = 'pump'
+        self.machine.save()
+        res, _ = self.get(self.url)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['name'], 'pump')
+
+    def test_child_invalidates(self):
+        """
+        assert saving a row below the machines
+        retires the responses of their company.
+        """
+
+        url = reverse('measurement-list')
+        self.get(url)
+        baker.make('backend.Measurement', machine=self.machine)
+        res, _ = self.get(url)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_delete_invalidates(self):
+        """
+        assert deleting a row retires the
+        responses of its company.
+        """
+
+        sensor = baker.make('backend.Sensor', machine=self.machine)
+        url = reverse('sensor-list')
+        self.get(url)
+        sensor.delete()
+        res, _ = self.get(url)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'], [])
+
+    def test_other_company(self):
+        """
+        assert changes of another company keep
+        the cached responses and clients of other
+        companies do not share them.
+        """
+
+        self.get(self.url)
+        baker.make('backend.Machine', company=self.other_company)
+        res, _ = self.get(self.url)
+        self.assertEqual(res['X-Cache'], 'HIT')
+
+        self.authenticate(baker.make(
+            'backend.VibroUser', user_type='client',
+            company=self.other_company))
+        res, _ = self.get(self.url)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_staff(self):
+        """
+        assert responses of staff
+        users are never cached.
+        """
+
+        self.authenticate(self.engineer)
+        self.get(self.url)
+        res, _ = self.get(self.url)
+        self.assertNotIn('X-Cache', res)
+
+    def test_disabled(self):
+        """
+        assert responses are not cached without
+        a cache shared by every process.
+        """
+
+        with self.settings(API_CACHE=False):
+            self.get(self.url)
+            res, _ = self.get(self.url)
+        self.assertNotIn('X-Cache', res)
@@ -0,0 +1,113 @@
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import APITestCase
+from django.db import connection
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+import datetime
+
+
+class TestSparseFieldsView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.engineer = baker.make(
+            'backend.VibroUser', user_type='engineer', first_name='Ana')
+        cls.machine = baker.make('backend.Machine', name='motor')
+        cls.url = reverse('measurement-list')
+
+    def setUp(self):
+        refresh = str(RefreshToken.for_user(self.engineer).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def make_measurements(self, quantity):
+        # one vibration measurement per machine and date
+        start = self.machine.measurements.count()
+        for day in range(start, start + quantity):
+            baker.make(
+                'backend.Measurement',
+                machine=self.machine,
+                engineer_one=self.engineer,
+                date=datetime.date(2020, 1, 1) + datetime.timedelta(day))
+
+    def get(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(self.url, params)
+        return res, queries
+
+    def test_fields(self):
+        """
+        assert only the requested fields are
+        returned and selected.
+        """
+
+        self.make_measurements(2)
+        res, queries = self.get({'fields': 'id,date,severity'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(res.data['results'][0]), {'id', 'date', 'severity'})
+        select = next(
+            query['sql'] for query in queries.captured_queries
+            if 'backend_measurement' in query['sql'])
+        self.assertNotIn('analysis', select)
+
+    def test_expand(self):
+        """
+        assert expanded relations are nested and
+        joined without a query per row.
+        """
+
+        self.make_measurements(2)
+        params = {'fields': 'id,date', 'expand': 'machine,engineer_one'}
+        res, queries = self.get(params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        measurement = res.data['results'][0]
+        self.assertEqual(
+            set(measurement), {'id', 'date', 'machine', 'engineer_one'})
+        self.assertEqual(measurement['machine']['name'], 'motor')
+        self.assertEqual(measurement['engineer_one']['first_name'], 'Ana')
+
+        self.make_measurements(5)
+        res, more_queries = self.get(params)
+        self.assertEqual(len(res.data['results']), 7)
+        self.assertEqual(len(more_queries), len(queries))
+
+    def test_expand_all_fields(self):
+        """
+        assert expanding without fields
+        keeps every other field.
+        """
+
+        self.make_measurements(1)
+        res, _ = self.get({'expand': 'analyst'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        measurement = res.data['results'][0]
+        self.assertIn('analysis', measurement)
+        self.assertEqual(measurement['machine'], self.machine.id)
+
+    def test_retrieve(self):
+        """
+        assert sparse fields apply to
+        a single record.
+        """
+
+        self.make_measurements(1)
+        measurement = self.machine.measurements.get()
+        res = self.client.get(
+            reverse('measurement-detail', args=[measurement.id]),
+            {'fields': 'id', 'expand': 'machine'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['machine']['id'], self.machine.id)
+        self.assertEqual(set(res.data), {'id', 'machine'})
+
+    def test_invalid(self):
+        """
+        assert unknown fields and
+        expansions are rejected.
+        """
+
+        res, _ = self.get({'fields': 'id,secret'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res, _ = self.get({'expand': 'date'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,69 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from django.db import connection
+from rest_framework import status
+from django.urls import reverse
+from model_bakery import baker
+
+
+class TestValuesView(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.values_url = reverse('values-list')
+        cls.user = baker.make('backend.VibroUser', user_type='engineer')
+        cls.values = baker.make(
+            'backend.Values',
+            point=baker.make('backend.Point', direction='H', point_type='V'),
+            tendency=2.5,
+            espectra=[0.5] * 800,
+            time_signal=[1.5] * 2048)
+
+    def setUp(self):
+        refresh = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+
+    def test_list_defers_waveforms(self):
+        """
+        assert listings only contain the summary
+        and never load the waveform columns.
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(self.values_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        values = res.data['results'][0]
+        self.assertEqual(float(values['tendency']), 2.5)
+        self.assertNotIn('espectra', values)
+        self.assertNotIn('time_signal', values)
+        for query in queries:
+            self.assertNotIn('"espectra"', query['sql'])
+
+    def test_waveform_endpoint(self):
+        """
+        assert the waveform endpoint returns
+        both arrays of a single record.
+        """
+
+        url = reverse('values-waveform', kwargs={'pk': self.values.id})
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['espectra'], [0.5] * 800)
+        self.assertEqual(res.data['time_signal'], [1.5] * 2048)
+
+    def test_client_cant_see_other_companies(self):
+        """
+        assert clients only see values
+        of their own company.
+        """
+
+        client = baker.make('backend.VibroUser', user_type='client')
+        refresh = str(RefreshToken.for_user(client).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh}')
+        res = self.client.get(self.values_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+        url = reverse('values-waveform', kwargs={'pk': self.values.id})
+        self.assertEqual(
+            self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
@@ -19,6 +19,12 @@ auth_views = [
     path('auth/refresh/', TokenRefreshView.as_view(), name='refresh'),
 ]
 
+data_views = [
+    path('ingest', views.IngestView.as_view(), name='ingest'),
+    path('reports/<int:pk>/download',
+         views.ReportDownloadView.as_view(), name='report-download'),
+]
+
 router = routers.DefaultRouter()
 router.register('city', views.CityView, 'city')
 router.register('company', views.CompanyView, 'company')
@@ -28,17 +34,21 @@ router.register('sensor', views.SensorView, 'sensor')
 router.register('gear', views.GearView, 'gear')
 router.register('axis', views.AxisView, 'axis')
 router.register('bearing', views.BearingView, 'bearing')
+router.register('bearing-geometry', views.BearingGeometryView,
+                'bearing-geometry')
 router.register('coupling', views.CouplingView, 'coupling')
 router.register('measurement', views.MeasurementView, 'measurement')
 router.register('flaw', views.FlawView, 'flaw')
 router.register('termal', views.TermoImageView, 'termal')
 router.register('point', views.PointView, 'point')
+router.register('values', views.ValuesView, 'values')
 router.register('report', views.ReportView, 'report')  # TODO needs testing
+router.register('report-job', views.ReportJobView, 'report-job')
 router.register("dates", views.MeasurementDatesView,
                 'dates')  # TODO test measurement dates
 
 
-urlpatterns = auth_views + router.urls
+urlpatterns = auth_views + data_views + router.urls
 """
 GET REQUESTS
 trailing slash followed by query params
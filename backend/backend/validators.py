@@ -1,4 +1,6 @@
-from django.core.validators import RegexValidator
+from django.core.validators import RegexValidator, MinValueValidator
+from django.core.exceptions import ValidationError
+import math
 
 PHONE_REGEX = r"^((\(\+?\d{2,3}\))|(\+?\d{2,3})[\s-])?\d{3}[\s-]\d{4}([\s-]ext[\s-]\d{1,3})?$"
 
@@ -82,3 +84,13 @@ NIT_REGEX_VALIDATOR = RegexValidator(
 ADDRESS_REGEX_VALIDATOR = RegexValidator(
     regex=ADDRESS_REGEX,
     message=ADDRESS_MESSAGE)
+
+POSITIVE_MESSAGE = "El valor debe ser un número mayor a cero"
+
+COUNT_VALIDATOR = MinValueValidator(1, message=POSITIVE_MESSAGE)
+
+
+def validate_positive(value):
+    # also rejects NaN and infinite floats
+    if not (math.isfinite(value) and value > 0):
+        raise ValidationError(POSITIVE_MESSAGE)
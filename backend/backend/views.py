@@ -1,282 +1,299 @@
 # from django.db.models import query
+from rest_framework.exceptions import NotFound, ValidationError
+from .ingestion import decode_acquisition, store_acquisition
 from . import permissions as custom_permissions
 from . import serializers as custom_serializers
-from rest_framework.exceptions import NotFound
+from rest_framework import viewsets, generics
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from .tasks import send_email, classify_severity
+from .report.artifacts import (
+    token_report_id,
+    download_token,
+    plant_measurements)
 from . import models as custom_models
-from rest_framework import viewsets
+from .parsers import BinaryParser
+from .downloads import file_response
+from .sparse_fields import SparseFieldsViewMixin
+from django.db.models import Prefetch
+from . import response_cache
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import status
-from .tasks import Email
+from . import severity
+from . import filters
+from . import bearings
+from . import jobs
 from .user_groups import STAFF
+import datetime
 
 
-class CityView(viewsets.ModelViewSet):
+class CityView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.CitySerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.CityFilter
 
     def get_queryset(self):
-        """
-        Optionally filter fields on the City table
-        based on url parameter.
-        """
-
-        id = self.request.query_params.get('id', None)
-        name = self.request.query_params.get('name', None)
-        state = self.request.query_params.get('state', None)
-        queryset = custom_models.City.objects.all()
-        if id:
-            queryset = queryset.filter(id=id)
-        if name:
-            queryset = queryset.filter(name=name)
-        if state:
-            queryset = queryset.filter(state=state)
-        return queryset
+        return custom_models.City.objects.all()
 
 
-class CompanyView(viewsets.ModelViewSet):
+class CompanyView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.DefaultCompanySerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.CompanyFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on params.
         For non staff/superusers, companies are
         always filtered by user to prevent users
         from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        name = self.request.query_params.get('name', None)
-        nit = self.request.query_params.get('nit', None)
-        address = self.request.query_params.get('address', None)
-        phone = self.request.query_params.get('phone', None)
-        city = self.request.query_params.get('city', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Company.objects.all()
-        else:
-            queryset = custom_models.Company.objects.filter(
-                id=self.request.user.company.id)
-        if id:
-            queryset = queryset.filter(id=id)
-        if name:
-            queryset = queryset.filter(name=name)
-        if nit:
-            queryset = queryset.filter(nit=nit)
-        if address:
-            queryset = queryset.filter(address=address)
-        if phone:
-            queryset = queryset.filter(phone=phone)
-        if city:
-            queryset = queryset.filter(city__id=city)
-        return queryset
+            return custom_models.Company.objects.all()
+        return custom_models.Company.objects.filter(
+            id=self.request.user.company_id)
 
     def get_serializer_class(self):
         if self.action in {'list', 'retrieve'}:
             return custom_serializers.GetCompanySerializer
+        if self.action == 'tree':
+            return custom_serializers.CompanyTreeSerializer
         return custom_serializers.DefaultCompanySerializer
 
+    @action(detail=True)
+    @response_cache.cache_action
+    def tree(self, request, pk=None):
+        """
+        return the company with its machines and their
+        gears, axes, bearings, points and sensors down
+        to the given depth, optionally only for one
+        machine. Each level is loaded in one query.
+        """
 
-class MachineView(viewsets.ModelViewSet):
+        try:
+            depth = int(request.query_params.get(
+                'depth', custom_serializers.TREE_DEPTH))
+            machine = request.query_params.get('machine', None)
+            machine = int(machine) if machine else None
+        except ValueError:
+            raise ValidationError('Parametros invalidos')
+        if not 1 <= depth <= custom_serializers.TREE_DEPTH:
+            raise ValidationError(
+                f'depth debe estar entre 1 y {custom_serializers.TREE_DEPTH}')
+
+        machines = custom_models.Machine.objects.order_by('hierarchy', 'id')
+        if machine:
+            machines = machines.filter(id=machine)
+        lookups = [Prefetch('machines', queryset=machines)]
+        if depth >= 2:
+            lookups += [
+                Prefetch(
+                    'machines__gears',
+                    queryset=custom_models.Gear.objects.order_by('id')),
+                Prefetch(
+                    'machines__points',
+                    queryset=custom_models.Point.objects.order_by(
+                        'position', 'id')),
+                Prefetch(
+                    'machines__sensor',
+                    queryset=custom_models.Sensor.objects.order_by('id'))]
+        if depth >= 3:
+            lookups.append(Prefetch(
+                'machines__gears__axis',
+                queryset=custom_models.Axis.objects.order_by('id')))
+        if depth >= 4:
+            lookups.append(Prefetch(
+                'machines__gears__axis__bearings',
+                queryset=custom_models.Bearing.objects.order_by('id')))
+        company = self.filter_queryset(self.get_queryset()).select_related(
+            'city').prefetch_related(*lookups).filter(id=pk).first()
+        if company is None:
+            raise NotFound("Empresa no encontrada")
+        serializer = self.get_serializer(
+            company, context={**self.get_serializer_context(), 'depth': depth})
+        return Response(serializer.data)
+
+
+class MachineView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.MachineSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.MachineFilter
+    # default order of the cursor pagination
+    ordering = ('company_id', 'hierarchy', 'id')
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url
-        params. For non staff/superusers, machines
-        are always filtered by user to prevent
-        users from seeing unauthorized data.
+        For non staff/superusers, machines are
+        always filtered by user to prevent users
+        from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        identifier = self.request.query_params.get('identifier', None)
-        company_id = self.request.query_params.get('company_id', None)
-        name = self.request.query_params.get('name', None)
-        code = self.request.query_params.get('code', None)
-        electric_feed = self.request.query_params.get('electric_feed', None)
-        transmission = self.request.query_params.get('transmission', None)
-        brand = self.request.query_params.get('brand', None)
-        power = self.request.query_params.get('power', None)
-        power_units = self.request.query_params.get('power_units', None)
-        norm = self.request.query_params.get('norm', None)
-        hierarchy = self.request.query_params.get('hierarchy', None)
-        rpm = self.request.query_params.get('rpm', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Machine.objects.all()
-        else:
-            queryset = custom_models.Machine.objects.filter(
-                company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if identifier:
-            queryset = queryset.filter(identifier=identifier)
-        if company_id:
-            queryset = queryset.filter(company__id=company_id)
-        if name:
-            queryset = queryset.filter(name=name)
-        if code:
-            queryset = queryset.filter(code=code)
-        if electric_feed:
-            queryset = queryset.filter(electric_feed=electric_feed)
-        if transmission:
-            queryset = queryset.filter(transmission=transmission)
-        if brand:
-            queryset = queryset.filter(brand=brand)
-        if power:
-            queryset = queryset.filter(power=power)
-        if power_units:
-            queryset = queryset.filter(power_units=power_units)
-        if norm:
-            queryset = queryset.filter(norm=norm)
-        if hierarchy:
-            queryset = queryset.filter(hierarchy=hierarchy)
-        if rpm:
-            queryset = queryset.filter(rpm=rpm)
-        return queryset
+            return custom_models.Machine.objects.all()
+        return custom_models.Machine.objects.filter(
+            company__user=self.request.user)
+
+    @action(detail=True)
+    @response_cache.cache_action
+    def bearing_frequencies(self, request, pk=None):
+        """
+        return the defect frequencies of every bearing
+        of the machine and, when peaks are given,
+        the frequencies each peak matches.
+        """
 
+        machine = self.get_object()
+        try:
+            harmonics = int(request.query_params.get(
+                'harmonics', bearings.DEFAULT_HARMONICS))
+            tolerance = float(request.query_params.get(
+                'tolerance', bearings.DEFAULT_TOLERANCE))
+            peaks = [float(peak) for peak in request.query_params.get(
+                'peaks', '').split(',') if peak]
+        except ValueError:
+            raise ValidationError('Parametros invalidos')
+        if not 0 < harmonics <= 50:
+            raise ValidationError('harmonics debe estar entre 1 y 50')
+
+        try:
+            table = bearings.machine_frequency_table(machine, harmonics)
+        except ValueError as error:
+            # geometries stored before they were validated
+            raise ValidationError(str(error))
+        matches = bearings.match_peaks(peaks, table, tolerance)
+        return Response({
+            "bearings": [{
+                "id": bearing.id,
+                "reference": bearing.reference,
+                "axis": bearing.axis_id,
+                "speed": speed,
+                "frequencies": dict(zip(
+                    bearings.DEFECTS, frequencies.tolist()))
+            } for bearing, speed, frequencies in zip(
+                table.bearings, table.speeds, table.frequencies)],
+            "missing": [bearing.id for bearing in table.missing],
+            "matches": [{
+                "peak": match.peak,
+                "bearing": match.bearing.id,
+                "defect": match.defect,
+                "harmonic": match.harmonic,
+                "frequency": match.frequency
+            } for match in matches]
+        }, status=status.HTTP_200_OK)
 
-class SensorView(viewsets.ModelViewSet):
+
+class SensorView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.SensorSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.SensorFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url parameters. For non
-        staff/superusers, sensors are always filtered by user
-        to prevent users from seeing unauthorized data.
+        For non staff/superusers, sensors are
+        always filtered by user to prevent users
+        from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        sensor_type = self.request.query_params.get('sensor_type', None)
-        channel = self.request.query_params.get('channel', None)
-        arduino = self.request.query_params.get('arduino', None)
-        machine_id = self.request.query_params.get('machine_id', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Sensor.objects.all()
-        else:
-            queryset = custom_models.Sensor.objects.filter(
-                machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if sensor_type:
-            queryset = queryset.filter(sensor_type=sensor_type)
-        if channel:
-            queryset = queryset.filter(channel=channel)
-        if arduino:
-            queryset = queryset.filter(arduino=arduino)
-        if machine_id:
-            queryset = queryset.filter(machine__id=machine_id)
-        return queryset
+            return custom_models.Sensor.objects.all()
+        return custom_models.Sensor.objects.filter(
+            machine__company__user=self.request.user)
 
 
-class GearView(viewsets.ModelViewSet):
+class GearView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.GearSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.GearFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url params. 
-        For non staff/superusers, gears are always 
-        filtered by user to prevent users from
-        seeing unauthorized data.
+        For non staff/superusers, gears are
+        always filtered by user to prevent users
+        from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('gear_id', None)
-        machine_id = self.request.query_params.get('machine_id', None)
-        gear_type = self.request.query_params.get('gear_type', None)
-        support = self.request.query_params.get('support', None)
-        transmission = self.request.query_params.get('transmission', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Gear.objects.all()
-        else:
-            queryset = custom_models.Gear.objects.filter(
-                machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if machine_id:
-            queryset = queryset.filter(machine__id=machine_id)
-        if gear_type:
-            queryset = queryset.filter(gear_type=gear_type)
-        if support:
-            queryset = queryset.filter(support=support)
-        if transmission:
-            queryset = queryset.filter(transmission=transmission)
-        return queryset
+            return custom_models.Gear.objects.all()
+        return custom_models.Gear.objects.filter(
+            machine__company__user=self.request.user)
 
 
-class AxisView(viewsets.ModelViewSet):
+class AxisView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.AxisSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.AxisFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url
-        params. For non staff/superusers, axis
-        are always filtered by user to prevent
-        users from seeing unauthorized data.
+        For non staff/superusers, axis are
+        always filtered by user to prevent users
+        from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        gear_id = self.request.query_params.get('gear_id', None)
-        type_axis = self.request.query_params.get('type_axis', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Axis.objects.all()
-        else:
-            queryset = custom_models.Axis.objects.filter(
-                gear__machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if gear_id:
-            queryset = queryset.filter(gear__id=gear_id)
-        if type_axis:
-            queryset = queryset.filter(type_axis=type_axis)
-        return queryset
+            return custom_models.Axis.objects.all()
+        return custom_models.Axis.objects.filter(
+            gear__machine__company__user=self.request.user)
 
 
-class BearingView(viewsets.ModelViewSet):
+class BearingView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.BearingSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.BearingFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on
-        url params. For non staff/superusers,
-        bearings are always filtered by user
-        to prevent users from seeing unauthorized
-        data.
+        For non staff/superusers, bearings are
+        always filtered by user to prevent users
+        from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        reference = self.request.query_params.get('reference', None)
-        frequency = self.request.query_params.get('frequency', None)
-        axis_id = self.request.query_params.get('axis_id', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Bearing.objects.all()
-        else:
-            queryset = custom_models.Bearing.objects.filter(
-                axis__gear__machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if reference:
-            queryset = queryset.filter(reference=reference)
-        if frequency:
-            queryset = queryset.filter(frequency=frequency)
-        if axis_id:
-            queryset = queryset.filter(axis__id=axis_id)
-        return queryset
+            return custom_models.Bearing.objects.all()
+        return custom_models.Bearing.objects.filter(
+            axis__gear__machine__company__user=self.request.user)
+
+
+class BearingGeometryView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
+
+    serializer_class = custom_serializers.BearingGeometrySerializer
+    permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.BearingGeometryFilter
+
+    def get_queryset(self):
+        return custom_models.BearingGeometry.objects.all()
 
 
 class CouplingView(viewsets.ModelViewSet):
@@ -288,64 +305,63 @@ class CouplingView(viewsets.ModelViewSet):
         pass
 
 
-class MeasurementView(viewsets.ModelViewSet):
+class MeasurementView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.MeasurementSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.MeasurementFilter
+    # default order of the cursor pagination
+    ordering = ('-date', '-id')
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url
-        params. For non staff/superusers,
-        measurements are always filtered by
-        user to prevent users from seeing
-        unauthorized data.
-        """
-
-        id = self.request.query_params.get('id', None)
-        service = self.request.query_params.get('service', None)
-        measurement_type = self.request.query_params.get(
-            'measurement_type', None)
-        machine = self.request.query_params.get('machine', None)
-        date = self.request.query_params.get('date', None)
-        severity = self.request.query_params.get('severity', None)
-        engineer_one = self.request.query_params.get('engineer_one', None)
-        engineer_two = self.request.query_params.get('engineer_two', None)
-        analyst = self.request.query_params.get('analyst', None)
-        certifier = self.request.query_params.get('certifier', None)
-        revised = self.request.query_params.get('revised', None)
-        resolved = self.request.query_params.get('resolved', None)
+        For non staff/superusers, measurements
+        are always filtered by user to prevent
+        users from seeing unauthorized data.
+        """
 
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Measurement.objects.all()
-        else:
-            queryset = custom_models.Measurement.objects.filter(
-                machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if service:
-            queryset = queryset.filter(service=service)
-        if measurement_type:
-            queryset = queryset.filter(measurement_type=measurement_type)
-        if machine:
-            queryset = queryset.filter(machine__id=machine)
-        if date:
-            queryset = queryset.filter(date__id=date)
-        if severity:
-            queryset = queryset.filter(severity=severity)
-        if engineer_one:
-            queryset = queryset.filter(engineer_one__id=engineer_one)
-        if engineer_two:
-            queryset = queryset.filter(engineer_two__id=engineer_two)
-        if analyst:
-            queryset = queryset.filter(analyst=analyst)
-        if certifier:
-            queryset = queryset.filter(certifier=certifier)
-        if revised:
-            queryset = queryset.filter(revised=revised)
-        if resolved:
-            queryset = queryset.filter(resolved=resolved)
-        return queryset
+            return custom_models.Measurement.objects.all()
+        return custom_models.Measurement.objects.filter(
+            machine__company__user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def classify(self, request):
+        """
+        classify measurements by ISO 10816-1 zone
+        and store their severity. When background
+        is set the work is queued instead.
+        """
+
+        ids = request.data.get('measurements', None)
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError('measurements debe ser una lista de ids')
+        try:
+            ids = [int(id) for id in ids]
+        except (TypeError, ValueError):
+            raise ValidationError('measurements debe ser una lista de ids')
+        ids = list(self.get_queryset().filter(
+            id__in=ids).values_list('id', flat=True))
+        if request.data.get('background', False):
+            classify_severity.delay(ids)
+            return Response({
+                "measurements": ids
+            }, status=status.HTTP_202_ACCEPTED)
+
+        results = severity.update_severities(ids)
+        return Response({
+            "measurements": [{
+                "id": id,
+                "machine_class": result.machine_class,
+                "velocity": result.velocity,
+                "zone": result.zone,
+                "severity": result.severity
+            } for id, result in results.items()],
+            "unclassified": [id for id in ids if id not in results]
+        }, status=status.HTTP_200_OK)
 
 
 class MeasurementDatesView(viewsets.ModelViewSet):
@@ -365,39 +381,26 @@ class MeasurementDatesView(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
-class FlawView(viewsets.ModelViewSet):
+class FlawView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.FlawSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.FlawFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url
-        params. For non staff/superusers,
-        flaws are always filtered by user to
-        prevent users from seeing unauthorized
-        data.
+        For non staff/superusers, flaws are
+        always filtered by user to prevent users
+        from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        measurement = self.request.query_params.get('measurement', None)
-        flaw_type = self.request.query_params.get('flaw_type', None)
-        severity = self.request.query_params.get('severity', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Flaw.objects.all()
-        else:
-            queryset = custom_models.Flaw.objects.filter(
-                machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if measurement:
-            queryset = queryset.filter(measurement__id=measurement)
-        if flaw_type:
-            queryset = queryset.filter(flaw_type=flaw_type)
-        if severity:
-            queryset = queryset.filter(severity=severity)
-        return queryset
+            return custom_models.Flaw.objects.all()
+        return custom_models.Flaw.objects.filter(
+            measurement__machine__company__user=self.request.user)
 
 
 class ReportView(viewsets.ModelViewSet):
@@ -415,77 +418,217 @@ class ReportView(viewsets.ModelViewSet):
                 machine__company__user=user)
         queryset = queryset.filter(id=id)
         # ! TODO add additional constraints to ordering
-        queryset = queryset.order_by(['machine__hierarchy'])
+        queryset = queryset.order_by('machine__hierarchy')
         if not queryset.exists():
             raise NotFound("Reporte no encontrado")
-        Email.report(request, queryset).delay()
+        send_email.delay(
+            user.id,
+            'report',
+            measurement_ids=list(queryset.values_list('id', flat=True)),
+            host=request.get_host())
         return Response(status=status.HTTP_200_OK)
 
 
-class TermoImageView(viewsets.ModelViewSet):
+class ReportDownloadView(generics.GenericAPIView):
+
+    permission_classes = [custom_permissions.IsDownloadRequest]
+
+    def get(self, request, pk):
+        """
+        stream a stored report to its owner, staff,
+        or anyone holding the signed link sent by
+        email. Supports Range requests.
+        """
+
+        report = custom_models.Report.objects.filter(id=pk).first()
+        if report is None:
+            raise NotFound("Reporte no encontrado")
+        token = request.query_params.get('token', None)
+        user = request.user
+        allowed = (
+            token and token_report_id(
+                token, settings.REPORT_LINK_MAX_AGE) == report.id) or (
+            user.is_authenticated and (
+                user.user_type in STAFF or user.id == report.user_id))
+        if not allowed:
+            raise NotFound("Reporte no encontrado")
+        return file_response(
+            report.file.open('rb'),
+            report.size,
+            report.filename,
+            request.META.get('HTTP_RANGE'))
+
+
+class ReportJobView(viewsets.ViewSet):
+
+    permission_classes = [custom_permissions.CanRequestReport]
+
+    def create(self, request):
+        """
+        queue the report of a list of measurements,
+        or the consolidated report of every machine
+        of a company on a date. Identical requests
+        share the same job.
+        """
+
+        company = request.data.get('company', None)
+        date = request.data.get('date', None)
+        if company is not None or date is not None:
+            try:
+                ids = plant_measurements(
+                    int(company), datetime.date.fromisoformat(str(date)))
+            except (TypeError, ValueError):
+                raise ValidationError(
+                    {'date': 'se requiere una empresa y una fecha AAAA-MM-DD'})
+        else:
+            ids = request.data.get('measurements', None)
+            if not isinstance(ids, list) or \
+                    not all(isinstance(id, int) for id in ids) or not ids:
+                raise ValidationError(
+                    {'measurements': 'se requiere una lista de ids'})
+        queryset = custom_models.Measurement.objects.filter(id__in=ids)
+        if request.user.user_type not in STAFF:
+            queryset = queryset.filter(machine__company__user=request.user)
+        ids = list(queryset.values_list('id', flat=True))
+        if not ids:
+            raise NotFound("Mediciones no encontradas")
+        job_id = jobs.start_report_job(request.user, ids)
+        job = jobs.job_status(job_id) or \
+            jobs.queued_status(job_id, request.user)
+        return Response(
+            self.serialize(request, job), status=status.HTTP_202_ACCEPTED)
+
+    def retrieve(self, request, pk=None):
+        """
+        return the status, current stage and stage
+        timings of a job, with a download link
+        once the report is stored.
+        """
+
+        job = jobs.job_status(pk)
+        if job is None or (request.user.user_type not in STAFF and
+                           job['user'] != request.user.id):
+            raise NotFound("Reporte no encontrado")
+        return Response(self.serialize(request, job))
+
+    @staticmethod
+    def serialize(request, job):
+        job = dict(job)
+        job.pop('user')
+        report = custom_models.Report.objects.filter(
+            id=job['report']).first() if job['report'] else None
+        job['url'] = request.build_absolute_uri(
+            f"{reverse('report-download', args=[report.id])}"
+            f"?token={download_token(report)}") if report else None
+        return job
+
+
+class TermoImageView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.TermoImageSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.TermoImageFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url
-        params. For non staff/superusers, termal
-        images are always filtered by user to
-        prevent users from seeing unauthorized
-        data.
+        For non staff/superusers, termal images
+        are always filtered by user to prevent
+        users from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        measurement = self.request.query_params.get('measurement', None)
-        image_type = self.request.query_params.get('image_type', None)
-
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.TermoImage.objects.all()
-        else:
-            queryset = custom_models.TermoImage.objects.filter(
-                measurement__machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if measurement:
-            queryset = queryset.filter(measurement__id=measurement)
-        if image_type:
-            queryset = queryset.filter(image_type=image_type)
-        return queryset
+            return custom_models.TermoImage.objects.all()
+        return custom_models.TermoImage.objects.filter(
+            measurement__machine__company__user=self.request.user)
 
 
-class PointView(viewsets.ModelViewSet):
+class PointView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
 
     serializer_class = custom_serializers.PointSerializer
     permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.PointFilter
 
     def get_queryset(self):
         """
-        Optionally filter fields based on url
-        params. For non staff/superusers, points
-        are always filtered by user to prevent
-        users from seeing unauthorized data.
+        For non staff/superusers, points are
+        always filtered by user to prevent users
+        from seeing unauthorized data.
         """
 
-        id = self.request.query_params.get('id', None)
-        position = self.request.query_params.get('position', None)
-        direction = self.request.query_params.get('direction', None)
-        point_type = self.request.query_params.get('point_type', None)
-        measurement = self.request.query_params.get('measurement', None)
+        if self.request.user.user_type in STAFF:
+            return custom_models.Point.objects.all()
+        return custom_models.Point.objects.filter(
+            machine__company__user=self.request.user)
+
+
+class ValuesView(
+        response_cache.CachedReadMixin,
+        SparseFieldsViewMixin,
+        viewsets.ModelViewSet):
+
+    serializer_class = custom_serializers.ValuesSerializer
+    permission_classes = [custom_permissions.GeneralPermission]
+    filterset_class = filters.ValuesFilter
+    waveform_fields = ('espectra', 'time_signal')
+
+    def get_queryset(self):
+        """
+        For non staff/superusers, values are
+        always filtered by user to prevent users
+        from seeing unauthorized data. Waveform
+        columns are only loaded by the actions
+        that return them.
+        """
 
         if self.request.user.user_type in STAFF:
-            queryset = custom_models.Point.objects.all()
+            queryset = custom_models.Values.objects.all()
         else:
-            queryset = custom_models.Point.objects.filter(
+            queryset = custom_models.Values.objects.filter(
                 measurement__machine__company__user=self.request.user)
-        if id:
-            queryset = queryset.filter(id=id)
-        if position:
-            queryset = queryset.filter(position=position)
-        if direction:
-            queryset = queryset.filter(direction=direction)
-        if point_type:
-            queryset = queryset.filter(point_type=point_type)
-        if measurement:
-            queryset = queryset.filter(measurement__id=measurement)
+        if self.action in {'list', 'retrieve'}:
+            queryset = queryset.defer(*self.waveform_fields)
+        elif self.action == 'waveform':
+            queryset = queryset.only('id', *self.waveform_fields)
         return queryset
+
+    def get_serializer_class(self):
+        if self.action in {'list', 'retrieve'}:
+            return custom_serializers.ValuesSummarySerializer
+        if self.action == 'waveform':
+            return custom_serializers.ValuesWaveformSerializer
+        return custom_serializers.ValuesSerializer
+
+    @action(detail=True)
+    @response_cache.cache_action
+    def waveform(self, request, pk=None):
+        """
+        return the spectrum and time
+        signal of a single record.
+        """
+
+        serializer = self.get_serializer(self.get_object())
+        return Response(serializer.data)
+
+
+class IngestView(generics.GenericAPIView):
+
+    permission_classes = [custom_permissions.IsArduino]
+    parser_classes = [BinaryParser]
+
+    def post(self, request):
+        """
+        store a whole binary acquisition
+        uploaded by an arduino user.
+        """
+
+        acquisition = decode_acquisition(request.data)
+        values = store_acquisition(request.user, acquisition)
+        return Response({
+            "values": len(values)
+        }, status=status.HTTP_201_CREATED)
@@ -0,0 +1,224 @@
+"""
+Request level performance instrumentation. Every
+request is timed and its database time, query count,
+serialization time and response size are sent back
+in a Server-Timing header and aggregated per view in
+a prometheus text endpoint.
+"""
+
+from django.http import HttpResponse, Http404
+from django.db import connections
+from collections import defaultdict
+from django.conf import settings
+import threading
+import time
+
+# upper bounds in seconds of the request duration histogram
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+UNMATCHED = 'unmatched'
+
+
+class RequestMetrics:
+
+    """
+    measures of a single request. The
+    database time is recorded by wrapping
+    the execution of every query.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_seconds = 0
+        self.queries = 0
+        self.view_start = None
+        self.view_db_seconds = 0
+        self.serialize_seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+
+    def view_started(self):
+        self.view_start = time.perf_counter()
+        self.view_db_seconds = self.db_seconds
+
+    def view_finished(self, response=None):
+        """
+        record the time spent by the view and the
+        rendering of its response outside of the
+        database, which for the api is mostly
+        spent serializing.
+        """
+
+        if self.view_start is not None:
+            self.serialize_seconds = max(
+                time.perf_counter() - self.view_start -
+                (self.db_seconds - self.view_db_seconds), 0)
+            self.view_start = None
+        return response
+
+
+class Registry:
+
+    """
+    totals of the requests served by this
+    process, keyed by method, view and status.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.requests = defaultdict(int)
+            self.totals = defaultdict(lambda: defaultdict(float))
+            self.buckets = defaultdict(lambda: [0] * len(BUCKETS))
+
+    def observe(self, method, view, status, metrics, seconds, size):
+        labels = (method, view, str(status))
+        with self.lock:
+            self.requests[labels] += 1
+            totals = self.totals[labels]
+            totals['seconds'] += seconds
+            totals['db_seconds'] += metrics.db_seconds
+            totals['serialize_seconds'] += metrics.serialize_seconds
+            totals['queries'] += metrics.queries
+            totals['bytes'] += size
+            buckets = self.buckets[labels]
+            for index, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    buckets[index] += 1
+
+    def render(self):
+        """
+        return the totals in the prometheus
+        text exposition format.
+        """
+
+        lines = []
+        with self.lock:
+            rows = sorted(self.requests.items())
+            lines += [
+                '# HELP http_requests_total requests served',
+                '# TYPE http_requests_total counter']
+            lines += [
+                f'http_requests_total{{{labels_text(labels)}}} {count}'
+                for labels, count in rows]
+            for name, description in (
+                    ('db_seconds', 'time spent in the database'),
+                    ('serialize_seconds', 'time spent serializing'),
+                    ('queries', 'sql queries executed'),
+                    ('bytes', 'response bytes sent')):
+                lines += [
+                    f'# HELP http_request_{name}_total {description}',
+                    f'# TYPE http_request_{name}_total counter']
+                lines += [
+                    f'http_request_{name}_total{{{labels_text(labels)}}} '
+                    f'{self.totals[labels][name]:g}'
+                    for labels, _ in rows]
+            lines += [
+                '# HELP http_request_duration_seconds request wall time',
+                '# TYPE http_request_duration_seconds histogram']
+            for labels, count in rows:
+                text = labels_text(labels)
+                for bound, value in zip(BUCKETS, self.buckets[labels]):
+                    lines.append(
+                        f'http_request_duration_seconds_bucket'
+                        f'{{{text},le="{bound}"}} {value}')
+                lines += [
+                    f'http_request_duration_seconds_bucket'
+                    f'{{{text},le="+Inf"}} {count}',
+                    f'http_request_duration_seconds_sum{{{text}}} '
+                    f'{self.totals[labels]["seconds"]:g}',
+                    f'http_request_duration_seconds_count{{{text}}} {count}']
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def labels_text(labels):
+    method, view, status = labels
+    return f'method="{method}",view="{view}",status="{status}"'
+
+
+def server_timing(metrics, seconds):
+    return ', '.join((
+        f'db;desc="{metrics.queries} queries";'
+        f'dur={metrics.db_seconds * 1000:.2f}',
+        f'serialize;dur={metrics.serialize_seconds * 1000:.2f}',
+        f'total;dur={seconds * 1000:.2f}'))
+
+
+class PerformanceMiddleware:
+
+    """
+    time every request, send its measures in a
+    Server-Timing header and add them to the
+    registry of the process.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        wrappers = [
+            connection.execute_wrapper(metrics)
+            for connection in connections.all()]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+        metrics.view_finished()
+        seconds = time.perf_counter() - metrics.start
+
+        if response.streaming:
+            size = int(response.get('Content-Length', 0))
+        else:
+            size = len(response.content)
+        match = getattr(request, 'resolver_match', None)
+        registry.observe(
+            request.method,
+            match.view_name if match else UNMATCHED,
+            response.status_code,
+            metrics,
+            seconds,
+            size)
+        response['Server-Timing'] = server_timing(metrics, seconds)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics.view_started()
+
+    def process_template_response(self, request, response):
+        # responses of the api are rendered after the
+        # middleware hooks, so serializing ends then
+        response.add_post_render_callback(request.metrics.view_finished)
+        return response
+
+
+def metrics_view(request):
+    """
+    return the totals of this process for
+    prometheus. Disabled unless a token is
+    configured, which must be sent as a
+    bearer token.
+    """
+
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token or request.META.get(
+            'HTTP_AUTHORIZATION') != f'Bearer {token}':
+        raise Http404
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8')
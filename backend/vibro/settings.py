@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.0/ref/settings/
 
 
 import os
+import tempfile
 from datetime import timedelta
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'django_filters',
     'backend',
     'corsheaders',
     'storages',
@@ -52,7 +54,12 @@ AUTH_USER_MODEL = 'backend.VibroUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES':
-    ('rest_framework_simplejwt.authentication.JWTAuthentication',)
+    ('rest_framework_simplejwt.authentication.JWTAuthentication',),
+    'DEFAULT_FILTER_BACKENDS':
+    ('django_filters.rest_framework.DjangoFilterBackend',),
+    'DEFAULT_PAGINATION_CLASS': 'backend.pagination.KeysetPagination',
+    # rows per page, clients may ask up to 1000 with page_size
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', 100)),
 }
 
 SIMPLE_JWT = {
@@ -62,6 +69,7 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    'vibro.metrics.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -190,11 +198,63 @@ EMAIL_USE_TLS = True
 EMAIL_USE_SSL = False
 EMAIL_HOST_USER = os.getenv('EMAIL_USERNAME')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_PASSWORD')
+# emails sent through one SMTP connection
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', 50))
+# failed batches are retried after 1, 2, 4... times the delay in seconds
+EMAIL_MAX_RETRIES = int(os.getenv('EMAIL_MAX_RETRIES', 5))
+EMAIL_RETRY_DELAY = int(os.getenv('EMAIL_RETRY_DELAY', 30))
 
 # Celery Configuration
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
+# report jobs are polled through the result backend
+CELERY_RESULT_BACKEND = os.getenv(
+    'CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+CELERY_RESULT_EXPIRES = timedelta(days=1)
+
+# Report configuration
+# processes each celery worker process uses to render report
+# graphs, keep it times the worker concurrency near the cpu count
+REPORT_RENDER_WORKERS = int(os.getenv('REPORT_RENDER_WORKERS', 2))
+# rendered graphs are reused across reports, empty to disable
+REPORT_CHART_CACHE_DIR = os.getenv(
+    'REPORT_CHART_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'vibro', 'charts'))
+REPORT_CHART_CACHE_SIZE = int(
+    os.getenv('REPORT_CHART_CACHE_SIZE', 256 * 1024 * 1024))
+# measurements whose graphs are rendered and laid out together
+REPORT_SECTION_SIZE = int(os.getenv('REPORT_SECTION_SIZE', 20))
+# seconds the report links sent by email remain valid
+REPORT_LINK_MAX_AGE = int(
+    os.getenv('REPORT_LINK_MAX_AGE', 7 * 24 * 60 * 60))
+
+# Performance metrics configuration
+# bearer token of the prometheus endpoint, empty to disable it
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Cache configuration
+# redis is shared by every web process, memory is per process
+if os.getenv('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'backend.cache_backends.RedisCache',
+            'LOCATION': os.getenv('CACHE_URL'),
+            'KEY_PREFIX': 'vibro',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+# api responses are only cached in a cache shared by every
+# web process and celery worker, so writes of any of them
+# retire the cached responses of the others
+API_CACHE = bool(os.getenv('CACHE_URL'))
+# seconds the api responses of clients are cached
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 24 * 60 * 60))
 
 # Celery Beat Configuration
 # https://docs.celeryproject.org/en/latest/django/first-steps-with-django.html
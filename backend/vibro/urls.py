@@ -1,9 +1,11 @@
 from django.conf.urls.static import static
 from django.urls import path, include
 from django.conf import settings
+from .metrics import metrics_view
 
 urlpatterns = [
     path('api/', include("backend.urls")),
+    path('metrics', metrics_view, name='metrics'),
 ]
 if settings.DEBUG:
     urlpatterns += static(